@@ -19,6 +19,17 @@ def create_app(config_name='development'):
     from .config.config import config_by_name
     app.config.from_object(config_by_name[config_name])
 
+    # Size the shared occurrence and compiled rule caches
+    from .utils.recurrence import RecurrenceGenerator
+    RecurrenceGenerator.cache.configure(
+        app.config['OCCURRENCE_CACHE_MAX_ENTRIES'], app.config['OCCURRENCE_CACHE_MAX_BYTES']
+    )
+    RecurrenceGenerator.rule_cache.configure(app.config['RRULE_CACHE_MAX_ENTRIES'])
+
+    # Keep the series span columns of events current on every flush
+    from .utils.series_span import init_series_spans
+    init_series_spans()
+
     # Initialize extensions with app
     CORS(app)
     db.init_app(app)
@@ -29,6 +40,10 @@ def create_app(config_name='development'):
     from .utils.error_handler import register_error_handlers
     register_error_handlers(app)
 
+    # Compress responses when COMPRESSION_ENABLED is set
+    from .utils.compression import init_compression
+    init_compression(app)
+
     # Register blueprints
     from .api.events import events_bp
     from .api.reminders import reminders_bp
@@ -42,12 +57,18 @@ def create_app(config_name='development'):
     app.register_blueprint(reminders_bp, url_prefix='/api/reminders')
     app.register_blueprint(categories_bp, url_prefix='/api/categories')
 
-    # Initialize scheduler
-    if not scheduler.running:
+    # Reminders and maintenance jobs run in the reminder worker process
+    # (flask reminder-worker). SCHEDULER_ENABLED runs them inside this
+    # process instead, for a single-process development server only.
+    from .utils.reminder_scheduler import init_reminder_scheduler, reminder_worker_command
+    app.cli.add_command(reminder_worker_command)
+
+    if app.config['SCHEDULER_ENABLED'] and not scheduler.running:
         scheduler.start()
-        # Initialize reminder scheduler
-        from .utils.reminder_scheduler import init_reminder_scheduler
-        init_reminder_scheduler()
+        init_reminder_scheduler(app)
+        if app.config['REMINDER_ENGINE_ENABLED']:
+            from .utils.reminder_engine import reminder_engine
+            reminder_engine.start(app)
 
     # Shell context for flask cli
     @app.shell_context_processor
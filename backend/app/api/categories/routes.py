@@ -1,12 +1,20 @@
 from flask import request
 from flask_jwt_extended import jwt_required, current_user
-from datetime import datetime, timezone
+from sqlalchemy.orm import load_only
+from datetime import datetime
 
 from ... import db
 from . import categories_bp
-from ...models import Category
+from ...models import Category, Event
 from ...utils.responses import success_response, error_response
-from ...utils.pagination import paginate_query
+from ...utils.calendar_version import bump_calendar_version, calendar_etag, not_modified_response, tag_response
+from ...utils.change_feed import record_category_changes
+from ...utils.pagination import paginate_query, paginate_cursor
+from ...utils.event_queries import category_events_query
+from ...utils.recurrence import RecurrenceGenerator
+from ...utils.serializers import (
+    CATEGORY_FIELDS, EVENT_FIELDS, parse_fields, serialize_category, serialize_categories, serialize_event
+)
 from ...utils.error_handler import handle_validation_errors, handle_database_errors, log_request_info
 from ...utils.logger import logger
 
@@ -21,13 +29,28 @@ def get_categories():
     Query Parameters:
     - page: Page number (default: 1)
     - per_page: Items per page (default: 50, max: 100)
+    - fields: Comma-separated fields to return (default: all), only those columns are loaded
 
     Returns:
-    - Success response with list of categories and pagination info
+    - Success response with list of categories and pagination info,
+      or 304 if the If-None-Match ETag is still current
     """
     try:
+        # Conditional GET, answered from the user's calendar version alone
+        etag = calendar_etag(current_user)
+        not_modified = not_modified_response(etag)
+        if not_modified:
+            return not_modified
+
+        try:
+            fields = parse_fields(request.args.get('fields'), CATEGORY_FIELDS)
+        except ValueError as e:
+            return error_response(str(e), 400)
+
         # Build query for user's categories
         query = Category.query.filter_by(user_id=current_user.id).order_by(Category.name)
+        if fields:
+            query = query.options(load_only(*(getattr(Category, name) for name in fields)))
 
         # Check if pagination is requested
         page = request.args.get('page', type=int)
@@ -36,20 +59,20 @@ def get_categories():
         if page or per_page:
             # Return paginated results
             result = paginate_query(query, page, per_page, max_per_page=100)
-            categories_data = [category.to_dict() for category in result['items']]
+            categories_data = serialize_categories(result['items'], fields)
 
-            return success_response(
+            return tag_response(success_response(
                 data={
                     'categories': categories_data,
                     'pagination': result['pagination']
                 }
-            )
+            ), etag)
         else:
             # Return all categories (for dropdown lists, etc.)
             categories = query.all()
-            categories_data = [category.to_dict() for category in categories]
+            categories_data = serialize_categories(categories, fields)
 
-            return success_response(data={'categories': categories_data})
+            return tag_response(success_response(data={'categories': categories_data}), etag)
 
     except Exception as e:
         logger.error(f"Error retrieving categories: {str(e)}")
@@ -75,7 +98,7 @@ def get_category(category_id):
         if not category:
             return error_response("Category not found", 404)
 
-        return success_response(data={'category': category.to_dict()})
+        return success_response(data={'category': serialize_category(category)})
 
     except Exception as e:
         logger.error(f"Error retrieving category {category_id}: {str(e)}")
@@ -138,11 +161,12 @@ def create_category():
 
         # Save to database
         db.session.add(new_category)
+        bump_calendar_version(current_user.id)
         db.session.commit()
 
         logger.info(f"Category created: {new_category.id} ({name}) by user {current_user.username}")
         return success_response(
-            data={'category': new_category.to_dict()},
+            data={'category': serialize_category(new_category)},
             message="Category created successfully",
             status_code=201
         )
@@ -222,11 +246,14 @@ def update_category(category_id):
             setattr(category, key, value)
 
         category.updated_at = datetime.utcnow()
+        record_category_changes(current_user.id, category_id)
         db.session.commit()
+        # Cached occurrences embed the category name and color
+        RecurrenceGenerator.cache.invalidate_user(current_user.id)
 
         logger.info(f"Category {category_id} updated by user {current_user.username}")
         return success_response(
-            data={'category': category.to_dict()},
+            data={'category': serialize_category(category)},
             message="Category updated successfully"
         )
 
@@ -266,6 +293,7 @@ def delete_category(category_id):
 
         category_name = category.name
         db.session.delete(category)
+        bump_calendar_version(current_user.id)
         db.session.commit()
 
         logger.info(f"Category {category_id} ({category_name}) deleted by user {current_user.username}")
@@ -290,45 +318,58 @@ def get_category_events(category_id):
     Query Parameters:
     - page: Page number (default: 1)
     - per_page: Items per page (default: 20, max: 100)
+    - cursor: Keyset pagination cursor, pass it empty for the first page
+    - include_total: Include the total count (default: true for page, false for cursor)
+    - fields: Comma-separated event fields to return (default: all)
 
     Returns:
-    - Success response with list of events
+    - Success response with list of events, or 304 if the If-None-Match
+      ETag is still current
     """
     try:
+        etag = calendar_etag(current_user)
+        not_modified = not_modified_response(etag)
+        if not_modified:
+            return not_modified
+
         category = Category.query.filter_by(id=category_id, user_id=current_user.id).first()
 
         if not category:
             return error_response("Category not found", 404)
 
-        # Get events for this category with pagination
-        from ...models import Event
-        query = Event.query.join(Event.categories).filter(
-            Category.id == category_id,
-            Event.user_id == current_user.id
-        ).order_by(Event.start_datetime.desc())
-
-        result = paginate_query(query)
-
-        events_data = []
-        for event in result['items']:
-            event_dict = event.to_dict()
-            # Format datetime fields for JSON response
-            event_dict['start_datetime'] = event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace(
-                '+00:00', 'Z')
-            if event.end_datetime:
-                event_dict['end_datetime'] = event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace(
-                    '+00:00', 'Z')
-            event_dict['created_at'] = event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-            event_dict['updated_at'] = event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-            events_data.append(event_dict)
+        try:
+            fields = parse_fields(request.args.get('fields'), EVENT_FIELDS)
+        except ValueError as e:
+            return error_response(str(e), 400)
 
-        return success_response(
+        # Get events for this category with pagination, relationships are batch-loaded
+        query = category_events_query(current_user.id, category_id, fields).order_by(
+            Event.start_datetime.desc(), Event.id.desc()
+        )
+
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total')
+
+        if cursor is not None:
+            try:
+                result = paginate_cursor(
+                    query, Event.start_datetime, Event.id, cursor or None,
+                    include_total=(include_total or 'false').lower() == 'true'
+                )
+            except ValueError as e:
+                return error_response(str(e), 400)
+        else:
+            result = paginate_query(query, include_total=(include_total or 'true').lower() == 'true')
+
+        events_data = [serialize_event(event, fields) for event in result['items']]
+
+        return tag_response(success_response(
             data={
-                'category': category.to_dict(),
+                'category': serialize_category(category),
                 'events': events_data,
                 'pagination': result['pagination']
             }
-        )
+        ), etag)
 
     except Exception as e:
         logger.error(f"Error retrieving events for category {category_id}: {str(e)}")
@@ -1,79 +1,246 @@
-from flask import request
+from flask import request, current_app
 from flask_jwt_extended import jwt_required, current_user
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 
 from ... import db
 from . import events_bp
 from ...models import Event, Category, RecurrenceRule, Reminder
 from ...utils.responses import success_response, error_response
+from ...utils.calendar_version import calendar_etag, not_modified_response, tag_response
+from ...utils.change_feed import (
+    record_event_changes, encode_sync_token, decode_sync_token, sync_token_expired, latest_sequence, changes_since
+)
 from ...utils.validators import validate_datetime_string
-from ...utils.pagination import paginate_query
-from ...utils.recurrence import RecurrenceGenerator
+from ...utils.date_window import resolve_date_window, to_naive_utc
+from ...utils.event_queries import user_events_query, category_events_query, filter_events_in_window
+from ...utils.pagination import paginate_query, paginate_cursor
+from ...utils.occurrence_store import OccurrenceStore
+from ...utils.occurrence_overrides import OccurrenceOverrides
+from ...utils.occurrence_pagination import paginate_occurrences
+from ...utils.recurrence import RecurrenceGenerator, OccurrenceCache
+from ...utils.search import EventSearch
+from ...utils.serializers import (
+    OCCURRENCE_FIELDS, format_utc, parse_fields, serialize_categories, serialize_event, serialize_occurrences,
+    serialize_reminder
+)
+from ...utils.streaming import NDJSON_MIMETYPE, wants_ndjson, batched, ndjson_response
 from ...utils.rate_limiter import rate_limit
 from ...utils.error_handler import handle_validation_errors, handle_database_errors, log_request_info
 from ...utils.logger import logger
 
 
+def load_occurrences(events, window_start, window_end, fields=None):
+    """
+    Expand the recurring events of a listing inside its window
+
+    Occurrences come from the in-process cache, then from the stored
+    occurrences, then from live expansion of the rule. Exceptions to single
+    occurrences are then merged in with one query for all series. With a
+    sparse fieldset, occurrences leave out an unselected description or
+    categories.
+
+    Returns:
+    - Dict of event id to occurrence dicts, for recurring events only
+    """
+    max_occurrences = current_app.config['EVENTS_MAX_OCCURRENCES_PER_SERIES']
+    occurrence_cache = RecurrenceGenerator.cache
+    # Entries built without description or categories must not serve full listings
+    sparse_key = None if fields is None else ('description' in fields, 'categories' in fields)
+    window_key = (window_start, window_end, max_occurrences, sparse_key)
+    with_categories = fields is None or 'categories' in fields
+    occurrences_by_event = {}
+    cache_keys = {}
+    uncached = []
+
+    for event in events:
+        if event.is_recurring and event.recurrence_rule:
+            cache_keys[event.id] = OccurrenceCache.make_key(
+                event, event.recurrence_rule, window_key, event.categories if with_categories else None
+            )
+            cached = occurrence_cache.get(cache_keys[event.id])
+            if cached is None:
+                uncached.append(event)
+            else:
+                occurrences_by_event[event.id] = cached
+
+    stored_occurrences = OccurrenceStore.load(uncached, window_start, window_end, max_occurrences, fields)
+    for event in uncached:
+        occurrences = stored_occurrences.get(event.id)
+        if occurrences is None:
+            # Generate recurring instances inside the requested window only
+            occurrences = RecurrenceGenerator.generate_occurrences(
+                event, event.recurrence_rule, window_start, window_end,
+                max_occurrences=max_occurrences, fields=fields
+            )
+        occurrence_cache.put(cache_keys[event.id], event.user_id, occurrences)
+        occurrences_by_event[event.id] = occurrences
+
+    # Cached occurrences are plain expansions, exceptions are applied per request
+    recurring = [event for event in events if event.id in cache_keys]
+    exceptions = OccurrenceOverrides.load(recurring, window_start, window_end, fields)
+    return OccurrenceOverrides.merge(occurrences_by_event, exceptions, window_start, window_end, fields)
+
+
+def serialize_listing(events, occurrences_by_event, fields=None):
+    """Yield the serialized items of listed events, recurring ones replaced by their occurrences"""
+    for event in events:
+        occurrences = occurrences_by_event.get(event.id)
+        if occurrences is None or (occurrences and not isinstance(occurrences[0], dict)):
+            # Regular event, recurring event master, or a rule that could not be expanded
+            yield serialize_event(event, fields)
+        else:
+            yield from serialize_occurrences(occurrences, fields)
+
+
 @events_bp.route('', methods=['GET'])
 @jwt_required()
 @log_request_info
 def get_all_events():
     """
-    Get all events for the logged-in user with filtering and pagination
+    Get all events for the logged-in user that overlap a date window
 
     Query Parameters:
     - page: Page number (default: 1)
     - per_page: Items per page (default: 50, max: 100)
+    - cursor: Keyset pagination cursor, pass it empty for the first page
+    - occurrence_cursor: Keyset cursor over expanded occurrences, pass it empty for the first page
+    - include_total: Include the total count (default: true for page, false for cursor)
     - category_id: Filter by category ID
-    - start_date: Filter events starting from this date (ISO format)
-    - end_date: Filter events up to this date (ISO format)
+    - start: Window start (ISO format, alias: start_date)
+    - end: Window end, exclusive (ISO format, alias: end_date)
     - include_recurring: Include recurring event instances (default: true)
-    - search: Search in title and description
+    - search: Full-text search in title and description (prefix match on every word)
+    - stream: Stream the listing as NDJSON (default: false, or send Accept: application/x-ndjson)
+    - fields: Comma-separated fields to return (default: all), e.g. id,title,start_datetime,end_datetime,color
+
+    When no window is given a server-side default window is used, and the
+    window span is capped. Recurring events are only expanded inside the window.
+
+    Responses carry a strong ETag derived from the user's calendar version and
+    the query args; a matching If-None-Match gets 304 without running the query.
+
+    Unselected fields are not loaded either: description is deferred and
+    categories are not queried unless requested.
+
+    page and cursor paginate event rows, a recurring series counts as one
+    row however many occurrences it expands to. occurrence_cursor paginates
+    the expanded listing instead: items in ascending start order, exactly
+    per_page of them per page, series expanded only as far as the page.
+
+    Streamed listings cannot be paginated. They return one event per line,
+    read from the database in batches and expanded batch by batch, with the
+    window in the X-Window-Start / X-Window-End headers.
 
     Returns:
-    - Success response with list of events and pagination info
+    - Success response with list of events, the effective window and pagination info
     """
     try:
-        # Build base query
-        query = Event.query.filter_by(user_id=current_user.id)
+        stream = wants_ndjson()
 
-        # Apply filters
+        # The default window moves with the clock, so tag it with the date
+        explicit_window = any(request.args.get(name) for name in ('start', 'start_date', 'end', 'end_date'))
+        etag = calendar_etag(
+            current_user, None if explicit_window else datetime.utcnow().date(), NDJSON_MIMETYPE if stream else None
+        )
+        not_modified = not_modified_response(etag)
+        if not_modified:
+            return not_modified
+
+        is_valid, window = resolve_date_window(request.args)
+        if not is_valid:
+            return error_response(window, 400)
+        window_start, window_end = window
+
+        try:
+            fields = parse_fields(request.args.get('fields'), OCCURRENCE_FIELDS)
+        except ValueError as e:
+            return error_response(str(e), 400)
+
+        # Build base query, relationships are batch-loaded
         category_id = request.args.get('category_id', type=int)
         if category_id:
-            query = query.join(Event.categories).filter(Category.id == category_id)
-
-        start_date = request.args.get('start_date')
-        if start_date:
-            is_valid, start_dt = validate_datetime_string(start_date)
-            if is_valid:
-                query = query.filter(Event.start_datetime >= start_dt)
+            query = category_events_query(current_user.id, category_id, fields)
+        else:
+            query = user_events_query(current_user.id, fields)
 
-        end_date = request.args.get('end_date')
-        if end_date:
-            is_valid, end_dt = validate_datetime_string(end_date)
-            if is_valid:
-                query = query.filter(Event.start_datetime <= end_dt)
+        query = filter_events_in_window(query, window_start, window_end)
 
         search = request.args.get('search', '').strip()
         if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                db.or_(
-                    Event.title.ilike(search_filter),
-                    Event.description.ilike(search_filter)
-                )
-            )
+            query = EventSearch.filter_query(query, search)
 
         # Order by start datetime
-        query = query.order_by(Event.start_datetime.desc())
+        query = query.order_by(Event.start_datetime.desc(), Event.id.desc())
 
         # Handle pagination
         page = request.args.get('page', type=int)
         per_page = request.args.get('per_page', type=int)
+        cursor = request.args.get('cursor')
+        occurrence_cursor = request.args.get('occurrence_cursor')
+        include_total = request.args.get('include_total')
         include_recurring = request.args.get('include_recurring', 'true').lower() == 'true'
 
-        if page or per_page:
-            result = paginate_query(query, page, per_page, max_per_page=100)
+        if stream:
+            if page or per_page or cursor is not None or occurrence_cursor is not None:
+                return error_response("Streamed listings cannot be paginated", 400)
+
+            batch_size = current_app.config['EVENTS_STREAM_BATCH_SIZE']
+
+            def stream_events():
+                # yield_per fetches rows from a server-side cursor, relationships are loaded per batch
+                for batch in batched(query.yield_per(batch_size), batch_size):
+                    occurrences_by_event = (
+                        load_occurrences(batch, window_start, window_end, fields) if include_recurring else {}
+                    )
+                    yield from serialize_listing(batch, occurrences_by_event, fields)
+
+            response = ndjson_response(stream_events(), headers={
+                'X-Window-Start': format_utc(window_start),
+                'X-Window-End': format_utc(window_end),
+                'Vary': 'Accept'
+            })
+            return tag_response(response, etag)
+
+        if occurrence_cursor is not None:
+            if page or cursor is not None:
+                return error_response("occurrence_cursor cannot be combined with page or cursor", 400)
+
+            # Occurrence-level keyset mode, items come out expanded and serialized
+            try:
+                result = paginate_occurrences(
+                    query, window_start, window_end, occurrence_cursor or None, per_page, max_per_page=100,
+                    include_recurring=include_recurring, fields=fields
+                )
+            except ValueError as e:
+                return error_response(str(e), 400)
+
+            response = tag_response(success_response(data={
+                "events": result['items'],
+                "window": {
+                    "start": format_utc(window_start),
+                    "end": format_utc(window_end)
+                },
+                "pagination": result['pagination']
+            }), etag)
+            response[0].headers['Vary'] = 'Accept'
+            return response
+
+        if cursor is not None:
+            # Keyset mode, an empty cursor requests the first page
+            try:
+                result = paginate_cursor(
+                    query, Event.start_datetime, Event.id, cursor or None, per_page, max_per_page=100,
+                    include_total=(include_total or 'false').lower() == 'true'
+                )
+            except ValueError as e:
+                return error_response(str(e), 400)
+            events = result['items']
+            pagination_info = result['pagination']
+        elif page or per_page:
+            result = paginate_query(
+                query, page, per_page, max_per_page=100,
+                include_total=(include_total or 'true').lower() == 'true'
+            )
             events = result['items']
             pagination_info = result['pagination']
         else:
@@ -81,67 +248,149 @@ def get_all_events():
             pagination_info = None
 
         # Process events and expand recurring ones if requested
+        occurrences_by_event = (
+            load_occurrences(events, window_start, window_end, fields) if include_recurring else {}
+        )
+        events_data = list(serialize_listing(events, occurrences_by_event, fields))
+
+        # Prepare response
+        response_data = {
+            "events": events_data,
+            "window": {
+                "start": format_utc(window_start),
+                "end": format_utc(window_end)
+            }
+        }
+        if pagination_info:
+            response_data["pagination"] = pagination_info
+
+        response = tag_response(success_response(data=response_data), etag)
+        response[0].headers['Vary'] = 'Accept'
+        return response
+
+    except Exception as e:
+        logger.error(f"Error retrieving events: {str(e)}")
+        return error_response("An error occurred while retrieving events", 500)
+
+
+@events_bp.route('/search', methods=['GET'])
+@jwt_required()
+@log_request_info
+def search_events():
+    """
+    Full-text search over the user's events, best match first
+
+    Query Parameters:
+    - q: Search text, every word is prefix-matched against title and description
+    - page: Page number (default: 1)
+    - per_page: Items per page (default: 20, max: 100)
+
+    Returns:
+    - Success response with ranked events and pagination info
+    """
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return error_response("Search query is required", 400)
+
+        # Cancelled occurrences are not events of their own
+        query = EventSearch.ranked_query(
+            user_events_query(current_user.id).filter(Event.is_cancelled == False), q
+        )
+        if query is None:
+            return error_response("Search query must contain at least one word", 400)
+
+        # Rank order is stable, so skip the COUNT and page by rank
+        result = paginate_query(query, max_per_page=100, include_total=False)
+
         events_data = []
+        for event, rank in result['items']:
+            event_data = serialize_event(event)
+            event_data["score"] = -float(rank or 0)
+            events_data.append(event_data)
 
-        for event in events:
-            if event.is_recurring and include_recurring and event.recurrence_rule:
-                # Generate recurring instances
-                start_range = datetime.utcnow()
-                end_range = start_range.replace(year=start_range.year + 1)  # Next year
+        return success_response(data={"events": events_data, "pagination": result['pagination']})
 
-                occurrences = RecurrenceGenerator.generate_occurrences(
-                    event, event.recurrence_rule, start_range, end_range
-                )
+    except Exception as e:
+        logger.error(f"Error searching events: {str(e)}")
+        return error_response("An error occurred while searching events", 500)
 
-                for occurrence in occurrences:
-                    occurrence_data = occurrence.copy()
-                    # Format datetime fields
-                    if isinstance(occurrence_data['start_datetime'], datetime):
-                        occurrence_data['start_datetime'] = occurrence_data['start_datetime'].replace(
-                            tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-                    if occurrence_data['end_datetime'] and isinstance(occurrence_data['end_datetime'], datetime):
-                        occurrence_data['end_datetime'] = occurrence_data['end_datetime'].replace(
-                            tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-                    if isinstance(occurrence_data['created_at'], datetime):
-                        occurrence_data['created_at'] = occurrence_data['created_at'].replace(
-                            tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-                    if isinstance(occurrence_data['updated_at'], datetime):
-                        occurrence_data['updated_at'] = occurrence_data['updated_at'].replace(
-                            tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-
-                    events_data.append(occurrence_data)
-            else:
-                # Regular event or recurring event master
-                event_data = {
-                    "id": event.id,
-                    "title": event.title,
-                    "description": event.description,
-                    "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                    "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
-                    "is_all_day": event.is_all_day,
-                    "color": event.color,
-                    "is_recurring": event.is_recurring,
-                    "recurrence_id": event.recurrence_id,
-                    "created_at": event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                    "updated_at": event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                    "categories": [cat.to_dict() for cat in event.categories]
-                }
 
-                if event.recurrence_rule:
-                    event_data["recurrence_rule"] = event.recurrence_rule.to_dict()
+@events_bp.route('/occurrence-cache', methods=['GET'])
+@jwt_required()
+@log_request_info
+def get_occurrence_cache_stats():
+    """
+    Get hit/miss counters of this process's recurring occurrence cache
 
-                events_data.append(event_data)
+    Returns:
+    - Success response with cache counters and limits, and those of the
+      compiled rule cache under compiled_rules
+    """
+    return success_response(data={
+        **RecurrenceGenerator.cache.stats(),
+        'compiled_rules': RecurrenceGenerator.rule_cache.stats()
+    })
 
-        # Prepare response
-        response_data = {"events": events_data}
-        if pagination_info:
-            response_data["pagination"] = pagination_info
 
-        return success_response(data=response_data)
+@events_bp.route('/changes', methods=['GET'])
+@jwt_required()
+@log_request_info
+def get_event_changes():
+    """
+    Get the user's events changed since a sync token (delta sync)
+
+    Query Parameters:
+    - since: Sync token from a previous call; without it only the current token is returned
+    - limit: Maximum number of change records to read (default: 500, max: 1000)
+
+    Fetch the token before the initial full download, then poll with it.
+
+    Returns:
+    - Success response with changed events, ids of deleted events, the next
+      sync token and whether more changes are pending, or 410 if the token is
+      older than the change retention period and a full resync is needed
+    """
+    try:
+        since = request.args.get('since')
+        if not since:
+            return success_response(data={
+                "events": [],
+                "deleted": [],
+                "sync_token": encode_sync_token(latest_sequence(current_user.id)),
+                "has_more": False
+            })
+
+        try:
+            sequence, issued_at = decode_sync_token(since)
+        except ValueError as e:
+            return error_response(str(e), 400)
+
+        if sync_token_expired(issued_at):
+            return error_response("Sync token expired, a full resync is required", 410)
+
+        limit = min(max(request.args.get('limit', 500, type=int), 1), 1000)
+        latest, last_sequence, has_more = changes_since(current_user.id, sequence, limit)
+
+        deleted_ids = [event_id for event_id, change_type in latest.items() if change_type == 'deleted']
+        changed_ids = [event_id for event_id, change_type in latest.items() if change_type != 'deleted']
+
+        events = []
+        if changed_ids:
+            events = user_events_query(current_user.id).filter(Event.id.in_(changed_ids)).all()
+
+        events_data = [serialize_event(event) for event in events]
+
+        return success_response(data={
+            "events": events_data,
+            "deleted": deleted_ids,
+            "sync_token": encode_sync_token(last_sequence),
+            "has_more": has_more
+        })
 
     except Exception as e:
-        logger.error(f"Error retrieving events: {str(e)}")
-        return error_response("An error occurred while retrieving events", 500)
+        logger.error(f"Error retrieving event changes: {str(e)}")
+        return error_response("An error occurred while retrieving event changes", 500)
 
 
 @events_bp.route('/<int:event_id>', methods=['GET'])
@@ -158,28 +407,12 @@ def get_event(event_id):
     - Success response with event details
     """
     try:
-        event = Event.query.filter_by(id=event_id, user_id=current_user.id).first()
+        event = user_events_query(current_user.id).filter(Event.id == event_id).first()
 
         if not event:
             return error_response("Event not found", 404)
 
-        event_data = {
-            "id": event.id,
-            "title": event.title,
-            "description": event.description,
-            "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
-            "is_all_day": event.is_all_day,
-            "color": event.color,
-            "is_recurring": event.is_recurring,
-            "recurrence_id": event.recurrence_id,
-            "created_at": event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "updated_at": event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "categories": [cat.to_dict() for cat in event.categories]
-        }
-
-        if event.recurrence_rule:
-            event_data["recurrence_rule"] = event.recurrence_rule.to_dict()
+        event_data = serialize_event(event)
 
         return success_response(data=event_data)
 
@@ -362,6 +595,7 @@ def create_event():
                 end_date=validate_datetime_string(recurrence_rule_data['end_date'])[1] if recurrence_rule_data.get('end_date') else None,
                 occurrence_count=recurrence_rule_data.get('occurrence_count')
             )
+            recurrence_rule.rrule = RecurrenceGenerator.to_rrule_string(recurrence_rule)
             db.session.add(recurrence_rule)
 
         # Create reminders if provided
@@ -378,37 +612,17 @@ def create_event():
             db.session.add(reminder)
             created_reminders.append(reminder)
 
+        if is_recurring:
+            OccurrenceStore.rebuild_series(new_event)
+
         # Commit all changes
+        record_event_changes(current_user.id, [new_event.id], 'created')
         db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events([new_event.id])
 
         # Return created event with reminders
-        event_data = {
-            "id": new_event.id,
-            "title": new_event.title,
-            "description": new_event.description,
-            "start_datetime": new_event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "end_datetime": new_event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if new_event.end_datetime else None,
-            "is_all_day": new_event.is_all_day,
-            "color": new_event.color,
-            "is_recurring": new_event.is_recurring,
-            "recurrence_id": new_event.recurrence_id,
-            "created_at": new_event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "updated_at": new_event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "categories": [cat.to_dict() for cat in new_event.categories],
-            "reminders": [
-                {
-                    "id": reminder.id,
-                    "reminder_time": reminder.reminder_time.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                    "notification_type": reminder.notification_type,
-                    "minutes_before": reminder.minutes_before,
-                    "is_relative": reminder.is_relative
-                }
-                for reminder in created_reminders
-            ]
-        }
-
-        if recurrence_rule:
-            event_data["recurrence_rule"] = recurrence_rule.to_dict()
+        event_data = serialize_event(new_event)
+        event_data["reminders"] = [serialize_reminder(reminder) for reminder in created_reminders]
 
         logger.info(f"Event created with {len(created_reminders)} reminders: {new_event.id} by user {current_user.username}")
         return success_response(data=event_data, message="Event created successfully", status_code=201)
@@ -541,6 +755,7 @@ def update_event(event_id):
                     rule.day_of_week = recurrence_rule_data.get('day_of_week')
                     rule.end_date = validate_datetime_string(recurrence_rule_data['end_date'])[1] if recurrence_rule_data.get('end_date') else None
                     rule.occurrence_count = recurrence_rule_data.get('occurrence_count')
+                    rule.rrule = RecurrenceGenerator.to_rrule_string(rule)
                     rule.updated_at = datetime.utcnow()
                 else:
                     # Create new rule
@@ -555,6 +770,7 @@ def update_event(event_id):
                         end_date=validate_datetime_string(recurrence_rule_data['end_date'])[1] if recurrence_rule_data.get('end_date') else None,
                         occurrence_count=recurrence_rule_data.get('occurrence_count')
                     )
+                    new_rule.rrule = RecurrenceGenerator.to_rrule_string(new_rule)
                     db.session.add(new_rule)
 
                     # Generate recurrence ID if not exists
@@ -575,6 +791,11 @@ def update_event(event_id):
 
         event.updated_at = datetime.utcnow()
 
+        # Exceptions are keyed by occurrence starts, a new start or rule moves them all
+        discarded_ids = []
+        if 'start_datetime' in updates or 'recurrence_rule' in data:
+            discarded_ids = OccurrenceOverrides.discard([event.id])
+
         # Update relative reminders if start_datetime changed
         if 'start_datetime' in updates:
             relative_reminders = Reminder.query.filter_by(event_id=event.id, is_relative=True).all()
@@ -585,26 +806,15 @@ def update_event(event_id):
                         reminder.reminder_time = new_reminder_time
                         reminder.updated_at = datetime.utcnow()
 
+        OccurrenceStore.rebuild_series(event)
+        record_event_changes(current_user.id, [event.id], 'updated')
+        if discarded_ids:
+            record_event_changes(current_user.id, discarded_ids, 'deleted')
         db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events([event.id])
 
         # Return updated event
-        event_data = {
-            "id": event.id,
-            "title": event.title,
-            "description": event.description,
-            "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
-            "is_all_day": event.is_all_day,
-            "color": event.color,
-            "is_recurring": event.is_recurring,
-            "recurrence_id": event.recurrence_id,
-            "created_at": event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "updated_at": event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "categories": [cat.to_dict() for cat in event.categories]
-        }
-
-        if event.recurrence_rule:
-            event_data["recurrence_rule"] = event.recurrence_rule.to_dict()
+        event_data = serialize_event(event)
 
         logger.info(f"Event {event_id} updated by user {current_user.username}")
         return success_response(data=event_data, message="Event updated successfully")
@@ -636,8 +846,12 @@ def delete_event(event_id):
             return error_response("Event not found", 404)
 
         event_title = event.title
+        OccurrenceStore.delete_series([event.id])
+        exception_ids = OccurrenceOverrides.discard([event.id])
         db.session.delete(event)
+        record_event_changes(current_user.id, [event_id] + exception_ids, 'deleted')
         db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events([event_id])
 
         logger.info(f"Event {event_id} ({event_title}) deleted by user {current_user.username}")
         return success_response(message="Event deleted successfully")
@@ -723,26 +937,18 @@ def move_event(event_id):
                     reminder.updated_at = datetime.utcnow()
 
         event.updated_at = datetime.utcnow()
+        discarded_ids = []
+        if event.is_recurring:
+            OccurrenceStore.rebuild_series(event)
+            discarded_ids = OccurrenceOverrides.discard([event.id])
+        record_event_changes(current_user.id, [event.id], 'updated')
+        if discarded_ids:
+            record_event_changes(current_user.id, discarded_ids, 'deleted')
         db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events([event.id])
 
         # Return updated event
-        event_data = {
-            "id": event.id,
-            "title": event.title,
-            "description": event.description,
-            "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
-            "is_all_day": event.is_all_day,
-            "color": event.color,
-            "is_recurring": event.is_recurring,
-            "recurrence_id": event.recurrence_id,
-            "created_at": event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "updated_at": event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "categories": [cat.to_dict() for cat in event.categories]
-        }
-
-        if event.recurrence_rule:
-            event_data["recurrence_rule"] = event.recurrence_rule.to_dict()
+        event_data = serialize_event(event)
 
         logger.info(f"Event {event_id} moved by user {current_user.username}")
         return success_response(data=event_data, message="Event moved successfully")
@@ -753,6 +959,356 @@ def move_event(event_id):
         return error_response("An error occurred while moving the event", 500)
 
 
+def find_occurrence(event_id, occurrence_start):
+    """
+    Resolve a recurring event of the current user and one of its occurrences
+
+    Parameters:
+    - event_id: ID of the recurring event
+    - occurrence_start: Start of the occurrence as the series has it (ISO format)
+
+    Returns:
+    - (event, occurrence start as naive UTC, None), or (None, None, error response)
+    """
+    event = Event.query.filter_by(id=event_id, user_id=current_user.id).first()
+    if not event:
+        return None, None, error_response("Event not found", 404)
+
+    if not event.is_recurring or not event.recurrence_rule:
+        return None, None, error_response("Event is not recurring", 400)
+
+    is_valid, original_start = validate_datetime_string(occurrence_start)
+    if not is_valid:
+        return None, None, error_response(original_start, 400)
+    original_start = to_naive_utc(original_start)
+
+    if not RecurrenceGenerator.is_occurrence(event, event.recurrence_rule, original_start):
+        return None, None, error_response("Event has no occurrence starting at that time", 404)
+
+    return event, original_start, None
+
+
+def occurrence_times(data, start, end):
+    """
+    Apply start_datetime / end_datetime of a request to an occurrence's times
+
+    A new start without a new end keeps the duration.
+
+    Returns:
+    - (True, (start, end)) if valid, (False, error_message) if invalid
+    """
+    if 'start_datetime' in data:
+        is_valid, new_start = validate_datetime_string(data['start_datetime'])
+        if not is_valid:
+            return False, new_start
+        new_start = to_naive_utc(new_start)
+        if end is not None:
+            end = new_start + (end - start)
+        start = new_start
+
+    if 'end_datetime' in data:
+        if data['end_datetime'] is None:
+            end = None
+        else:
+            is_valid, end = validate_datetime_string(data['end_datetime'])
+            if not is_valid:
+                return False, end
+            end = to_naive_utc(end)
+
+    if end is not None and end <= start:
+        return False, "End datetime must be after start datetime"
+
+    return True, (start, end)
+
+
+@events_bp.route('/<int:event_id>/occurrences/<occurrence_start>', methods=['PUT'])
+@jwt_required()
+@handle_validation_errors
+@handle_database_errors
+@log_request_info
+def update_occurrence(event_id, occurrence_start):
+    """
+    Change a single occurrence of a recurring event
+
+    The occurrence is replaced by an exception event keyed by its original
+    start; the rest of the series is unchanged. Updating a cancelled
+    occurrence restores it.
+
+    Parameters:
+    - event_id: ID of the recurring event
+    - occurrence_start: Original start of the occurrence (ISO format)
+
+    Request body (all optional, the occurrence keeps the series' values otherwise):
+    - title, description, start_datetime, end_datetime, is_all_day, color
+
+    Returns:
+    - Success response with the changed occurrence
+    """
+    try:
+        event, original_start, error = find_occurrence(event_id, occurrence_start)
+        if error:
+            return error
+
+        data = request.get_json()
+
+        if not data:
+            return error_response("Invalid request data", 400)
+
+        if 'title' in data and not data['title']:
+            return error_response("Title cannot be empty", 400)
+
+        exception = OccurrenceOverrides.find(event.id, original_start)
+        created = exception is None
+
+        if created:
+            # Start from the occurrence as the series has it
+            start = original_start
+            end = original_start + (event.end_datetime - event.start_datetime) if event.end_datetime else None
+        else:
+            start, end = exception.start_datetime, exception.end_datetime
+
+        is_valid, times = occurrence_times(data, start, end)
+        if not is_valid:
+            return error_response(times, 400)
+
+        if created:
+            exception = Event(
+                user_id=current_user.id,
+                parent_event_id=event.id,
+                original_start_datetime=original_start,
+                title=event.title,
+                description=event.description,
+                is_all_day=event.is_all_day,
+                color=event.color,
+                is_recurring=False,
+                recurrence_id=event.recurrence_id
+            )
+            exception.categories = list(event.categories)
+            db.session.add(exception)
+
+        exception.start_datetime, exception.end_datetime = times
+        for name in ('title', 'description', 'color'):
+            if name in data:
+                setattr(exception, name, data[name])
+        if 'is_all_day' in data:
+            exception.is_all_day = bool(data['is_all_day'])
+        exception.is_cancelled = False
+        exception.updated_at = datetime.utcnow()
+
+        db.session.flush()
+        record_event_changes(current_user.id, [exception.id], 'created' if created else 'updated')
+        db.session.commit()
+
+        occurrence_data = serialize_occurrences([OccurrenceOverrides.occurrence_data(exception)])[0]
+
+        logger.info(f"Occurrence {original_start} of event {event_id} changed by user {current_user.username}")
+        return success_response(
+            data=occurrence_data, message="Occurrence updated successfully", status_code=201 if created else 200
+        )
+
+    except Exception as e:
+        logger.error(f"Error updating occurrence of event {event_id}: {str(e)}")
+        db.session.rollback()
+        return error_response("An error occurred while updating the occurrence", 500)
+
+
+@events_bp.route('/<int:event_id>/occurrences/<occurrence_start>', methods=['DELETE'])
+@jwt_required()
+@handle_database_errors
+@log_request_info
+def cancel_occurrence(event_id, occurrence_start):
+    """
+    Cancel a single occurrence of a recurring event (EXDATE)
+
+    Parameters:
+    - event_id: ID of the recurring event
+    - occurrence_start: Original start of the occurrence (ISO format)
+
+    Returns:
+    - Success response
+    """
+    try:
+        event, original_start, error = find_occurrence(event_id, occurrence_start)
+        if error:
+            return error
+
+        exception = OccurrenceOverrides.find(event.id, original_start)
+        created = exception is None
+
+        if created:
+            exception = Event(
+                user_id=current_user.id,
+                parent_event_id=event.id,
+                original_start_datetime=original_start,
+                title=event.title,
+                start_datetime=original_start,
+                end_datetime=original_start + (event.end_datetime - event.start_datetime) if event.end_datetime else None,
+                is_recurring=False,
+                recurrence_id=event.recurrence_id
+            )
+            db.session.add(exception)
+        else:
+            # A cancelled occurrence sends no reminders
+            Reminder.query.filter_by(event_id=exception.id).delete()
+
+        exception.is_cancelled = True
+        exception.updated_at = datetime.utcnow()
+
+        db.session.flush()
+        record_event_changes(current_user.id, [exception.id], 'created' if created else 'updated')
+        db.session.commit()
+
+        logger.info(f"Occurrence {original_start} of event {event_id} cancelled by user {current_user.username}")
+        return success_response(message="Occurrence cancelled successfully")
+
+    except Exception as e:
+        logger.error(f"Error cancelling occurrence of event {event_id}: {str(e)}")
+        db.session.rollback()
+        return error_response("An error occurred while cancelling the occurrence", 500)
+
+
+@events_bp.route('/<int:event_id>/split', methods=['POST'])
+@jwt_required()
+@handle_validation_errors
+@handle_database_errors
+@log_request_info
+def split_event(event_id):
+    """
+    Change a recurring event from one occurrence on ("this and following")
+
+    The series is ended before the occurrence and a new series starting at
+    the occurrence takes over the rest, with the changes applied. The new
+    series gets the categories of the old one; reminders stay with the old
+    one. Exceptions of later occurrences move to the new series when its
+    occurrences keep their times, and are discarded otherwise.
+
+    Parameters:
+    - event_id: ID of the recurring event
+
+    Request body:
+    - occurrence_start: Original start of the first occurrence to change (ISO format)
+    - title, description, start_datetime, end_datetime, is_all_day, color: (optional) Changes for the new series
+    - recurrence_rule: (optional) Rule of the new series (default: the rest of the current rule)
+
+    Returns:
+    - Success response with the shortened series as event and the new one as following
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return error_response("Invalid request data", 400)
+
+        event, original_start, error = find_occurrence(event_id, data.get('occurrence_start'))
+        if error:
+            return error
+
+        rule = event.recurrence_rule
+        if RecurrenceGenerator.build_rrule(event, rule).after(event.start_datetime, inc=True) == original_start:
+            return error_response("This is the first occurrence, update the whole event instead", 400)
+
+        if 'title' in data and not data['title']:
+            return error_response("Title cannot be empty", 400)
+
+        duration = event.end_datetime - event.start_datetime if event.end_datetime else None
+        is_valid, times = occurrence_times(
+            data, original_start, original_start + duration if duration is not None else None
+        )
+        if not is_valid:
+            return error_response(times, 400)
+
+        rule_data = data.get('recurrence_rule')
+        if rule_data is not None:
+            validation_errors = RecurrenceGenerator.validate_recurrence_rule(rule_data)
+            if validation_errors:
+                return error_response("Invalid recurrence rule", 400, errors=validation_errors)
+
+        # The new series takes over the rest of the current rule unless it gets its own
+        if rule_data is None:
+            following_rule = RecurrenceRule(
+                frequency=rule.frequency,
+                interval=rule.interval,
+                days_of_week=rule.days_of_week,
+                day_of_month=rule.day_of_month,
+                week_of_month=rule.week_of_month,
+                day_of_week=rule.day_of_week,
+                end_date=rule.end_date,
+                occurrence_count=rule.occurrence_count
+            )
+        else:
+            following_rule = RecurrenceRule(
+                frequency=rule_data['frequency'],
+                interval=rule_data.get('interval', 1),
+                days_of_week=','.join(rule_data['days_of_week']) if rule_data.get('days_of_week') else None,
+                day_of_month=rule_data.get('day_of_month'),
+                week_of_month=rule_data.get('week_of_month'),
+                day_of_week=rule_data.get('day_of_week'),
+                end_date=validate_datetime_string(rule_data['end_date'])[1] if rule_data.get('end_date') else None,
+                occurrence_count=rule_data.get('occurrence_count')
+            )
+
+        # End the current series before the occurrence, a COUNT is split between both series
+        if rule.occurrence_count and not rule.end_date:
+            before = RecurrenceGenerator.count_before(event, rule, original_start)
+            if rule_data is None:
+                following_rule.occurrence_count = rule.occurrence_count - before
+            rule.occurrence_count = before
+        else:
+            rule.end_date = original_start - timedelta(seconds=1)
+        rule.rrule = RecurrenceGenerator.to_rrule_string(rule)
+        rule.updated_at = datetime.utcnow()
+        event.updated_at = datetime.utcnow()
+
+        following = Event(
+            user_id=current_user.id,
+            title=data.get('title', event.title),
+            description=data['description'] if 'description' in data else event.description,
+            start_datetime=times[0],
+            end_datetime=times[1],
+            is_all_day=bool(data['is_all_day']) if 'is_all_day' in data else event.is_all_day,
+            color=data.get('color', event.color),
+            is_recurring=True,
+            recurrence_id=RecurrenceGenerator.generate_recurrence_id()
+        )
+        db.session.add(following)
+        db.session.flush()
+
+        following_rule.event_id = following.id
+        following_rule.rrule = RecurrenceGenerator.to_rrule_string(following_rule)
+        db.session.add(following_rule)
+        OccurrenceOverrides.copy_categories(event.id, following.id)
+
+        # Exceptions are keyed by occurrence starts, they only carry over to the same times
+        if times[0] == original_start and rule_data is None:
+            moved_ids = OccurrenceOverrides.move(event.id, following.id, original_start, following.recurrence_id)
+            discarded_ids = []
+        else:
+            moved_ids = []
+            discarded_ids = OccurrenceOverrides.discard([event.id], original_start)
+
+        OccurrenceOverrides.truncate_stored(event.id, original_start)
+        OccurrenceStore.rebuild_series(following)
+
+        record_event_changes(current_user.id, [event.id] + moved_ids, 'updated')
+        record_event_changes(current_user.id, [following.id], 'created')
+        if discarded_ids:
+            record_event_changes(current_user.id, discarded_ids, 'deleted')
+        db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events([event.id, following.id])
+
+        logger.info(f"Event {event_id} split at {original_start} into {following.id} by user {current_user.username}")
+        return success_response(
+            data={"event": serialize_event(event), "following": serialize_event(following)},
+            message="Event split successfully",
+            status_code=201
+        )
+
+    except Exception as e:
+        logger.error(f"Error splitting event {event_id}: {str(e)}")
+        db.session.rollback()
+        return error_response("An error occurred while splitting the event", 500)
+
+
 @events_bp.route('/bulk-delete', methods=['DELETE'])
 @jwt_required()
 @rate_limit(limit=10, window=300)  # 10 bulk operations per 5 minutes
@@ -794,10 +1350,14 @@ def bulk_delete_events():
 
         # Delete found events
         deleted_count = len(events)
+        OccurrenceStore.delete_series(found_ids)
+        exception_ids = OccurrenceOverrides.discard(found_ids)
         for event in events:
             db.session.delete(event)
 
+        record_event_changes(current_user.id, found_ids + exception_ids, 'deleted')
         db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events(found_ids)
 
         response_data = {
             "deleted_count": deleted_count,
@@ -885,12 +1445,19 @@ def bulk_move_events():
                             reminder.updated_at = datetime.utcnow()
 
                 event.updated_at = datetime.utcnow()
+                if event.is_recurring:
+                    OccurrenceStore.rebuild_series(event)
                 updated_events.append(event)
 
             except Exception as e:
                 errors.append(f"Event {event.id}: {str(e)}")
 
+        discarded_ids = OccurrenceOverrides.discard([event.id for event in updated_events if event.is_recurring])
+        record_event_changes(current_user.id, [event.id for event in updated_events], 'updated')
+        if discarded_ids:
+            record_event_changes(current_user.id, discarded_ids, 'deleted')
         db.session.commit()
+        RecurrenceGenerator.cache.invalidate_events([event.id for event in updated_events])
 
         # Prepare response data
         events_data = []
@@ -898,8 +1465,8 @@ def bulk_move_events():
             events_data.append({
                 "id": event.id,
                 "title": event.title,
-                "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
+                "start_datetime": format_utc(event.start_datetime),
+                "end_datetime": format_utc(event.end_datetime),
             })
 
         response_data = {
@@ -958,10 +1525,7 @@ def bulk_copy_events():
             return error_response("Cannot copy more than 20 events at once", 400)
 
         # Find events that belong to the current user
-        events = Event.query.filter(
-            Event.id.in_(event_ids),
-            Event.user_id == current_user.id
-        ).all()
+        events = user_events_query(current_user.id).filter(Event.id.in_(event_ids)).all()
 
         if not events:
             return error_response("No events found to copy", 404)
@@ -1022,6 +1586,7 @@ def bulk_copy_events():
             except Exception as e:
                 errors.append(f"Event {event.id}: {str(e)}")
 
+        record_event_changes(current_user.id, [event.id for event in copied_events], 'created')
         db.session.commit()
 
         # Prepare response data
@@ -1030,9 +1595,9 @@ def bulk_copy_events():
             events_data.append({
                 "id": event.id,
                 "title": event.title,
-                "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
-                "categories": [cat.to_dict() for cat in event.categories]
+                "start_datetime": format_utc(event.start_datetime),
+                "end_datetime": format_utc(event.end_datetime),
+                "categories": serialize_categories(event.categories)
             })
 
         response_data = {
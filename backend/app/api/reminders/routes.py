@@ -1,11 +1,14 @@
 from flask import request
 from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy.orm import load_only
 from datetime import datetime, timezone, timedelta
 
 from ... import db
 from . import reminders_bp
 from ...models import Reminder, Event
 from ...utils.responses import success_response, error_response
+from ...utils.calendar_version import bump_calendar_version
+from ...utils.serializers import REMINDER_FIELDS, parse_fields, serialize_reminder
 from ...utils.validators import validate_datetime_string
 from ...utils.rate_limiter import rate_limit
 from ...utils.error_handler import handle_validation_errors, handle_database_errors, log_request_info
@@ -22,10 +25,18 @@ def get_event_reminders(event_id):
     Parameters:
     - event_id: ID of the event
 
+    Query Parameters:
+    - fields: Comma-separated fields to return (default: all), only those columns are loaded
+
     Returns:
     - Success response with list of reminders
     """
     try:
+        try:
+            fields = parse_fields(request.args.get('fields'), REMINDER_FIELDS)
+        except ValueError as e:
+            return error_response(str(e), 400)
+
         # Check if event exists and belongs to the current user
         event = Event.query.filter_by(id=event_id, user_id=current_user.id).first()
 
@@ -33,21 +44,12 @@ def get_event_reminders(event_id):
             return error_response("Event not found", 404)
 
         # Get reminders for the event
-        reminders = Reminder.query.filter_by(event_id=event_id).order_by(Reminder.reminder_time).all()
+        query = Reminder.query.filter_by(event_id=event_id).order_by(Reminder.reminder_time)
+        if fields:
+            query = query.options(load_only(*(getattr(Reminder, name) for name in fields)))
+        reminders = query.all()
 
-        reminders_data = []
-        for reminder in reminders:
-            reminders_data.append({
-                "id": reminder.id,
-                "event_id": reminder.event_id,
-                "reminder_time": reminder.reminder_time.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                "notification_sent": reminder.notification_sent,
-                "notification_type": reminder.notification_type,
-                "minutes_before": reminder.minutes_before,
-                "is_relative": reminder.is_relative,
-                "created_at": reminder.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                "updated_at": reminder.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-            })
+        reminders_data = [serialize_reminder(reminder, fields) for reminder in reminders]
 
         return success_response(data={"reminders": reminders_data})
 
@@ -160,20 +162,11 @@ def create_reminder(event_id):
 
         # Save to database
         db.session.add(new_reminder)
+        bump_calendar_version(current_user.id)
         db.session.commit()
 
         # Return created reminder
-        reminder_data = {
-            "id": new_reminder.id,
-            "event_id": new_reminder.event_id,
-            "reminder_time": new_reminder.reminder_time.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "notification_sent": new_reminder.notification_sent,
-            "notification_type": new_reminder.notification_type,
-            "minutes_before": new_reminder.minutes_before,
-            "is_relative": new_reminder.is_relative,
-            "created_at": new_reminder.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "updated_at": new_reminder.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-        }
+        reminder_data = serialize_reminder(new_reminder)
 
         logger.info(f"Reminder created for event {event_id} by user {current_user.username}")
         return success_response(data={"reminder": reminder_data}, message="Reminder created successfully", status_code=201)
@@ -279,20 +272,11 @@ def update_reminder(reminder_id):
             setattr(reminder, key, value)
 
         reminder.updated_at = datetime.utcnow()
+        bump_calendar_version(current_user.id)
         db.session.commit()
 
         # Return updated reminder
-        reminder_data = {
-            "id": reminder.id,
-            "event_id": reminder.event_id,
-            "reminder_time": reminder.reminder_time.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "notification_sent": reminder.notification_sent,
-            "notification_type": reminder.notification_type,
-            "minutes_before": reminder.minutes_before,
-            "is_relative": reminder.is_relative,
-            "created_at": reminder.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-            "updated_at": reminder.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-        }
+        reminder_data = serialize_reminder(reminder)
 
         logger.info(f"Reminder {reminder_id} updated by user {current_user.username}")
         return success_response(data={"reminder": reminder_data}, message="Reminder updated successfully")
@@ -332,6 +316,7 @@ def delete_reminder(reminder_id):
 
         # Delete reminder
         db.session.delete(reminder)
+        bump_calendar_version(current_user.id)
         db.session.commit()
 
         logger.info(f"Reminder {reminder_id} deleted by user {current_user.username}")
@@ -458,19 +443,11 @@ def create_bulk_reminders():
 
         # Commit all valid reminders
         if created_reminders:
+            bump_calendar_version(current_user.id)
             db.session.commit()
 
         # Prepare response data
-        created_data = []
-        for reminder in created_reminders:
-            created_data.append({
-                "id": reminder.id,
-                "event_id": reminder.event_id,
-                "reminder_time": reminder.reminder_time.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-                "notification_type": reminder.notification_type,
-                "minutes_before": reminder.minutes_before,
-                "is_relative": reminder.is_relative
-            })
+        created_data = [serialize_reminder(reminder) for reminder in created_reminders]
 
         response_data = {
             "created_count": len(created_reminders),
@@ -540,6 +517,7 @@ def delete_bulk_reminders():
         for reminder in reminders:
             db.session.delete(reminder)
 
+        bump_calendar_version(current_user.id)
         db.session.commit()
 
         response_data = {
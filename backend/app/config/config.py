@@ -18,6 +18,66 @@ class Config:
     SQLALCHEMY_POOL_RECYCLE = 1800
     SQLALCHEMY_MAX_OVERFLOW = 20
 
+    # Event listing window used when the client does not send start/end
+    EVENTS_DEFAULT_WINDOW_DAYS_BEFORE = 30
+    EVENTS_DEFAULT_WINDOW_DAYS_AFTER = 365
+    # Upper bound on the span of a single listing window
+    EVENTS_MAX_WINDOW_DAYS = 732
+    # Safety limit on occurrences expanded per recurring series
+    EVENTS_MAX_OCCURRENCES_PER_SERIES = 1000
+    # Rows fetched per round trip when an event listing is streamed as NDJSON
+    EVENTS_STREAM_BATCH_SIZE = 500
+    # Occurrences of recurring events are stored in event_occurrences from
+    # now - HISTORY to now + HORIZON, listings outside that range expand live
+    OCCURRENCE_HISTORY_DAYS = 90
+    OCCURRENCE_HORIZON_DAYS = 400
+    # Per-process LRU cache of expanded occurrence lists
+    OCCURRENCE_CACHE_MAX_ENTRIES = int(os.getenv('OCCURRENCE_CACHE_MAX_ENTRIES', 1024))
+    OCCURRENCE_CACHE_MAX_BYTES = int(os.getenv('OCCURRENCE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    # Per-process LRU cache of compiled recurrence rules
+    RRULE_CACHE_MAX_ENTRIES = int(os.getenv('RRULE_CACHE_MAX_ENTRIES', 4096))
+    # Event change feed rows (and sync tokens) are kept this long
+    CHANGE_FEED_RETENTION_DAYS = 30
+
+    # Opt-in response compression, negotiated with Accept-Encoding. zstd and
+    # br are used only when their packages are installed
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'false').lower() == 'true'
+    COMPRESSION_ALGORITHMS = ['zstd', 'br', 'gzip']
+    COMPRESSION_MIMETYPES = ['application/json', 'application/x-ndjson']
+    # Smaller bodies are sent as is, streamed bodies are always compressed
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3))
+    # Compressed bodies of ETag'd responses are kept per process up to this size
+    COMPRESSION_CACHE_MAX_BYTES = int(os.getenv('COMPRESSION_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+
+    # Run the reminder scheduler inside the app process. Leave it off for web
+    # workers and run `flask reminder-worker` as one separate process
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    # Reminders a worker claims per round trip, and how long a claim lasts
+    # before another worker may take over the reminders of a dead one
+    REMINDER_BATCH_SIZE = int(os.getenv('REMINDER_BATCH_SIZE', 100))
+    REMINDER_CLAIM_LEASE_SECONDS = int(os.getenv('REMINDER_CLAIM_LEASE_SECONDS', 300))
+    # The reminder engine fires reminders at their exact time from an in-memory
+    # heap of the next HORIZON, follows reminder writes every CHANGE_POLL
+    # seconds and reconciles with a full scan every RECONCILE seconds.
+    # Without it, due reminders are polled every minute
+    REMINDER_ENGINE_ENABLED = os.getenv('REMINDER_ENGINE_ENABLED', 'true').lower() == 'true'
+    REMINDER_ENGINE_HORIZON_SECONDS = int(os.getenv('REMINDER_ENGINE_HORIZON_SECONDS', 900))
+    REMINDER_RECONCILE_SECONDS = int(os.getenv('REMINDER_RECONCILE_SECONDS', 300))
+    REMINDER_CHANGE_POLL_SECONDS = int(os.getenv('REMINDER_CHANGE_POLL_SECONDS', 5))
+    # Failed notifications are tried again after this long
+    REMINDER_RETRY_SECONDS = int(os.getenv('REMINDER_RETRY_SECONDS', 60))
+    # Notifications are sent concurrently, with this many sends per channel,
+    # at most DISPATCH_QUEUE_SIZE queued or running, and each given up on
+    # after SEND_TIMEOUT seconds (see app/utils/notification_dispatcher.py)
+    REMINDER_EMAIL_CONCURRENCY = int(os.getenv('REMINDER_EMAIL_CONCURRENCY', 10))
+    REMINDER_PUSH_CONCURRENCY = int(os.getenv('REMINDER_PUSH_CONCURRENCY', 20))
+    REMINDER_SMS_CONCURRENCY = int(os.getenv('REMINDER_SMS_CONCURRENCY', 5))
+    REMINDER_DISPATCH_QUEUE_SIZE = int(os.getenv('REMINDER_DISPATCH_QUEUE_SIZE', 200))
+    REMINDER_SEND_TIMEOUT_SECONDS = int(os.getenv('REMINDER_SEND_TIMEOUT_SECONDS', 30))
+
     # CORS configuration - allow requests from frontend
     CORS_ORIGINS = os.getenv('FRONTEND_URL', '*').split(',')
 
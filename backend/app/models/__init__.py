@@ -4,6 +4,8 @@ from .reminder import Reminder
 from .category import Category
 from .recurrence_rule import RecurrenceRule
 from .event_category import event_categories
+from .event_occurrence import EventOccurrence
+from .event_change import EventChange
 from .email_verification_token import EmailVerificationToken
 from .password_reset_token import PasswordResetToken
 from .oauth_account import OAuthAccount
\ No newline at end of file
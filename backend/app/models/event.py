@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import DDL, event as sa_event
 from .. import db
 
 class Event(db.Model):
@@ -15,9 +16,19 @@ class Event(db.Model):
 
     # New fields for recurrence
     is_recurring = db.Column(db.Boolean, default=False)
-    recurrence_id = db.Column(db.String(36), nullable=True)  # UUID for grouping recurring events
+    recurrence_id = db.Column(db.String(36), nullable=True, index=True)  # UUID for grouping recurring events
     parent_event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=True)  # For exception handling
 
+    # Exceptions of a recurring series are child events keyed by the start of the
+    # occurrence they replace (RECURRENCE-ID), see app/utils/occurrence_overrides.py
+    original_start_datetime = db.Column(db.DateTime, nullable=True)
+    is_cancelled = db.Column(db.Boolean, nullable=False, default=False)  # EXDATE: the occurrence is removed
+
+    # Span of the event or the whole series, kept current on every flush, see app/utils/series_span.py
+    series_start = db.Column(db.DateTime, nullable=True)  # Start of the first occurrence
+    series_end = db.Column(db.DateTime, nullable=True)  # End of the last occurrence, NULL: the series has no end
+    next_occurrence_at = db.Column(db.DateTime, nullable=True, index=True)  # First occurrence from now on
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -29,6 +40,16 @@ class Event(db.Model):
     # Self-referential relationship for recurring events
     child_events = db.relationship('Event', backref=db.backref('parent_event', remote_side=[id]))
 
+    # Indexes
+    __table_args__ = (
+        # Serves listing by user ordered by start, including keyset pagination
+        db.Index('ix_events_user_start', 'user_id', 'start_datetime', 'id'),
+        # One exception per occurrence, listings look them up per series
+        db.Index('ix_events_parent_original_start', 'parent_event_id', 'original_start_datetime', unique=True),
+        # Serves selecting the events and series overlapping a window
+        db.Index('ix_events_user_series', 'user_id', 'series_end', 'series_start'),
+    )
+
     def __repr__(self):
         return f'<Event {self.title}>'
 
@@ -53,4 +74,39 @@ class Event(db.Model):
         if self.recurrence_rule:
             result['recurrence_rule'] = self.recurrence_rule.to_dict()
 
-        return result
\ No newline at end of file
+        return result
+
+
+# Full-text search index over title and description, see app/utils/search.py.
+# PostgreSQL keeps a generated tsvector column with a GIN index; SQLite keeps an
+# FTS5 external-content table synced by triggers. Both stay current on insert,
+# update and delete, including set-based statements that bypass the ORM.
+_search_ddl = {
+    'postgresql': [
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING gin (search_vector)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+        "title, description, content='events', content_rowid='id', tokenize='unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN "
+        "INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN "
+        "INSERT INTO events_fts(events_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF title, description ON events BEGIN "
+        "INSERT INTO events_fts(events_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    ],
+}
+
+for _dialect, _statements in _search_ddl.items():
+    for _statement in _statements:
+        sa_event.listen(Event.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+
+sa_event.listen(
+    Event.__table__, 'before_drop', DDL("DROP TABLE IF EXISTS events_fts").execute_if(dialect='sqlite')
+)
@@ -5,5 +5,6 @@ event_categories = db.Table(
     'event_categories',
     db.Column('event_id', db.Integer, db.ForeignKey('events.id'), primary_key=True),
     db.Column('category_id', db.Integer, db.ForeignKey('categories.id'), primary_key=True),
-    db.Column('created_at', db.DateTime, default=db.func.current_timestamp())
+    db.Column('created_at', db.DateTime, default=db.func.current_timestamp()),
+    db.Index('ix_event_categories_category_id', 'category_id')
 )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from datetime import datetime
+from .. import db
+
+
+class EventChange(db.Model):
+    """Change feed row of an event, see app/utils/change_feed.py"""
+    __tablename__ = 'event_changes'
+
+    # Also the sync sequence, increasing per user in commit order
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # No foreign key, tombstones outlive the event
+    event_id = db.Column(db.Integer, nullable=False)
+    change_type = db.Column(db.String(10), nullable=False)  # created, updated, deleted
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    # Indexes
+    __table_args__ = (
+        db.Index('ix_event_changes_user_id_id', 'user_id', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<EventChange {self.id} {self.change_type} event {self.event_id}>'
@@ -0,0 +1,21 @@
+from .. import db
+
+
+class EventOccurrence(db.Model):
+    """Precomputed occurrence of a recurring event, see app/utils/occurrence_store.py"""
+    __tablename__ = 'event_occurrences'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    start_datetime = db.Column(db.DateTime, nullable=False)
+    end_datetime = db.Column(db.DateTime, nullable=True)
+
+    # Indexes
+    __table_args__ = (
+        db.Index('ix_event_occurrences_event_start', 'event_id', 'start_datetime'),
+        db.Index('ix_event_occurrences_user_start', 'user_id', 'start_datetime'),
+    )
+
+    def __repr__(self):
+        return f'<EventOccurrence {self.event_id} at {self.start_datetime}>'
@@ -6,7 +6,7 @@ class RecurrenceRule(db.Model):
     __tablename__ = 'recurrence_rules'
 
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
 
     # Recurrence pattern
     frequency = db.Column(db.String(20), nullable=False)  # DAILY, WEEKLY, MONTHLY, YEARLY
@@ -24,6 +24,13 @@ class RecurrenceRule(db.Model):
     end_date = db.Column(db.DateTime, nullable=True)
     occurrence_count = db.Column(db.Integer, nullable=True)
 
+    # Canonical RFC 5545 RRULE of the columns above (without DTSTART), set on write
+    rrule = db.Column(db.String(255), nullable=True)
+
+    # Range of occurrences currently stored in event_occurrences (NULL: not materialized)
+    materialized_from = db.Column(db.DateTime, nullable=True)
+    materialized_until = db.Column(db.DateTime, nullable=True, index=True)
+
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -42,6 +49,7 @@ class RecurrenceRule(db.Model):
             'day_of_week': self.day_of_week,
             'end_date': self.end_date.isoformat() if self.end_date else None,
             'occurrence_count': self.occurrence_count,
+            'rrule': self.rrule,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
\ No newline at end of file
@@ -5,9 +5,13 @@ class Reminder(db.Model):
     __tablename__ = 'reminders'
 
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
     reminder_time = db.Column(db.DateTime, nullable=False)
     notification_sent = db.Column(db.Boolean, default=False)
+
+    # Set while a reminder worker holds the reminder, see app/utils/reminder_queue.py
+    claim_token = db.Column(db.String(32), nullable=True, index=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
     
     # New fields for Phase 2
     notification_type = db.Column(db.String(20), default='email')  # email, push, sms
@@ -15,7 +19,18 @@ class Reminder(db.Model):
     is_relative = db.Column(db.Boolean, default=True)  # True for X minutes before, False for absolute time
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Indexed for the reminder engine, which reads recent writes by it
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Indexes
+    __table_args__ = (
+        # Partial index for the scheduler scan, only pending reminders are indexed
+        db.Index(
+            'ix_reminders_pending_time', 'reminder_time',
+            sqlite_where=db.text('notification_sent = 0'),
+            postgresql_where=db.text('notification_sent = false')
+        ),
+    )
 
     def __repr__(self):
         return f'<Reminder for Event {self.event_id} at {self.reminder_time}>'
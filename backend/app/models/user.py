@@ -16,7 +16,10 @@ class User(db.Model):
     account_status = db.Column(db.String(20), default='active')  # active, locked, suspended
     failed_login_attempts = db.Column(db.Integer, default=0)
     last_login_attempt = db.Column(db.DateTime, nullable=True)
-    
+
+    # Bumped on every event, category and reminder write, used for listing ETags
+    calendar_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,60 @@
+import hashlib
+import json
+from flask import request, current_app
+from sqlalchemy import update
+
+from .. import db
+from ..models import User
+
+
+def bump_calendar_version(user_id):
+    """
+    Increment the user's calendar version
+
+    Call it from every event, category and reminder write before the commit,
+    so the new version becomes visible together with the change.
+    """
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(calendar_version=User.calendar_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def calendar_etag(user, *parts):
+    """
+    Build a strong ETag for a listing of the user's calendar data
+
+    Parameters:
+    - user: The current user, its calendar_version is already loaded
+    - parts: Extra values the response depends on besides the query args
+
+    Returns:
+    - ETag value (without quotes)
+    """
+    payload = json.dumps([
+        user.id,
+        user.calendar_version or 0,
+        request.path,
+        sorted(request.args.items(multi=True)),
+        [str(part) for part in parts]
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def not_modified_response(etag):
+    """Return a 304 response if the client already has this ETag, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        return tag_response(response, etag)
+    return None
+
+
+def tag_response(response, etag):
+    """Attach the ETag to a response (or a (response, status) tuple)"""
+    target = response[0] if isinstance(response, tuple) else response
+    target.set_etag(etag)
+    # Let browsers keep the body but always revalidate it
+    target.headers['Cache-Control'] = 'private, no-cache'
+    return response
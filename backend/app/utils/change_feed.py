@@ -0,0 +1,116 @@
+import base64
+import json
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, func, insert, literal, select
+
+from .. import db
+from ..models import EventChange, event_categories
+from .calendar_version import bump_calendar_version
+
+
+def record_event_changes(user_id, event_ids, change_type):
+    """
+    Record changed events in the change feed and bump the calendar version
+
+    Call it from event write routes before the commit. The calendar version
+    UPDATE runs first and locks the user's row until the commit, so change
+    ids of one user are allocated and committed in the same order and a sync
+    token never skips a change committed later.
+
+    Parameters:
+    - user_id: Owner of the events
+    - event_ids: IDs of the changed events
+    - change_type: 'created', 'updated' or 'deleted'
+    """
+    bump_calendar_version(user_id)
+    if not event_ids:
+        return
+
+    changed_at = datetime.utcnow()
+    db.session.execute(insert(EventChange), [
+        {'user_id': user_id, 'event_id': event_id, 'change_type': change_type, 'changed_at': changed_at}
+        for event_id in event_ids
+    ])
+
+
+def record_category_changes(user_id, category_id):
+    """Record every event of a category as updated, events embed their categories"""
+    bump_calendar_version(user_id)
+    db.session.execute(
+        insert(EventChange).from_select(
+            ['user_id', 'event_id', 'change_type', 'changed_at'],
+            select(
+                literal(user_id), event_categories.c.event_id, literal('updated'), literal(datetime.utcnow())
+            ).where(event_categories.c.category_id == category_id)
+        )
+    )
+
+
+def encode_sync_token(sequence):
+    """Encode the last seen change id and the issue time as an opaque token"""
+    payload = json.dumps({'s': sequence, 't': int(time.time())}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_sync_token(token):
+    """
+    Decode a sync token
+
+    Returns:
+    - (sequence, issued_at) with issued_at as epoch seconds
+
+    Raises:
+    - ValueError if the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return int(payload['s']), int(payload['t'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid sync token")
+
+
+def sync_token_expired(issued_at):
+    """Changes older than the retention period may be pruned, a full resync is needed"""
+    retention = current_app.config['CHANGE_FEED_RETENTION_DAYS'] * 86400
+    return time.time() - issued_at > retention
+
+
+def latest_sequence(user_id):
+    """Return the id of the user's most recent change, 0 if none"""
+    return db.session.query(func.max(EventChange.id)).filter(EventChange.user_id == user_id).scalar() or 0
+
+
+def changes_since(user_id, sequence, limit):
+    """
+    Read the user's changes after a sequence, collapsed per event
+
+    Returns:
+    - (latest change type by event id, last sequence read, has_more)
+    """
+    rows = db.session.execute(
+        select(EventChange.id, EventChange.event_id, EventChange.change_type)
+        .where(EventChange.user_id == user_id, EventChange.id > sequence)
+        .order_by(EventChange.id)
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest = {}
+    for _, event_id, change_type in rows:
+        latest[event_id] = change_type
+
+    return latest, (rows[-1][0] if rows else sequence), has_more
+
+
+def prune_changes(now=None):
+    """Delete change rows older than the retention period"""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=current_app.config['CHANGE_FEED_RETENTION_DAYS'])
+    result = db.session.execute(delete(EventChange).where(EventChange.changed_at < cutoff))
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,205 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request, current_app
+
+# Brotli and Zstandard are optional, gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def available_encodings():
+    """Content codings this process can produce, in server preference order"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.append('gzip')
+    return encodings
+
+
+def negotiate_encoding(accept_encodings, enabled):
+    """
+    Pick the content coding for a response
+
+    Parameters:
+    - accept_encodings: The request's parsed Accept-Encoding header
+    - enabled: Codings allowed by configuration, in preference order
+
+    Returns:
+    - The coding with the highest client quality, ties going to the server
+      preference, or None to send the body uncompressed
+    """
+    best, best_quality = None, 0
+    for encoding in enabled:
+        if encoding not in available_encodings():
+            continue
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(data, encoding, config):
+    """Compress a whole body with the configured level of the coding"""
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=config['COMPRESSION_GZIP_LEVEL'], mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    return zstandard.ZstdCompressor(level=config['COMPRESSION_ZSTD_LEVEL']).compress(data)
+
+
+def compress_stream(chunks, encoding, config):
+    """
+    Compress a streamed body chunk by chunk
+
+    Every chunk is flushed, so the client can decode each one as it arrives
+    instead of waiting for the compressor's buffer to fill.
+    """
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(config['COMPRESSION_GZIP_LEVEL'], zlib.DEFLATED, 31)
+        process, flush = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    elif encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESSION_BROTLI_QUALITY'])
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zstandard.ZstdCompressor(level=config['COMPRESSION_ZSTD_LEVEL']).compressobj()
+        process = compressor.compress
+        flush = lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        finish = compressor.flush
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # Closing the wrapped iterable ends stream_with_context's request context
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+class CompressedBodyCache:
+    """
+    Bounded LRU of compressed response bodies keyed by (ETag, coding)
+
+    Listing ETags change whenever the user's data or the query changes, so a
+    cached body is valid for as long as its ETag is served. Repeated polls
+    without If-None-Match then cost a lookup instead of a compression.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+def compress_response(response):
+    """after_request hook compressing eligible responses, see init_compression"""
+    config = current_app.config
+    if not config['COMPRESSION_ENABLED']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config['COMPRESSION_MIMETYPES']
+            or request.method == 'HEAD'):
+        return response
+
+    encoding = negotiate_encoding(request.accept_encodings, config['COMPRESSION_ALGORITHMS'])
+    if encoding is None:
+        return response
+
+    etag, weak = response.get_etag()
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+
+        key = (etag, encoding)
+        body = compressed_bodies.get(key) if etag else None
+        if body is None:
+            body = compress_body(data, encoding, config)
+            if etag:
+                compressed_bodies.put(key, body)
+        response.set_data(body)
+
+    response.headers['Content-Encoding'] = encoding
+    # The compressed body is another representation, downgrade a strong ETag
+    # like nginx does so If-None-Match still matches with weak comparison
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """
+    Register response compression on the app
+
+    Compression is opt-in with COMPRESSION_ENABLED. Responses of the
+    configured mimetypes are compressed with the best coding the client
+    accepts (zstd and br only when their packages are installed, gzip
+    otherwise) once they reach COMPRESSION_MIN_SIZE bytes. Streamed
+    responses are always compressed, chunk by chunk.
+    """
+    compressed_bodies.max_bytes = app.config['COMPRESSION_CACHE_MAX_BYTES']
+    app.after_request(compress_response)
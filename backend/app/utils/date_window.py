@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+
+from .validators import validate_datetime_string
+
+
+def to_naive_utc(dt):
+    """Convert a datetime to the naive UTC form stored in the database"""
+    if dt is not None and dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def resolve_date_window(args):
+    """
+    Resolve the listing window from request query arguments
+
+    Accepts `start`/`end` (and the legacy `start_date`/`end_date` aliases).
+    Missing bounds are filled in from the configured default window and the
+    span is capped at EVENTS_MAX_WINDOW_DAYS. The default window runs
+    from the start of the current UTC day, so it is stable across a day.
+
+    Parameters:
+    - args: Request query arguments
+
+    Returns:
+    - (True, (start, end)) if valid, (False, error_message) if invalid
+    """
+    config = current_app.config
+    start_str = args.get('start') or args.get('start_date')
+    end_str = args.get('end') or args.get('end_date')
+
+    start = end = None
+    if start_str:
+        is_valid, start = validate_datetime_string(start_str)
+        if not is_valid:
+            return False, f"Invalid start: {start}"
+        start = to_naive_utc(start)
+
+    if end_str:
+        is_valid, end = validate_datetime_string(end_str)
+        if not is_valid:
+            return False, f"Invalid end: {end}"
+        end = to_naive_utc(end)
+
+    days_before = timedelta(days=config['EVENTS_DEFAULT_WINDOW_DAYS_BEFORE'])
+    days_after = timedelta(days=config['EVENTS_DEFAULT_WINDOW_DAYS_AFTER'])
+
+    if start is None and end is None:
+        # Snapped to whole UTC days, like the ETag of the default window, so
+        # polls during a day share one window and hit the occurrence cache
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        start, end = today - days_before, today + timedelta(days=1) + days_after
+    elif start is None:
+        start = end - days_before - days_after
+    elif end is None:
+        end = start + days_before + days_after
+
+    if end <= start:
+        return False, "End must be after start"
+
+    # Cap the span so a single request cannot expand an unbounded range
+    max_span = timedelta(days=config['EVENTS_MAX_WINDOW_DAYS'])
+    if end - start > max_span:
+        end = start + max_span
+
+    return True, (start, end)
@@ -15,6 +15,8 @@ class EmailService:
         self.username = os.getenv('MAIL_USERNAME')
         self.password = os.getenv('MAIL_PASSWORD')
         self.default_sender = os.getenv('MAIL_DEFAULT_SENDER', self.username)
+        # Seconds a connection may block, a hung SMTP server must not hold a sending thread forever
+        self.timeout = int(os.getenv('MAIL_TIMEOUT', '30'))
 
     def send_email(self, 
                    to_emails: List[str], 
@@ -56,7 +58,7 @@ class EmailService:
                 msg.attach(part2)
 
             # Connect to server and send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
             
             if self.use_tls:
                 server.starttls()
@@ -56,8 +56,8 @@ def log_request_info(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         logger.info(f"API call: {request.method} {request.path} from {request.remote_addr}")
-        if request.get_json():
-            logger.debug(f"Request data: {request.get_json()}")
+        if request.get_json(silent=True):
+            logger.debug(f"Request data: {request.get_json(silent=True)}")
         return f(*args, **kwargs)
     return decorated_function
 
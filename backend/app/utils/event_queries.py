@@ -0,0 +1,50 @@
+from sqlalchemy.orm import defer, selectinload
+
+from .. import db
+from ..models import Event, Category
+from .series_span import SeriesSpan
+
+
+def event_load_options(fields=None):
+    """
+    Loader options for serializing events
+
+    Categories and recurrence rules are batch-loaded with one SELECT ... IN
+    per relationship, so a listing costs a fixed number of queries no matter
+    how many events it returns. With a sparse fieldset the description
+    column is deferred and categories are not loaded unless selected;
+    rules are always loaded, recurring events need them for expansion.
+    """
+    options = [selectinload(Event.recurrence_rule)]
+    if fields is None or 'categories' in fields:
+        options.append(selectinload(Event.categories))
+    if fields is not None and 'description' not in fields:
+        options.append(defer(Event.description))
+    return tuple(options)
+
+
+def user_events_query(user_id, fields=None):
+    """Base query for a user's events with relationships batch-loaded"""
+    return Event.query.filter(Event.user_id == user_id).options(*event_load_options(fields))
+
+
+def category_events_query(user_id, category_id, fields=None):
+    """Base query for a user's events assigned to a category, exceptions of recurring series left out"""
+    return user_events_query(user_id, fields).join(Event.categories).filter(
+        Category.id == category_id, Event.parent_event_id.is_(None)
+    )
+
+
+def filter_events_in_window(query, window_start, window_end):
+    """
+    Restrict an event query to rows that can appear in [window_start, window_end)
+
+    One-off events must overlap the window, recurring masters must have an
+    occurrence that can overlap it (see SeriesSpan), expansion takes care of
+    the rest. Exceptions to single occurrences are merged into their
+    series' occurrences instead.
+    """
+    return query.filter(
+        Event.parent_event_id.is_(None),
+        SeriesSpan.overlaps_clause(window_start, window_end)
+    )
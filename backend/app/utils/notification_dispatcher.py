@@ -0,0 +1,145 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from flask import current_app
+
+from .logger import logger
+
+CHANNELS = ('email', 'push', 'sms')
+
+
+class _Send:
+    """One notification send, records when a pool thread picked it up"""
+
+    def __init__(self, reminder_id, send, args):
+        self.reminder_id = reminder_id
+        self.send = send
+        self.args = args
+        self.started = None
+
+    def __call__(self):
+        self.started = time.monotonic()
+        try:
+            return bool(self.send(*self.args))
+        except Exception as e:
+            logger.error(f"Error sending notification for reminder {self.reminder_id}: {str(e)}")
+            return False
+
+
+class NotificationDispatcher:
+    """
+    Sends reminder notifications concurrently, with a pool per channel
+
+    Every channel (email, push, sms) has its own thread pool, sized by its
+    REMINDER_<CHANNEL>_CONCURRENCY, so a slow SMTP server holds up email
+    alone and never more than its own threads. At most
+    REMINDER_DISPATCH_QUEUE_SIZE sends are queued or running across all
+    channels; a caller submitting more waits for a slot, which keeps the
+    claim loop from claiming reminders faster than they can be sent.
+
+    A send still running REMINDER_SEND_TIMEOUT_SECONDS after it started is
+    given up on and reported as neither sent nor failed. Its reminder stays
+    claimed, so it is retried once the claim lease expires instead of right
+    away while the slow send may yet go through.
+
+    The sends only get plain values, never model instances, so the pool
+    threads need no app context or session.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = None
+        self._slots = None
+        self.timeout = None
+
+    def configure(self, concurrency, queue_size, timeout):
+        """
+        Size the pools, replacing the ones in use
+
+        Parameters:
+        - concurrency: Dict of channel to the number of concurrent sends
+        - queue_size: Most sends queued or running at once
+        - timeout: Seconds a send may run before it is given up on
+        """
+        with self._lock:
+            old_pools = self._pools
+            self._pools = {
+                channel: ThreadPoolExecutor(max_workers=concurrency[channel], thread_name_prefix=f'notify-{channel}')
+                for channel in CHANNELS
+            }
+            self._slots = threading.BoundedSemaphore(queue_size)
+            self.timeout = timeout
+        if old_pools:
+            for pool in old_pools.values():
+                pool.shutdown(wait=False)
+
+    def _ensure_configured(self):
+        if self._pools is not None:
+            return
+        config = current_app.config
+        self.configure(
+            {channel: config[f'REMINDER_{channel.upper()}_CONCURRENCY'] for channel in CHANNELS},
+            config['REMINDER_DISPATCH_QUEUE_SIZE'],
+            config['REMINDER_SEND_TIMEOUT_SECONDS']
+        )
+
+    def dispatch(self, notifications):
+        """
+        Send notifications concurrently and wait for their outcome
+
+        Parameters:
+        - notifications: Iterable of (reminder_id, channel, send, args), send(*args)
+          returns True when the notification went out
+
+        Returns:
+        - (sent reminder ids, failed reminder ids, timed out reminder ids)
+        """
+        self._ensure_configured()
+        pools, slots, timeout = self._pools, self._slots, self.timeout
+        sent_ids, failed_ids, timed_out_ids = [], [], []
+        pending = {}
+
+        for reminder_id, channel, send, args in notifications:
+            # Backpressure: wait for a slot, sends stuck past their timeout hold theirs
+            if not slots.acquire(timeout=timeout):
+                logger.warning(f"Notification queue full, reminder {reminder_id} is left for the next round")
+                failed_ids.append(reminder_id)
+                continue
+            job = _Send(reminder_id, send, args)
+            try:
+                future = pools[channel].submit(job)
+            except Exception:
+                slots.release()
+                raise
+            future.add_done_callback(lambda done: slots.release())
+            pending[future] = job
+
+        while pending:
+            now = time.monotonic()
+            deadlines = [job.started + timeout for job in pending.values() if job.started is not None]
+            wait_for = min(min(deadlines, default=now + timeout) - now, timeout)
+            done, _ = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                job = pending.pop(future)
+                (sent_ids if future.result() else failed_ids).append(job.reminder_id)
+
+            now = time.monotonic()
+            for future, job in list(pending.items()):
+                if job.started is not None and now - job.started >= timeout:
+                    del pending[future]
+                    timed_out_ids.append(job.reminder_id)
+                    logger.error(f"Notification for reminder {job.reminder_id} timed out after {timeout}s")
+
+        return sent_ids, failed_ids, timed_out_ids
+
+    def shutdown(self, wait=True):
+        """Stop the pools, the next dispatch builds them again from the app config"""
+        with self._lock:
+            pools, self._pools = self._pools, None
+        if pools:
+            for pool in pools.values():
+                pool.shutdown(wait=wait)
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,217 @@
+from datetime import timedelta
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import defer, selectinload
+
+from .. import db
+from ..models import Event, EventOccurrence, Reminder, event_categories
+from .recurrence import RecurrenceGenerator
+
+
+class OccurrenceOverrides:
+    """
+    Exceptions to single occurrences of recurring series
+
+    An exception is a child event of the series master (parent_event_id),
+    keyed by the start of the occurrence it replaces (original_start_datetime,
+    RECURRENCE-ID in RFC 5545). A cancelled exception removes its occurrence
+    like an EXDATE, any other replaces it with its own title, times, color
+    and categories. Listings leave exception rows out of the base query and
+    merge them into the expanded occurrences: one query for all series of a
+    listing, then a dict lookup per occurrence.
+
+    Exceptions belong to the occurrence grid of their series, so changing
+    the start or the rule of a whole series discards them.
+    """
+
+    @staticmethod
+    def load(events, window_start, window_end, fields=None):
+        """
+        Read the exceptions of recurring series that can change a window
+
+        An exception matters when the occurrence it replaces overlaps the
+        window, or when it was moved into the window.
+
+        Parameters:
+        - events: Recurring master events of the listing
+        - window_start, window_end: Half-open window, naive UTC
+        - fields: Fields the occurrences need, see RecurrenceGenerator.series_data
+
+        Returns:
+        - Dict of (event id, original start) to exception event
+        """
+        if not events:
+            return {}
+
+        # An occurrence overlapping the window starts at most one series duration before it
+        lookback = max(
+            (event.end_datetime - event.start_datetime for event in events if event.end_datetime),
+            default=timedelta(0)
+        )
+
+        options = []
+        if fields is None or 'categories' in fields:
+            options.append(selectinload(Event.categories))
+        if fields is not None and 'description' not in fields:
+            options.append(defer(Event.description))
+
+        exceptions = Event.query.options(*options).filter(
+            Event.parent_event_id.in_([event.id for event in events]),
+            or_(
+                and_(Event.original_start_datetime >= window_start - lookback,
+                     Event.original_start_datetime < window_end),
+                and_(Event.is_cancelled == False,
+                     OccurrenceOverrides._overlaps_clause(window_start, window_end))
+            )
+        ).all()
+
+        return {(exception.parent_event_id, exception.original_start_datetime): exception for exception in exceptions}
+
+    @staticmethod
+    def _overlaps_clause(window_start, window_end):
+        return and_(
+            Event.start_datetime < window_end,
+            or_(Event.end_datetime > window_start,
+                and_(Event.end_datetime.is_(None), Event.start_datetime >= window_start))
+        )
+
+    @staticmethod
+    def overlaps(exception, window_start, window_end):
+        """Check whether an exception event overlaps the half-open window"""
+        if exception.start_datetime >= window_end:
+            return False
+        if exception.end_datetime is not None:
+            return exception.end_datetime > window_start
+        return exception.start_datetime >= window_start
+
+    @staticmethod
+    def occurrence_data(exception, fields=None):
+        """Build the occurrence dict of an overridden occurrence, it keeps the id of the occurrence it replaces"""
+        series = RecurrenceGenerator.series_data(exception, fields)
+        series['parent_event_id'] = exception.parent_event_id
+        data = RecurrenceGenerator.occurrence_data(
+            exception.parent_event_id, series, exception.original_start_datetime, exception.end_datetime
+        )
+        data['start_datetime'] = exception.start_datetime
+        return data
+
+    @staticmethod
+    def merge(occurrences_by_event, exceptions, window_start, window_end, fields=None):
+        """
+        Apply exceptions to expanded occurrences
+
+        Occurrence lists may be shared with the occurrence cache, series with
+        exceptions get new lists.
+
+        Parameters:
+        - occurrences_by_event: Dict of event id to occurrence dicts in start order
+        - exceptions: Result of load
+
+        Returns:
+        - Dict of event id to occurrence dicts in start order
+        """
+        if not exceptions:
+            return occurrences_by_event
+
+        exceptions_by_event = {}
+        for (event_id, _), exception in exceptions.items():
+            exceptions_by_event.setdefault(event_id, []).append(exception)
+
+        merged = dict(occurrences_by_event)
+        for event_id, series_exceptions in exceptions_by_event.items():
+            occurrences = occurrences_by_event.get(event_id)
+            if occurrences is None or (occurrences and not isinstance(occurrences[0], dict)):
+                # The rule could not be expanded, the master is listed instead
+                continue
+
+            result = [
+                occurrence for occurrence in occurrences
+                if (event_id, occurrence['start_datetime']) not in exceptions
+            ]
+            overrides = [
+                OccurrenceOverrides.occurrence_data(exception, fields)
+                for exception in series_exceptions
+                if not exception.is_cancelled and OccurrenceOverrides.overlaps(exception, window_start, window_end)
+            ]
+            if overrides:
+                result.extend(overrides)
+                result.sort(key=lambda occurrence: occurrence['start_datetime'])
+            merged[event_id] = result
+
+        return merged
+
+    @staticmethod
+    def find(event_id, original_start):
+        """Return the exception of one occurrence of a series, or None"""
+        return Event.query.filter_by(parent_event_id=event_id, original_start_datetime=original_start).first()
+
+    @staticmethod
+    def discard(event_ids, from_start=None):
+        """
+        Delete the exceptions of series with set-based statements
+
+        Parameters:
+        - event_ids: IDs of the series masters
+        - from_start: Only delete exceptions of occurrences starting at or after it
+
+        Returns:
+        - IDs of the deleted exception events, for the change feed
+        """
+        if not event_ids:
+            return []
+
+        condition = Event.parent_event_id.in_(event_ids)
+        if from_start is not None:
+            condition = and_(condition, Event.original_start_datetime >= from_start)
+
+        exception_ids = db.session.execute(select(Event.id).where(condition)).scalars().all()
+        if not exception_ids:
+            return []
+
+        db.session.execute(delete(Reminder).where(Reminder.event_id.in_(exception_ids)))
+        db.session.execute(delete(event_categories).where(event_categories.c.event_id.in_(exception_ids)))
+        db.session.execute(
+            delete(Event).where(Event.id.in_(exception_ids)).execution_options(synchronize_session=False)
+        )
+        return exception_ids
+
+    @staticmethod
+    def move(event_id, new_event_id, from_start, recurrence_id):
+        """
+        Move the exceptions of occurrences from from_start on to another series
+
+        Used when a series is split, the new series continues the same
+        occurrence grid.
+
+        Returns:
+        - IDs of the moved exception events, for the change feed
+        """
+        condition = and_(Event.parent_event_id == event_id, Event.original_start_datetime >= from_start)
+        exception_ids = db.session.execute(select(Event.id).where(condition)).scalars().all()
+        if exception_ids:
+            db.session.execute(
+                update(Event)
+                .where(Event.id.in_(exception_ids))
+                .values(parent_event_id=new_event_id, recurrence_id=recurrence_id)
+                .execution_options(synchronize_session=False)
+            )
+        return exception_ids
+
+    @staticmethod
+    def truncate_stored(event_id, from_start):
+        """Delete the stored occurrences of a series from from_start on, after its rule was cut short"""
+        db.session.execute(
+            delete(EventOccurrence).where(
+                EventOccurrence.event_id == event_id, EventOccurrence.start_datetime >= from_start
+            )
+        )
+
+    @staticmethod
+    def copy_categories(event_id, new_event_id):
+        """Give a new event the categories of another with one INSERT ... SELECT"""
+        db.session.execute(
+            event_categories.insert().from_select(
+                ['event_id', 'category_id'],
+                select(db.literal(new_event_id), event_categories.c.category_id)
+                .where(event_categories.c.event_id == event_id)
+            )
+        )
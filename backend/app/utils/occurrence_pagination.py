@@ -0,0 +1,157 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from flask import request
+from sqlalchemy import tuple_
+
+from ..models import Event
+from .logger import logger
+from .occurrence_overrides import OccurrenceOverrides
+from .recurrence import RecurrenceGenerator
+from .serializers import serialize_event, serialize_occurrences
+
+position_key = itemgetter(0)
+
+
+def encode_occurrence_cursor(position):
+    """Encode a (start, event id, original start) position as an opaque URL-safe cursor"""
+    start, event_id, original_start = position
+    payload = json.dumps([start.isoformat(), event_id, original_start.isoformat()]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_occurrence_cursor(cursor):
+    """
+    Decode a cursor created by encode_occurrence_cursor
+
+    Raises:
+    - ValueError if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        start, event_id, original_start = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(start), int(event_id), datetime.fromisoformat(original_start)
+    except (TypeError, ValueError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+class OccurrencePaginator:
+    """
+    Keyset pagination over the items of a listing after recurrence expansion
+
+    Items are ordered by (start, event id, original start): one-off events
+    come from one indexed query, every recurring series is a lazy stream of
+    its occurrences with exceptions applied, and heapq.merge interleaves
+    them. A page takes exactly per_page items off the merge, so series are
+    only expanded up to the end of the page and at most per_page + 1
+    one-off events are read, however deep the page.
+    """
+
+    def __init__(self, query, window_start, window_end, cursor=None, per_page=None, max_per_page=100,
+                 include_recurring=True, fields=None):
+        self.query = query.order_by(None)
+        self.window_start = window_start
+        self.window_end = window_end
+        self.cursor = cursor
+        if per_page is None:
+            per_page = request.args.get('per_page', type=int)
+            if per_page is None:
+                if request.args.get('per_page'):
+                    raise ValueError("Invalid per_page")
+                per_page = 50
+        self.per_page = max(1, min(per_page, max_per_page))
+        self.include_recurring = include_recurring
+        self.fields = fields
+
+    def _events(self, position):
+        """Stream of one-off events (and masters when recurring events are not expanded)"""
+        query = self.query
+        if self.include_recurring:
+            query = query.filter(Event.is_recurring.isnot(True))
+        if position is not None:
+            # One-off events sort by (start, id, start), no occurrence shares their id
+            query = query.filter(tuple_(Event.start_datetime, Event.id) > tuple_(position[0], position[1]))
+
+        events = query.order_by(Event.start_datetime.asc(), Event.id.asc()).limit(self.per_page + 1).all()
+        for event in events:
+            yield (event.start_datetime, event.id, event.start_datetime), event
+
+    def _occurrences(self, event, exceptions, lower):
+        """Lazy stream of a series' occurrences from lower on, exceptions left out"""
+        series = RecurrenceGenerator.series_data(event, self.fields)
+        records = RecurrenceGenerator.iter_occurrences(event, event.recurrence_rule, lower)
+        try:
+            for event_id, start, end in records:
+                if start >= self.window_end:
+                    return
+                if (event_id, start) not in exceptions:
+                    yield (start, event_id, start), RecurrenceGenerator.occurrence_data(event_id, series, start, end)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Cannot expand recurrence rule of event {event.id}: {str(e)}")
+
+    def _series(self, event, exceptions, series_exceptions, position):
+        """Stream of a series' items after position, changed occurrences at their new start"""
+        if event.recurrence_rule is None:
+            # Nothing to expand, the master is listed like a one-off event
+            key = (event.start_datetime, event.id, event.start_datetime)
+            if position is None or key > position:
+                yield key, event
+            return
+
+        lower = max(self.window_start, position[0]) if position is not None else self.window_start
+        overrides = sorted((
+            ((exception.start_datetime, event.id, exception.original_start_datetime),
+             OccurrenceOverrides.occurrence_data(exception, self.fields))
+            for exception in series_exceptions
+            if not exception.is_cancelled and OccurrenceOverrides.overlaps(exception, self.window_start, self.window_end)
+        ), key=position_key)
+
+        for item in heapq.merge(self._occurrences(event, exceptions, lower), overrides, key=position_key):
+            if position is None or item[0] > position:
+                yield item
+
+    def paginate(self):
+        position = decode_occurrence_cursor(self.cursor) if self.cursor else None
+
+        streams = [self._events(position)]
+        if self.include_recurring:
+            masters = self.query.filter(Event.is_recurring == True).all()
+            exceptions = OccurrenceOverrides.load(masters, self.window_start, self.window_end, self.fields)
+            exceptions_by_event = {}
+            for (event_id, _), exception in exceptions.items():
+                exceptions_by_event.setdefault(event_id, []).append(exception)
+            streams.extend(
+                self._series(master, exceptions, exceptions_by_event.get(master.id, ()), position)
+                for master in masters
+            )
+
+        # One item past the page tells whether there is a next one
+        page = list(islice(heapq.merge(*streams, key=position_key), self.per_page + 1))
+        has_next = len(page) > self.per_page
+        page = page[:self.per_page]
+
+        items = [
+            serialize_occurrences([item], self.fields)[0] if isinstance(item, dict) else serialize_event(item, self.fields)
+            for _, item in page
+        ]
+
+        return {
+            'items': items,
+            'pagination': {
+                'per_page': self.per_page,
+                'has_next': has_next,
+                'next_cursor': encode_occurrence_cursor(page[-1][0]) if has_next else None
+            }
+        }
+
+
+def paginate_occurrences(query, window_start, window_end, cursor=None, per_page=None, max_per_page=100,
+                         include_recurring=True, fields=None):
+    """Convenience function for paginating a listing over expanded occurrences"""
+    paginator = OccurrencePaginator(
+        query, window_start, window_end, cursor, per_page, max_per_page, include_recurring, fields
+    )
+    return paginator.paginate()
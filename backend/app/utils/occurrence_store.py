@@ -0,0 +1,210 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from flask import current_app
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.orm import joinedload
+
+from .. import db
+from ..models import EventOccurrence, RecurrenceRule
+from .recurrence import RecurrenceGenerator
+from .logger import logger
+
+
+def materialized_range(now=None):
+    """Return the (from, until) range occurrences are currently stored for"""
+    now = now or datetime.utcnow()
+    config = current_app.config
+    return (
+        now - timedelta(days=config['OCCURRENCE_HISTORY_DAYS']),
+        now + timedelta(days=config['OCCURRENCE_HORIZON_DAYS'])
+    )
+
+
+class OccurrenceStore:
+    """
+    Precomputed occurrences of recurring events
+
+    Every recurring series stores its occurrences in event_occurrences for a
+    rolling range around now, recorded on the rule as materialized_from /
+    materialized_until. Writes to a series rebuild its rows in the same
+    transaction, and a background job moves the range forward. Listings whose
+    window lies inside the stored range read occurrences with one indexed
+    range query instead of expanding the rule.
+    """
+
+    @staticmethod
+    def _rows(event, rule, range_start, range_end, running=True):
+        """
+        Expand a series into event_occurrences rows overlapping [range_start, range_end)
+
+        With running=False occurrences that started before range_start are
+        left out, for appending to rows already stored up to range_start.
+        """
+        max_occurrences = current_app.config['EVENTS_MAX_OCCURRENCES_PER_SERIES']
+        records = RecurrenceGenerator.iter_occurrences(event, rule, range_start, range_end)
+        try:
+            return [
+                {
+                    'event_id': event_id,
+                    'user_id': event.user_id,
+                    'start_datetime': start,
+                    'end_datetime': end
+                }
+                for event_id, start, end in islice(records, max_occurrences)
+                if running or start >= range_start
+            ]
+        except (ValueError, TypeError) as e:
+            # Rules dateutil cannot expand have no stored occurrences, listings fall back to the master
+            logger.warning(f"Cannot expand recurrence rule {rule.id}: {str(e)}")
+            return []
+
+    @staticmethod
+    def _set_range(rule_id, range_start, range_end):
+        # Keep updated_at, moving the stored range does not change the rule
+        db.session.execute(
+            update(RecurrenceRule)
+            .where(RecurrenceRule.id == rule_id)
+            .values(
+                materialized_from=range_start,
+                materialized_until=range_end,
+                updated_at=RecurrenceRule.updated_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild_series(event, now=None):
+        """
+        Replace the stored occurrences of a series
+
+        Call it after changing an event or its recurrence rule, before the
+        commit, so the rows change in the same transaction. Events that are
+        no longer recurring just lose their rows.
+
+        Returns:
+        - Number of occurrence rows stored
+        """
+        db.session.execute(delete(EventOccurrence).where(EventOccurrence.event_id == event.id))
+
+        # Query instead of using event.recurrence_rule, which may be stale
+        # when the rule was added or removed in this transaction
+        rule = RecurrenceRule.query.filter_by(event_id=event.id).first()
+        if not event.is_recurring or not rule:
+            return 0
+
+        # Routes assign timezone-aware datetimes, reload the stored naive UTC values
+        db.session.expire(event, ['start_datetime', 'end_datetime'])
+
+        range_start, range_end = materialized_range(now)
+        rows = OccurrenceStore._rows(event, rule, range_start, range_end)
+        if rows:
+            db.session.execute(insert(EventOccurrence), rows)
+        OccurrenceStore._set_range(rule.id, range_start, range_end)
+        return len(rows)
+
+    @staticmethod
+    def delete_series(event_ids):
+        """Remove the stored occurrences of events about to be deleted"""
+        db.session.execute(delete(EventOccurrence).where(EventOccurrence.event_id.in_(event_ids)))
+
+    @staticmethod
+    def extend_horizon(now=None, batch_size=200):
+        """
+        Move the stored range of every series forward
+
+        Series that are behind by more than a day get the occurrences between
+        their old and the new horizon appended, and rows that fell out of the
+        history range removed. Series never materialized are rebuilt.
+
+        Returns:
+        - Number of series updated
+        """
+        range_start, range_end = materialized_range(now)
+        stale_before = range_end - timedelta(days=1)
+        updated = 0
+        last_id = 0
+
+        while True:
+            rules = RecurrenceRule.query.options(joinedload(RecurrenceRule.event)).filter(
+                RecurrenceRule.id > last_id,
+                or_(RecurrenceRule.materialized_until.is_(None),
+                    RecurrenceRule.materialized_until < stale_before)
+            ).order_by(RecurrenceRule.id).limit(batch_size).all()
+
+            if not rules:
+                break
+
+            for rule in rules:
+                event = rule.event
+                if event is None:
+                    continue
+                if rule.materialized_until is None or rule.materialized_from is None:
+                    OccurrenceStore.rebuild_series(event, now)
+                else:
+                    rows = OccurrenceStore._rows(event, rule, rule.materialized_until, range_end, running=False)
+                    if rows:
+                        db.session.execute(insert(EventOccurrence), rows)
+                    db.session.execute(
+                        delete(EventOccurrence).where(
+                            EventOccurrence.event_id == event.id,
+                            EventOccurrence.start_datetime < range_start,
+                            or_(EventOccurrence.end_datetime.is_(None),
+                                EventOccurrence.end_datetime <= range_start)
+                        )
+                    )
+                    OccurrenceStore._set_range(rule.id, range_start, range_end)
+                updated += 1
+
+            last_id = rules[-1].id
+            db.session.commit()
+
+        if updated:
+            logger.info(f"Extended stored occurrences of {updated} recurring series")
+        return updated
+
+    @staticmethod
+    def load(events, window_start, window_end, max_occurrences, fields=None):
+        """
+        Read stored occurrences of recurring events overlapping a window
+
+        Parameters:
+        - events: Recurring master events with their rules loaded
+        - window_start, window_end: Half-open window, naive UTC
+        - max_occurrences: Safety limit per series, as for live expansion
+        - fields: Fields the occurrences need, see RecurrenceGenerator.series_data
+
+        Returns:
+        - Dict of event id to occurrence dicts in start order, only for the
+          series whose stored range covers the whole window
+        """
+        covered = {}
+        for event in events:
+            rule = event.recurrence_rule
+            if (rule and rule.materialized_from and rule.materialized_until
+                    and rule.materialized_from <= window_start and window_end <= rule.materialized_until):
+                covered[event.id] = event
+
+        if not covered:
+            return {}
+
+        rows = db.session.execute(
+            select(EventOccurrence.event_id, EventOccurrence.start_datetime, EventOccurrence.end_datetime)
+            .where(
+                EventOccurrence.event_id.in_(covered),
+                EventOccurrence.start_datetime < window_end,
+                or_(EventOccurrence.end_datetime > window_start,
+                    and_(EventOccurrence.end_datetime.is_(None),
+                         EventOccurrence.start_datetime >= window_start))
+            )
+            .order_by(EventOccurrence.event_id, EventOccurrence.start_datetime)
+        )
+
+        result = {event_id: [] for event_id in covered}
+        series = {}
+        for event_id, start, end in rows:
+            occurrences = result[event_id]
+            if len(occurrences) < max_occurrences:
+                if event_id not in series:
+                    series[event_id] = RecurrenceGenerator.series_data(covered[event_id], fields)
+                occurrences.append(RecurrenceGenerator.occurrence_data(event_id, series[event_id], start, end))
+        return result
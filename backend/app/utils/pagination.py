@@ -1,18 +1,26 @@
+import base64
+import json
+from datetime import datetime
 from flask import request
 from math import ceil
+from sqlalchemy import tuple_
 
 
 class PaginationHelper:
-    def __init__(self, query, page=None, per_page=None, max_per_page=100):
+    def __init__(self, query, page=None, per_page=None, max_per_page=100, include_total=True):
         self.query = query
         self.page = page or int(request.args.get('page', 1))
         self.per_page = min(per_page or int(request.args.get('per_page', 20)), max_per_page)
+        self.include_total = include_total
 
         # Ensure positive values
         self.page = max(1, self.page)
         self.per_page = max(1, self.per_page)
 
     def paginate(self):
+        if not self.include_total:
+            return self._paginate_without_total()
+
         # Get total count
         total = self.query.count()
 
@@ -46,8 +54,119 @@ class PaginationHelper:
             }
         }
 
+    def _paginate_without_total(self):
+        """Skip the COUNT query, fetching one extra row to detect a next page"""
+        offset = (self.page - 1) * self.per_page
+        items = self.query.offset(offset).limit(self.per_page + 1).all()
+
+        has_next = len(items) > self.per_page
+        has_prev = self.page > 1
+
+        return {
+            'items': items[:self.per_page],
+            'pagination': {
+                'page': self.page,
+                'per_page': self.per_page,
+                'total': None,
+                'total_pages': None,
+                'has_prev': has_prev,
+                'has_next': has_next,
+                'prev_num': self.page - 1 if has_prev else None,
+                'next_num': self.page + 1 if has_next else None
+            }
+        }
+
+
+def encode_cursor(sort_value, row_id):
+    """Encode a (datetime, id) position as an opaque URL-safe cursor"""
+    payload = json.dumps([sort_value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor
+
+    Raises:
+    - ValueError if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+class CursorPaginationHelper:
+    """
+    Keyset pagination over a (datetime column, id) ordering
+
+    Each page seeks past the last seen row with an indexed WHERE clause
+    instead of an OFFSET, so deep pages cost the same as the first one.
+    """
+
+    def __init__(self, query, sort_column, id_column, cursor=None, per_page=None,
+                 max_per_page=100, descending=True, include_total=False):
+        self.query = query
+        self.sort_column = sort_column
+        self.id_column = id_column
+        self.cursor = cursor
+        self.per_page = max(1, min(per_page or int(request.args.get('per_page', 20)), max_per_page))
+        self.descending = descending
+        self.include_total = include_total
+
+    def paginate(self):
+        query = self.query.order_by(None)
+
+        if self.cursor:
+            sort_value, row_id = decode_cursor(self.cursor)
+            position = tuple_(self.sort_column, self.id_column)
+            if self.descending:
+                query = query.filter(position < tuple_(sort_value, row_id))
+            else:
+                query = query.filter(position > tuple_(sort_value, row_id))
+
+        if self.descending:
+            query = query.order_by(self.sort_column.desc(), self.id_column.desc())
+        else:
+            query = query.order_by(self.sort_column.asc(), self.id_column.asc())
+
+        items = query.limit(self.per_page + 1).all()
+        has_next = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        next_cursor = None
+        if has_next:
+            last = items[-1]
+            next_cursor = encode_cursor(
+                getattr(last, self.sort_column.key), getattr(last, self.id_column.key)
+            )
+
+        pagination = {
+            'per_page': self.per_page,
+            'has_next': has_next,
+            'next_cursor': next_cursor
+        }
+        if self.include_total:
+            pagination['total'] = self.query.order_by(None).count()
+
+        return {
+            'items': items,
+            'pagination': pagination
+        }
+
 
-def paginate_query(query, page=None, per_page=None, max_per_page=100):
+def paginate_query(query, page=None, per_page=None, max_per_page=100, include_total=True):
     """Convenience function for paginating queries"""
-    helper = PaginationHelper(query, page, per_page, max_per_page)
-    return helper.paginate()
\ No newline at end of file
+    helper = PaginationHelper(query, page, per_page, max_per_page, include_total)
+    return helper.paginate()
+
+
+def paginate_cursor(query, sort_column, id_column, cursor=None, per_page=None, max_per_page=100,
+                    descending=True, include_total=False):
+    """Convenience function for keyset-paginating queries"""
+    helper = CursorPaginationHelper(
+        query, sort_column, id_column, cursor, per_page, max_per_page, descending, include_total
+    )
+    return helper.paginate()
@@ -1,8 +1,219 @@
-from datetime import datetime, timedelta
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta, timezone
 from dateutil.relativedelta import relativedelta
-from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY, YEARLY
+from dateutil.rrule import rrule, weekday, DAILY, WEEKLY, MONTHLY, YEARLY
+from itertools import islice, takewhile
+import sys
+import threading
 import uuid
 
+from .serializers import serialize_categories
+
+# NumPy is optional, without it every rule is expanded with dateutil
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+# Compact occurrence yielded by RecurrenceGenerator.iter_occurrences
+OccurrenceRecord = namedtuple('OccurrenceRecord', ['event_id', 'start_datetime', 'end_datetime'])
+
+
+class OccurrenceCache:
+    """
+    Bounded in-process LRU cache of expanded occurrence lists
+
+    Entries are keyed by (event_id, rule.updated_at, event.updated_at, window)
+    and, when occurrences embed categories, the (id, updated_at) of the
+    series' categories. A series or category changed by any process thus
+    never hits a stale entry. Write routes still invalidate the series (or
+    the whole user, for category changes) to free the memory early. Least recently used entries are evicted once either the
+    entry count or the estimated size in bytes exceeds its limit.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (user_id, occurrences, size)
+        self._keys_by_event = {}
+        self._keys_by_user = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_entries, max_bytes):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    @staticmethod
+    def make_key(event, recurrence_rule, window, categories=None):
+        """
+        Cache key of a series' occurrences in a window
+
+        Pass the series' categories when the occurrences embed them, renames
+        in other processes then change the key.
+        """
+        category_versions = None if categories is None else tuple(
+            sorted((category.id, category.updated_at) for category in categories)
+        )
+        return (event.id, recurrence_rule.updated_at, event.updated_at, window, category_versions)
+
+    @staticmethod
+    def _estimate_size(occurrences):
+        """Rough shallow size of an occurrence list in bytes"""
+        size = sys.getsizeof(occurrences)
+        for occurrence in occurrences:
+            size += sys.getsizeof(occurrence)
+            if isinstance(occurrence, dict):
+                size += sum(sys.getsizeof(value) for value in occurrence.values())
+        return size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, user_id, occurrences):
+        size = self._estimate_size(occurrences)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (user_id, occurrences, size)
+            self._keys_by_event.setdefault(key[0], set()).add(key)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            self._bytes += size
+            self._evict()
+
+    def _remove(self, key):
+        user_id, _, size = self._entries.pop(key)
+        self._bytes -= size
+        for index, index_key in ((self._keys_by_event, key[0]), (self._keys_by_user, user_id)):
+            keys = index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[index_key]
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_events(self, event_ids):
+        """Drop every cached window of the given series"""
+        with self._lock:
+            for event_id in event_ids:
+                for key in list(self._keys_by_event.get(event_id, ())):
+                    self._remove(key)
+
+    def invalidate_user(self, user_id):
+        """Drop every cached window of a user's series"""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_event.clear()
+            self._keys_by_user.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+
+
+class CompiledRuleCache:
+    """
+    Bounded in-process LRU cache of compiled recurrence rules
+
+    Entries hold the rrule keyword arguments and the dateutil rrule built
+    from them, keyed by (rule.id, rule.updated_at, DTSTART, period start).
+    The period start is None for the rule as written, and the DTSTART
+    skip_periods moved to otherwise. Any change to the rule or to the
+    event's start produces a new key, stale entries simply age out.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_entries):
+        with self._lock:
+            self.max_entries = max_entries
+            self._evict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+
 class RecurrenceGenerator:
     FREQUENCY_MAP = {
         'DAILY': DAILY,
@@ -15,109 +226,475 @@ class RecurrenceGenerator:
         'MON': 0, 'TUE': 1, 'WED': 2, 'THU': 3,
         'FRI': 4, 'SAT': 5, 'SUN': 6
     }
+
+    # RFC 5545 weekday codes by weekday number
+    RRULE_WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+    # Expanded occurrence lists shared by all requests of this process
+    cache = OccurrenceCache()
+
+    # Compiled rrules shared by all requests of this process
+    rule_cache = CompiledRuleCache()
+
+    # Expand simple rules with NumPy, see vectorized_occurrences
+    vectorize = HAS_NUMPY
+
+    @staticmethod
+    def parse_weekdays(days_of_week):
+        """Convert a days_of_week string like 'MON,WED' to weekday numbers"""
+        weekdays = []
+        for day in (days_of_week or '').split(','):
+            if day.strip() in RecurrenceGenerator.WEEKDAY_MAP:
+                weekdays.append(RecurrenceGenerator.WEEKDAY_MAP[day.strip()])
+        return weekdays
     
     @staticmethod
-    def generate_occurrences(event, recurrence_rule, start_date=None, end_date=None, max_occurrences=1000):
+    def to_rrule_string(recurrence_rule):
+        """
+        Build the canonical RFC 5545 RRULE of a rule's columns, without DTSTART
+
+        Write routes store it in recurrence_rule.rrule, so expansion parses
+        one short string instead of re-deriving the rule from its columns.
+        Parts always come in the order FREQ, INTERVAL, BYDAY, BYMONTHDAY,
+        UNTIL or COUNT, with BYDAY weekdays sorted.
+        """
+        parts = [f"FREQ={recurrence_rule.frequency}", f"INTERVAL={recurrence_rule.interval or 1}"]
+
+        if recurrence_rule.frequency == 'WEEKLY' and recurrence_rule.days_of_week:
+            weekdays = sorted(set(RecurrenceGenerator.parse_weekdays(recurrence_rule.days_of_week)))
+            if weekdays:
+                parts.append('BYDAY=' + ','.join(RecurrenceGenerator.RRULE_WEEKDAYS[day] for day in weekdays))
+
+        if recurrence_rule.frequency == 'MONTHLY':
+            if recurrence_rule.day_of_month:
+                parts.append(f"BYMONTHDAY={recurrence_rule.day_of_month}")
+            elif recurrence_rule.week_of_month and recurrence_rule.day_of_week in RecurrenceGenerator.WEEKDAY_MAP:
+                # Week 5 is the last week of the month
+                week_num = -1 if recurrence_rule.week_of_month == 5 else recurrence_rule.week_of_month
+                day = RecurrenceGenerator.WEEKDAY_MAP[recurrence_rule.day_of_week]
+                parts.append(f"BYDAY={week_num}{RecurrenceGenerator.RRULE_WEEKDAYS[day]}")
+
+        if recurrence_rule.end_date:
+            end_date = recurrence_rule.end_date
+            if end_date.tzinfo is not None:
+                end_date = end_date.astimezone(timezone.utc).replace(tzinfo=None)
+            parts.append(f"UNTIL={end_date.strftime('%Y%m%dT%H%M%SZ')}")
+        elif recurrence_rule.occurrence_count:
+            parts.append(f"COUNT={recurrence_rule.occurrence_count}")
+
+        return ';'.join(parts)
+
+    @staticmethod
+    def rrule_params(event, recurrence_rule):
+        """
+        Build the dateutil rrule keyword arguments of a series
+
+        The stored RRULE string is parsed; rules written before it existed
+        derive it from their columns.
+
+        Returns:
+        - Keyword arguments, 'freq' is None for an unknown frequency
+        """
+        text = getattr(recurrence_rule, 'rrule', None) or RecurrenceGenerator.to_rrule_string(recurrence_rule)
+        params = {'freq': None, 'dtstart': event.start_datetime, 'interval': 1}
+
+        for part in text.split(';'):
+            name, _, value = part.partition('=')
+            if name == 'FREQ':
+                params['freq'] = RecurrenceGenerator.FREQUENCY_MAP.get(value)
+            elif name == 'INTERVAL':
+                params['interval'] = int(value)
+            elif name == 'COUNT':
+                params['count'] = int(value)
+            elif name == 'UNTIL':
+                params['until'] = datetime.strptime(value, '%Y%m%dT%H%M%SZ')
+            elif name == 'BYMONTHDAY':
+                params['bymonthday'] = int(value)
+            elif name == 'BYDAY':
+                days = value.split(',')
+                if days[0][-2:] == days[0]:
+                    params['byweekday'] = [RecurrenceGenerator.RRULE_WEEKDAYS.index(day) for day in days]
+                else:
+                    # Monthly nth weekday like 2MO or -1FR
+                    params['byweekday'] = weekday(RecurrenceGenerator.RRULE_WEEKDAYS.index(days[0][-2:]), int(days[0][:-2]))
+
+        return params
+
+    @staticmethod
+    def compile_rule(event, recurrence_rule, period_start=None, params=None):
+        """
+        Look up or build a compiled rule in the rule cache
+
+        Parameters:
+        - period_start: None for the rule as written, else the DTSTART
+          skip_periods moved to, with its adjusted params
+
+        Returns:
+        - (params, rrule), or None for an unknown frequency
+        """
+        rule_id = getattr(recurrence_rule, 'id', None)
+        key = None
+        if rule_id is not None:
+            key = (rule_id, getattr(recurrence_rule, 'updated_at', None), event.start_datetime, period_start)
+            compiled = RecurrenceGenerator.rule_cache.get(key)
+            if compiled is not None:
+                return compiled
+
+        if params is None:
+            params = RecurrenceGenerator.rrule_params(event, recurrence_rule)
+        if params['freq'] is None:
+            return None
+
+        compiled = (params, rrule(**params))
+        if key is not None:
+            RecurrenceGenerator.rule_cache.put(key, compiled)
+        return compiled
+
+    @staticmethod
+    def build_rrule(event, recurrence_rule, seek_from=None):
+        """
+        Build the dateutil rrule of a series
+
+        Parameters:
+        - event: Master event, its start is the rule's DTSTART
+        - recurrence_rule: The series' RecurrenceRule
+        - seek_from: Occurrences starting before it are not needed, the rule
+          may skip them (see skip_periods)
+
+        Returns:
+        - rrule, or None for an unknown frequency or a series that ends
+          before seek_from
+
+        Raises:
+        - ValueError (or TypeError) for rules dateutil cannot expand
+        """
+        compiled = RecurrenceGenerator.compile_rule(event, recurrence_rule)
+        if compiled is None:
+            return None
+        params, rule = compiled
+
+        if seek_from is not None:
+            seeked = RecurrenceGenerator.skip_periods(params, seek_from, rule)
+            if seeked is None:
+                return None
+            if seeked is not params:
+                return RecurrenceGenerator.compile_rule(event, recurrence_rule, seeked['dtstart'], seeked)[1]
+
+        return rule
+
+    @staticmethod
+    def skip_periods(rrule_params, seek_from, rule=None):
+        """
+        Move a rule's DTSTART forward over whole periods that end before seek_from
+
+        A period is one interval of the frequency (days, weeks starting on
+        Monday, calendar months or years). Expanding from the period that
+        contains seek_from costs the same for a series started yesterday or
+        ten years ago. Defaults dateutil takes from DTSTART (weekday, day of
+        month, month) are made explicit, since the new DTSTART is the start
+        of its period.
+
+        For a COUNT rule the occurrences skipped are subtracted from the
+        count: the first period is counted, every later period has a fixed
+        number of occurrences. Rules without a fixed number per period (the
+        31st of every month, Feb 29) are not moved, they are bounded by
+        their count anyway.
+
+        Parameters:
+        - rrule_params: Keyword arguments of the rule as written
+        - seek_from: Occurrences starting before it are not needed
+        - rule: The rrule built from rrule_params, when already compiled
+
+        Returns:
+        - Adjusted rrule parameters, the original ones when nothing can be
+          skipped, or None when the series' count is used up before seek_from
+        """
+        # dateutil drops the microseconds of DTSTART, period boundaries must too
+        dtstart = rrule_params['dtstart'].replace(microsecond=0)
+        if seek_from <= dtstart:
+            return rrule_params
+
+        freq = rrule_params['freq']
+        interval = rrule_params['interval']
+        midnight = datetime.combine(dtstart.date(), datetime.min.time())
+        time_of_day = dtstart - midnight
+        params = dict(rrule_params)
+
+        if freq == DAILY:
+            periods = (seek_from - dtstart) // timedelta(days=interval)
+            period_start = lambda j: dtstart + timedelta(days=j * interval)
+            per_period = 1
+        elif freq == WEEKLY:
+            first_week = midnight - timedelta(days=dtstart.weekday())
+            seek_week = datetime.combine(seek_from.date(), datetime.min.time()) - timedelta(days=seek_from.weekday())
+            periods = (seek_week - first_week).days // 7 // interval
+            period_start = lambda j: first_week + timedelta(weeks=j * interval) + time_of_day
+            params.setdefault('byweekday', [dtstart.weekday()])
+            per_period = len(set(params['byweekday']))
+        elif freq == MONTHLY:
+            months = (seek_from.year - dtstart.year) * 12 + seek_from.month - dtstart.month
+            periods = months // interval
+            first_month = midnight.replace(day=1)
+            period_start = lambda j: first_month + relativedelta(months=j * interval) + time_of_day
+            if 'byweekday' not in params:
+                params.setdefault('bymonthday', dtstart.day)
+            # Every month has a 1st-4th and a last weekday, and days up to the 28th
+            per_period = 1 if 'byweekday' in params or params['bymonthday'] <= 28 else None
+        else:
+            periods = (seek_from.year - dtstart.year) // interval
+            first_year = midnight.replace(month=1, day=1)
+            period_start = lambda j: first_year + relativedelta(years=j * interval) + time_of_day
+            params['bymonth'] = dtstart.month
+            params['bymonthday'] = dtstart.day
+            per_period = None if (dtstart.month, dtstart.day) == (2, 29) else 1
+
+        if periods < 1:
+            return rrule_params
+
+        if 'count' in params:
+            if per_period is None:
+                return rrule_params
+            # The first period may be partial, occurrences before DTSTART are not part of the series
+            second_period = period_start(1)
+            rule = rule or rrule(**rrule_params)
+            first = sum(1 for _ in takewhile(lambda start: start < second_period, rule))
+            skipped = first + (periods - 1) * per_period
+            if skipped >= params['count']:
+                return None
+            params['count'] -= skipped
+
+        params['dtstart'] = period_start(periods)
+        return params
+
+    @staticmethod
+    def vectorized_occurrences(event, recurrence_rule, start_date, end_date):
+        """
+        Compute the occurrences of a simple series in a window with NumPy
+
+        DAILY and WEEKLY rules (with or without days_of_week) put occurrences
+        on a fixed grid from DTSTART, so the occurrence indexes inside the
+        window are computed arithmetically and all timestamps come from one
+        array operation. Results match dateutil, including COUNT, UNTIL and
+        the partial first week.
+
+        Parameters:
+        - event: Master event of the series
+        - recurrence_rule: The series' RecurrenceRule
+        - start_date, end_date: Half-open window [start_date, end_date), naive UTC
+
+        Returns:
+        - (starts, ends) datetime64[us] arrays overlapping the window, ends is
+          None for events without an end; None for rules that need dateutil
+        """
+        if not HAS_NUMPY or recurrence_rule.frequency not in ('DAILY', 'WEEKLY'):
+            return None
+        compiled = RecurrenceGenerator.compile_rule(event, recurrence_rule)
+        if compiled is None:
+            return None
+        params = compiled[0]
+
+        # dateutil drops the microseconds of DTSTART, the duration keeps them
+        dtstart = event.start_datetime.replace(microsecond=0)
+        duration = event.end_datetime - event.start_datetime if event.end_datetime else None
+        interval = params['interval']
+        until = params.get('until')
+        count = params.get('count')
+        one_us = timedelta(microseconds=1)
+
+        # Starts must be after lower (ends after start_date) or, without an end, at or after start_date
+        lower = start_date - duration if duration is not None else start_date
+        strict = duration is not None
+
+        if params['freq'] == DAILY:
+            step = timedelta(days=interval) // one_us
+            offset = (lower - dtstart) // one_us
+            first = offset // step + 1 if strict else -(-offset // step)
+            last = -(-((end_date - dtstart) // one_us) // step)
+            if until:
+                last = min(last, ((until - dtstart) // one_us) // step + 1 if until >= dtstart else 0)
+            if count:
+                last = min(last, count)
+            indexes = np.arange(max(first, 0), max(last, first, 0), dtype=np.int64)
+            starts = np.datetime64(dtstart, 'us') + indexes * np.timedelta64(step, 'us')
+        else:
+            weekdays = np.array(sorted(set(params.get('byweekday') or [dtstart.weekday()])), dtype=np.int64)
+            # Weeks start on Monday, every interval-th week from DTSTART's week is used
+            base = dtstart - timedelta(days=dtstart.weekday())
+            period = timedelta(weeks=interval) // one_us
+            first_week = max(0, -(-((lower - base) // one_us - timedelta(days=6) // one_us) // period))
+            last_week = -(-((end_date - base) // one_us) // period)
+            weeks = np.arange(first_week, max(last_week, first_week), dtype=np.int64)
+
+            days = (weeks[:, None] * (7 * interval) + weekdays[None, :]).ravel()
+            starts = np.datetime64(base, 'us') + days * np.timedelta64(86400 * 10 ** 6, 'us')
+
+            # Only days on or after DTSTART count in the first week
+            in_first_week = int((weekdays >= dtstart.weekday()).sum())
+            positions = np.tile(np.arange(len(weekdays)), len(weeks))
+            week_index = np.repeat(weeks, len(weekdays))
+            ordinals = np.where(
+                week_index == 0,
+                positions - (len(weekdays) - in_first_week),
+                in_first_week + (week_index - 1) * len(weekdays) + positions
+            )
+
+            mask = starts >= np.datetime64(dtstart, 'us')
+            if until:
+                mask &= starts <= np.datetime64(until, 'us')
+            if count:
+                mask &= ordinals < count
+            starts = starts[mask]
+
+        low = np.datetime64(lower, 'us')
+        starts = starts[((starts > low) if strict else (starts >= low)) & (starts < np.datetime64(end_date, 'us'))]
+
+        ends = starts + np.timedelta64(duration // one_us, 'us') if duration is not None else None
+        return starts, ends
+
+    @staticmethod
+    def iter_occurrences(event, recurrence_rule, start_date, end_date=None):
+        """
+        Lazily yield the occurrences of a series overlapping a window
+
+        Occurrences are expanded one at a time, in start order, so callers
+        that only need the first few (pagination, next upcoming occurrences,
+        streaming) stop early without expanding the rest of the series.
+        Expansion starts at the period containing the window, not at the
+        first occurrence of the series. With a window end, DAILY and WEEKLY
+        rules are computed with NumPy when it is installed.
+        Without end_date, a series without an end never stops by itself.
+
+        Parameters:
+        - event: Master event of the series
+        - recurrence_rule: The series' RecurrenceRule
+        - start_date, end_date: Half-open window [start_date, end_date), naive UTC
+
+        Yields:
+        - OccurrenceRecord(event_id, start_datetime, end_datetime)
+
+        Raises:
+        - ValueError (or TypeError) for rules dateutil cannot expand
+        """
+        # The duration is the same for the whole series
+        duration = event.end_datetime - event.start_datetime if event.end_datetime else None
+        event_id = event.id
+
+        # Simple rules are computed for the whole window in one go
+        if end_date is not None and RecurrenceGenerator.vectorize:
+            arrays = RecurrenceGenerator.vectorized_occurrences(event, recurrence_rule, start_date, end_date)
+            if arrays is not None:
+                starts, ends = arrays
+                ends = ends.tolist() if ends is not None else [None] * len(starts)
+                for occurrence_start, occurrence_end in zip(starts.tolist(), ends):
+                    yield OccurrenceRecord(event_id, occurrence_start, occurrence_end)
+                return
+
+        # Occurrences starting before seek_from end before the window, skip them
+        seek_from = start_date - duration if duration is not None and duration > timedelta(0) else start_date
+        rule = RecurrenceGenerator.build_rrule(event, recurrence_rule, seek_from)
+        if rule is None:
+            return
+
+        for occurrence_start in rule:
+            # Occurrences come in order, nothing past the window can overlap it
+            if end_date is not None and occurrence_start >= end_date:
+                return
+
+            occurrence_end = occurrence_start + duration if duration is not None else None
+
+            # Keep only occurrences overlapping [start_date, end_date)
+            if occurrence_end is not None:
+                if occurrence_end <= start_date:
+                    continue
+            elif occurrence_start < start_date:
+                continue
+
+            yield OccurrenceRecord(event_id, occurrence_start, occurrence_end)
+
+    @staticmethod
+    def is_occurrence(event, recurrence_rule, start):
+        """Check whether a series has an occurrence starting exactly at start (naive UTC)"""
+        try:
+            rule = RecurrenceGenerator.build_rrule(event, recurrence_rule, start)
+            return rule is not None and rule.after(start, inc=True) == start
+        except (ValueError, TypeError):
+            return False
+
+    @staticmethod
+    def count_before(event, recurrence_rule, start):
+        """Count the occurrences of a series starting before start"""
+        rule = RecurrenceGenerator.build_rrule(event, recurrence_rule)
+        if rule is None:
+            return 0
+        return sum(1 for _ in takewhile(lambda occurrence_start: occurrence_start < start, rule))
+
+    @staticmethod
+    def generate_occurrences(event, recurrence_rule, start_date=None, end_date=None, max_occurrences=1000,
+                             fields=None):
         """
         Generate event occurrences based on recurrence rule
+
+        Only occurrences overlapping the half-open window [start_date, end_date)
+        are returned, and expansion stops as soon as the window is passed.
+        fields limits the series data copied into occurrences, see series_data.
+        Returns [event] when the rule cannot be expanded.
         """
         if not recurrence_rule:
             return [event]
-        
+
         # Set default date range if not provided
         if not start_date:
             start_date = event.start_datetime
         if not end_date:
             # Default to 2 years from start date
             end_date = start_date + relativedelta(years=2)
-        
-        # Build rrule parameters
-        freq = RecurrenceGenerator.FREQUENCY_MAP.get(recurrence_rule.frequency)
-        if not freq:
+
+        if recurrence_rule.frequency not in RecurrenceGenerator.FREQUENCY_MAP:
             return [event]
-        
-        rrule_params = {
-            'freq': freq,
-            'dtstart': event.start_datetime,
-            'interval': recurrence_rule.interval or 1
-        }
-        
-        # Add end condition
-        if recurrence_rule.end_date:
-            rrule_params['until'] = recurrence_rule.end_date
-        elif recurrence_rule.occurrence_count:
-            rrule_params['count'] = min(recurrence_rule.occurrence_count, max_occurrences)
-        else:
-            rrule_params['until'] = end_date
-        
-        # Add weekly specific parameters
-        if recurrence_rule.frequency == 'WEEKLY' and recurrence_rule.days_of_week:
-            weekdays = []
-            for day in recurrence_rule.days_of_week.split(','):
-                if day.strip() in RecurrenceGenerator.WEEKDAY_MAP:
-                    weekdays.append(RecurrenceGenerator.WEEKDAY_MAP[day.strip()])
-            if weekdays:
-                rrule_params['byweekday'] = weekdays
-        
-        # Add monthly specific parameters
-        if recurrence_rule.frequency == 'MONTHLY':
-            if recurrence_rule.day_of_month:
-                rrule_params['bymonthday'] = recurrence_rule.day_of_month
-            elif recurrence_rule.week_of_month and recurrence_rule.day_of_week:
-                weekday = RecurrenceGenerator.WEEKDAY_MAP.get(recurrence_rule.day_of_week)
-                if weekday is not None:
-                    # Convert week_of_month to rrule format
-                    week_num = recurrence_rule.week_of_month
-                    if week_num == 5:  # Last week of month
-                        week_num = -1
-                    rrule_params['byweekday'] = f"{weekday}({week_num})"
-        
+
         try:
-            # Generate occurrences
-            rule = rrule(**rrule_params)
-            occurrences = []
-            
-            for occurrence_start in rule:
-                # Filter by date range
-                if occurrence_start < start_date or occurrence_start > end_date:
-                    continue
-                
-                # Calculate duration
-                duration = None
-                if event.end_datetime:
-                    duration = event.end_datetime - event.start_datetime
-                
-                # Create occurrence data
-                occurrence_end = occurrence_start + duration if duration else None
-                
-                occurrence = {
-                    'id': f"{event.id}_{occurrence_start.strftime('%Y%m%d_%H%M%S')}",
-                    'title': event.title,
-                    'description': event.description,
-                    'start_datetime': occurrence_start,
-                    'end_datetime': occurrence_end,
-                    'is_all_day': event.is_all_day,
-                    'color': event.color,
-                    'is_recurring': True,
-                    'recurrence_id': event.recurrence_id,
-                    'parent_event_id': event.id,
-                    'created_at': event.created_at,
-                    'updated_at': event.updated_at,
-                    'categories': [cat.to_dict() for cat in event.categories] if hasattr(event, 'categories') else []
-                }
-                
-                occurrences.append(occurrence)
-                
-                # Safety limit
-                if len(occurrences) >= max_occurrences:
-                    break
-            
-            return occurrences
-            
+            series = RecurrenceGenerator.series_data(event, fields)
+            records = RecurrenceGenerator.iter_occurrences(event, recurrence_rule, start_date, end_date)
+            return [
+                RecurrenceGenerator.occurrence_data(event_id, series, occurrence_start, occurrence_end)
+                for event_id, occurrence_start, occurrence_end in islice(records, max_occurrences)
+            ]
+
         except Exception as e:
             print(f"Error generating recurrence: {e}")
             return [event]
-    
+
+    @staticmethod
+    def series_data(event, fields=None):
+        """
+        Build the fields every occurrence of a series shares
+
+        Categories are serialized once here. When fields is given, description
+        and categories are only read if selected, so a deferred description
+        column or an unloaded categories relationship is never touched.
+        """
+        return {
+            'title': event.title,
+            'description': event.description if fields is None or 'description' in fields else None,
+            'is_all_day': event.is_all_day,
+            'color': event.color,
+            'is_recurring': True,
+            'recurrence_id': event.recurrence_id,
+            'parent_event_id': event.id,
+            'created_at': event.created_at,
+            'updated_at': event.updated_at,
+            'categories': serialize_categories(event.categories) if fields is None or 'categories' in fields else []
+        }
+
+    @staticmethod
+    def occurrence_data(event_id, series, occurrence_start, occurrence_end):
+        """Build the occurrence dict of a recurring event instance from its series data"""
+        data = series.copy()
+        data['id'] = f"{event_id}_{occurrence_start.strftime('%Y%m%d_%H%M%S')}"
+        data['start_datetime'] = occurrence_start
+        data['end_datetime'] = occurrence_end
+        return data
+
     @staticmethod
     def generate_recurrence_id():
         """Generate a unique recurrence ID"""
@@ -0,0 +1,214 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select
+
+from .. import db
+from ..models import Reminder
+from .logger import logger
+from .reminder_queue import ReminderQueue
+
+# Changes are read again for this long, a write committed late may carry an earlier updated_at
+CHANGE_OVERLAP = timedelta(seconds=30)
+
+
+class ReminderEngine:
+    """
+    In-memory timer firing reminders at their exact time
+
+    The reminders due before the end of the horizon are kept in a heap of
+    (reminder_time, reminder id). A thread sleeps until the earliest one is
+    due, claims exactly the due reminders by id (see ReminderQueue) and
+    sends them, so delivery is not tied to a polling interval.
+
+    The heap follows writes incrementally: every few seconds the reminders
+    written since the last look are read with one range query on the
+    updated_at index, which covers reminders created or changed through
+    the API and relative reminders moved with their event. Deleted
+    reminders and reminders sent by another worker are dropped when they
+    fire, their claim finds nothing. A low-frequency reconciliation scan
+    (reconcile_reminders) reloads the whole horizon and sends anything
+    overdue.
+
+    The heap only says when to look, the claim decides what is sent, so
+    several workers can each run an engine.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._scheduled = {}  # reminder id -> reminder_time of its current heap entry
+        self._condition = threading.Condition()
+        self._horizon_end = None
+        self._changes_since = None
+        self._thread = None
+        self._stopping = False
+
+    def schedule(self, reminder_id, reminder_time):
+        """Fire a reminder at reminder_time, replacing its earlier time"""
+        with self._condition:
+            if self._scheduled.get(reminder_id) == reminder_time:
+                return
+            if self._horizon_end is not None and reminder_time >= self._horizon_end:
+                # Loaded by the reconciliation that covers its time
+                self._scheduled.pop(reminder_id, None)
+                return
+            self._scheduled[reminder_id] = reminder_time
+            heapq.heappush(self._heap, (reminder_time, reminder_id))
+            self._condition.notify()
+
+    def unschedule(self, reminder_id):
+        """Forget a reminder, its heap entry is skipped when it comes up"""
+        with self._condition:
+            self._scheduled.pop(reminder_id, None)
+
+    def next_due(self):
+        """Time of the earliest scheduled reminder, or None"""
+        with self._condition:
+            while self._heap and self._scheduled.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """Remove and return the ids of the reminders due at now"""
+        due = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                reminder_time, reminder_id = heapq.heappop(self._heap)
+                if self._scheduled.get(reminder_id) == reminder_time:
+                    del self._scheduled[reminder_id]
+                    due.append(reminder_id)
+        return due
+
+    def __len__(self):
+        return len(self._scheduled)
+
+    def reconcile(self, now=None):
+        """
+        Reload the unsent reminders due before the end of the next horizon
+
+        Returns:
+        - Number of reminders scheduled
+        """
+        now = now or datetime.utcnow()
+        horizon_end = now + timedelta(seconds=current_app.config['REMINDER_ENGINE_HORIZON_SECONDS'])
+        rows = db.session.execute(
+            select(Reminder.id, Reminder.reminder_time).where(
+                Reminder.notification_sent == False,
+                Reminder.reminder_time < horizon_end
+            )
+        ).all()
+        db.session.commit()
+
+        with self._condition:
+            self._heap = [(reminder_time, reminder_id) for reminder_id, reminder_time in rows]
+            heapq.heapify(self._heap)
+            self._scheduled = {reminder_id: reminder_time for reminder_id, reminder_time in rows}
+            self._horizon_end = horizon_end
+            if self._changes_since is None:
+                self._changes_since = now
+            self._condition.notify()
+        return len(rows)
+
+    def apply_changes(self, now=None):
+        """
+        Reschedule the reminders written since the last call
+
+        Returns:
+        - Number of changed reminders read
+        """
+        now = now or datetime.utcnow()
+        since = (self._changes_since or now) - CHANGE_OVERLAP
+        rows = db.session.execute(
+            select(Reminder.id, Reminder.reminder_time, Reminder.notification_sent)
+            .where(Reminder.updated_at >= since)
+        ).all()
+        db.session.commit()
+
+        for reminder_id, reminder_time, notification_sent in rows:
+            if notification_sent:
+                self.unschedule(reminder_id)
+            else:
+                self.schedule(reminder_id, reminder_time)
+        self._changes_since = now
+        return len(rows)
+
+    def fire_due(self, now=None):
+        """
+        Claim and send the reminders due at now
+
+        Failed reminders are scheduled again after REMINDER_RETRY_SECONDS.
+
+        Returns:
+        - Number of notifications sent
+        """
+        from .reminder_scheduler import send_batch
+
+        now = now or datetime.utcnow()
+        due = self.pop_due(now)
+        config = current_app.config
+        batch_size = config['REMINDER_BATCH_SIZE']
+        retry_at = now + timedelta(seconds=config['REMINDER_RETRY_SECONDS'])
+        sent_count = 0
+
+        for i in range(0, len(due), batch_size):
+            batch = ReminderQueue.claim(now, due_within=timedelta(0), reminder_ids=due[i:i + batch_size])
+            if not batch:
+                continue
+            sent_ids, failed_ids = send_batch(batch)
+            ReminderQueue.complete(sent_ids, failed_ids)
+            for reminder, _, _ in batch:
+                if reminder.id in failed_ids:
+                    self.schedule(reminder.id, retry_at)
+            sent_count += len(sent_ids)
+
+        return sent_count
+
+    def _run(self, app):
+        poll_interval = timedelta(seconds=app.config['REMINDER_CHANGE_POLL_SECONDS'])
+        next_poll = datetime.utcnow()
+
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                now = datetime.utcnow()
+                wake_at = min(filter(None, (self.next_due(), next_poll)))
+                if wake_at > now:
+                    self._condition.wait((wake_at - now).total_seconds())
+                if self._stopping:
+                    return
+
+            now = datetime.utcnow()
+            with app.app_context():
+                try:
+                    if self._horizon_end is None:
+                        self.reconcile(now)
+                    if now >= next_poll:
+                        self.apply_changes(now)
+                        next_poll = now + poll_interval
+                    self.fire_due(now)
+                except Exception as e:
+                    logger.error(f"Error in reminder engine: {str(e)}")
+                    db.session.rollback()
+
+    def start(self, app):
+        """Start the engine thread, it runs in app contexts of app"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, args=(app,), name='reminder-engine', daemon=True)
+        self._thread.start()
+        logger.info("Reminder engine started")
+
+    def stop(self, timeout=10):
+        """Stop the engine thread after the batch it is sending"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+reminder_engine = ReminderEngine()
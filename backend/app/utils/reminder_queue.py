@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_, select, update
+
+from .. import db
+from ..models import Event, Reminder, User
+
+
+class ReminderQueue:
+    """
+    Due reminders claimed in batches by the reminder workers
+
+    A worker claims a batch by writing a fresh claim token and claimed_at on
+    up to batch_size due, unsent reminders in one UPDATE, and commits right
+    away. On PostgreSQL the UPDATE picks its rows with FOR UPDATE SKIP
+    LOCKED, so concurrent workers claim disjoint batches without waiting on
+    each other; SQLite runs one writer at a time, which makes the claim
+    atomic as well. The batch is then read with its events and users in one
+    joined query, and the outcome is written back with one UPDATE per
+    outcome. A claim expires after REMINDER_CLAIM_LEASE_SECONDS, so the
+    reminders of a worker that died are picked up again.
+    """
+
+    @staticmethod
+    def claim(now=None, batch_size=None, due_within=timedelta(minutes=1), reminder_ids=None):
+        """
+        Claim a batch of due reminders and load them for sending
+
+        Parameters:
+        - now: Current time, naive UTC
+        - batch_size: Most reminders to claim (default: REMINDER_BATCH_SIZE)
+        - due_within: Reminders due this soon are claimed as well
+        - reminder_ids: Only claim among these reminders
+
+        Returns:
+        - List of (reminder, event, user) in reminder time order, event and
+          user are None when the reminder's event or owner no longer exists
+        """
+        now = now or datetime.utcnow()
+        token = uuid.uuid4().hex
+        claimed = db.session.execute(
+            ReminderQueue.claim_statement(token, now, batch_size, due_within, reminder_ids)
+        ).rowcount
+        db.session.commit()
+
+        if not claimed:
+            return []
+
+        rows = db.session.execute(
+            select(Reminder, Event, User)
+            .outerjoin(Event, Event.id == Reminder.event_id)
+            .outerjoin(User, User.id == Event.user_id)
+            .where(Reminder.claim_token == token)
+            .order_by(Reminder.reminder_time, Reminder.id)
+        ).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def claim_statement(token, now, batch_size=None, due_within=timedelta(minutes=1), reminder_ids=None):
+        """The UPDATE claiming a batch of due reminders for token"""
+        config = current_app.config
+        batch_size = batch_size or config['REMINDER_BATCH_SIZE']
+        lease = timedelta(seconds=config['REMINDER_CLAIM_LEASE_SECONDS'])
+
+        # SQLite ignores FOR UPDATE, its writers are serialized anyway
+        candidates = select(Reminder.id).where(
+            Reminder.notification_sent == False,
+            Reminder.reminder_time <= now + due_within,
+            or_(Reminder.claimed_at.is_(None), Reminder.claimed_at < now - lease)
+        ).order_by(Reminder.reminder_time).limit(batch_size).with_for_update(skip_locked=True)
+        if reminder_ids is not None:
+            candidates = candidates.where(Reminder.id.in_(reminder_ids))
+
+        return (
+            update(Reminder)
+            .where(Reminder.id.in_(candidates.scalar_subquery()))
+            .values(claim_token=token, claimed_at=now, updated_at=Reminder.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def complete(sent_ids, failed_ids=()):
+        """
+        Record the outcome of a claimed batch and commit
+
+        Sent reminders are marked sent; failed ones are released so the next
+        tick retries them.
+        """
+        if sent_ids:
+            db.session.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(sent_ids))
+                .values(notification_sent=True, claim_token=None, claimed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+        if failed_ids:
+            db.session.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(failed_ids))
+                .values(claim_token=None, claimed_at=None, updated_at=Reminder.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
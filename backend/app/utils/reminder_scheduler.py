@@ -1,90 +1,143 @@
 from datetime import datetime, timedelta
-from .. import scheduler, db, create_app
-from ..models import Reminder, Event, User
+from apscheduler.schedulers.blocking import BlockingScheduler
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+import signal
+from .. import scheduler, db
 from ..utils.email_service import email_service
 from .logger import logger
-import os
+from .notification_dispatcher import notification_dispatcher
+from .reminder_engine import reminder_engine
+from .reminder_queue import ReminderQueue
 
 
-def check_reminders():
+def send_push_reminder(reminder_id):
+    # TODO: Implement push notification
+    logger.info(f"Push notification not implemented yet for reminder {reminder_id}")
+    return True  # Mark as sent for now
+
+
+def send_sms_reminder(reminder_id):
+    # TODO: Implement SMS notification
+    logger.info(f"SMS notification not implemented yet for reminder {reminder_id}")
+    return True  # Mark as sent for now
+
+
+def prepare_notification(reminder, event, user):
+    """
+    The send of one reminder's notification, bound to plain values
+
+    Returns:
+    - (channel, send, args), or None for an unknown notification type
+    """
+    if reminder.notification_type == 'email':
+        event_time = event.start_datetime.strftime('%Y-%m-%d %H:%M UTC')
+        return 'email', email_service.send_reminder_notification, (user.email, user.username, event.title, event_time)
+    if reminder.notification_type == 'push':
+        return 'push', send_push_reminder, (reminder.id,)
+    if reminder.notification_type == 'sms':
+        return 'sms', send_sms_reminder, (reminder.id,)
+    return None
+
+
+def send_batch(batch):
+    """
+    Send the notifications of a claimed batch concurrently
+
+    The sends run on the notification dispatcher's per-channel pools.
+    Reminders whose event or owner no longer exists, and reminders whose
+    send timed out, are left claimed; they are retried when the claim
+    expires.
+
+    Returns:
+    - (sent reminder ids, failed reminder ids)
+    """
+    failed_ids = []
+    notifications = []
+    descriptions = {}
+    for reminder, event, user in batch:
+        if event is None:
+            logger.warning(f"Reminder {reminder.id} references non-existent event {reminder.event_id}")
+            continue
+        if user is None:
+            logger.warning(f"Event {event.id} references non-existent user {event.user_id}")
+            continue
+
+        notification = prepare_notification(reminder, event, user)
+        if notification is None:
+            failed_ids.append(reminder.id)
+            logger.error(f"Unknown notification type '{reminder.notification_type}' of reminder {reminder.id}")
+            continue
+        notifications.append((reminder.id, *notification))
+        descriptions[reminder.id] = (
+            f"user {user.username}: Event '{event.title}' starts at {event.start_datetime}"
+        )
+
+    sent_ids, dispatch_failed_ids, _ = notification_dispatcher.dispatch(notifications)
+    for reminder_id in sent_ids:
+        logger.info(f"Reminder notification sent for {descriptions[reminder_id]}")
+    for reminder_id in dispatch_failed_ids:
+        logger.error(f"Failed to send reminder notification for reminder {reminder_id}")
+
+    return sent_ids, failed_ids + dispatch_failed_ids
+
+
+def check_reminders(due_within=timedelta(minutes=1)):
     """
-    Check for upcoming reminders and send notifications
-    This function will be called periodically by the scheduler
+    Claim due reminders in batches and send their notifications
+
+    Any number of workers can run it at the same time, every reminder is
+    claimed by one of them (see ReminderQueue).
+
+    Parameters:
+    - due_within: Reminders due this soon are sent as well
+
+    Returns:
+    - Number of notifications sent
     """
+    sent_count = 0
+    failed_ids = []
     try:
-        # Get environment from FLASK_ENV or default to development
-        env = os.getenv('FLASK_ENV', 'development')
-
-        # Create app with the same configuration as main app
-        app = create_app(env)
-
-        # Create and activate an application context
-        with app.app_context():
-            # Get current time
-            current_time = datetime.utcnow()
-
-            # Find reminders that are due within the next minute and not yet sent
-            upcoming_reminders = Reminder.query.filter(
-                Reminder.reminder_time <= current_time + timedelta(minutes=1),
-                Reminder.notification_sent == False
-            ).all()
-
-            # Process each reminder
-            for reminder in upcoming_reminders:
-                try:
-                    # Get associated event
-                    event = Event.query.get(reminder.event_id)
-
-                    if not event:
-                        logger.warning(f"Reminder {reminder.id} references non-existent event {reminder.event_id}")
-                        continue
-
-                    # Get user
-                    user = User.query.get(event.user_id)
-
-                    if not user:
-                        logger.warning(f"Event {event.id} references non-existent user {event.user_id}")
-                        continue
-
-                    # Send notification based on type
-                    notification_sent = False
-
-                    if reminder.notification_type == 'email':
-                        # Send email notification
-                        event_time = event.start_datetime.strftime('%Y-%m-%d %H:%M UTC')
-                        notification_sent = email_service.send_reminder_notification(
-                            user.email,
-                            user.username,
-                            event.title,
-                            event_time
-                        )
-                    elif reminder.notification_type == 'push':
-                        # TODO: Implement push notification
-                        logger.info(f"Push notification not implemented yet for reminder {reminder.id}")
-                        notification_sent = True  # Mark as sent for now
-                    elif reminder.notification_type == 'sms':
-                        # TODO: Implement SMS notification
-                        logger.info(f"SMS notification not implemented yet for reminder {reminder.id}")
-                        notification_sent = True  # Mark as sent for now
-
-                    if notification_sent:
-                        # Mark reminder as sent
-                        reminder.notification_sent = True
-                        db.session.commit()
-
-                        logger.info(
-                            f"Reminder notification sent for user {user.username}: Event '{event.title}' "
-                            f"starts at {event.start_datetime}"
-                        )
-                    else:
-                        logger.error(f"Failed to send reminder notification for reminder {reminder.id}")
-
-                except Exception as inner_e:
-                    logger.error(f"Error processing reminder {reminder.id}: {str(inner_e)}")
-                    db.session.rollback()
+        batch_size = current_app.config['REMINDER_BATCH_SIZE']
+        while True:
+            batch = ReminderQueue.claim(batch_size=batch_size, due_within=due_within)
+            sent_ids, batch_failed_ids = send_batch(batch)
+            failed_ids.extend(batch_failed_ids)
+
+            if sent_ids:
+                ReminderQueue.complete(sent_ids)
+                sent_count += len(sent_ids)
+
+            # A short batch means the due reminders are drained
+            if len(batch) < batch_size:
+                break
+
+        # Failures stay claimed until the batches are drained, so each is tried once per tick
+        if failed_ids:
+            ReminderQueue.complete((), failed_ids)
 
     except Exception as e:
         logger.error(f"Error checking reminders: {str(e)}")
+        db.session.rollback()
+
+    return sent_count
+
+
+def reconcile_reminders():
+    """
+    Low-frequency safety net of the reminder engine
+
+    Sends the reminders that are overdue (missed by a worker that was down,
+    or written while no engine was watching) and reloads the engine's
+    horizon from the database.
+    """
+    check_reminders(due_within=timedelta(0))
+    try:
+        reminder_engine.reconcile()
+    except Exception as e:
+        logger.error(f"Error reconciling reminder engine: {str(e)}")
+        db.session.rollback()
 
 
 def cleanup_old_tokens():
@@ -92,58 +145,176 @@ def cleanup_old_tokens():
     Clean up expired tokens from the database
     """
     try:
-        env = os.getenv('FLASK_ENV', 'development')
-        app = create_app(env)
-
-        with app.app_context():
-            from ..models import EmailVerificationToken, PasswordResetToken
+        from ..models import EmailVerificationToken, PasswordResetToken
 
-            # Clean up expired email verification tokens
-            expired_email_tokens = EmailVerificationToken.query.filter(
-                EmailVerificationToken.expires_at < datetime.utcnow()
-            ).all()
+        # Clean up expired email verification tokens
+        expired_email_tokens = EmailVerificationToken.query.filter(
+            EmailVerificationToken.expires_at < datetime.utcnow()
+        ).all()
 
-            for token in expired_email_tokens:
-                db.session.delete(token)
+        for token in expired_email_tokens:
+            db.session.delete(token)
 
-            # Clean up expired password reset tokens
-            expired_reset_tokens = PasswordResetToken.query.filter(
-                PasswordResetToken.expires_at < datetime.utcnow()
-            ).all()
+        # Clean up expired password reset tokens
+        expired_reset_tokens = PasswordResetToken.query.filter(
+            PasswordResetToken.expires_at < datetime.utcnow()
+        ).all()
 
-            for token in expired_reset_tokens:
-                db.session.delete(token)
+        for token in expired_reset_tokens:
+            db.session.delete(token)
 
-            db.session.commit()
+        db.session.commit()
 
-            if expired_email_tokens or expired_reset_tokens:
-                logger.info(
-                    f"Cleaned up {len(expired_email_tokens)} expired email verification tokens "
-                    f"and {len(expired_reset_tokens)} expired password reset tokens"
-                )
+        if expired_email_tokens or expired_reset_tokens:
+            logger.info(
+                f"Cleaned up {len(expired_email_tokens)} expired email verification tokens "
+                f"and {len(expired_reset_tokens)} expired password reset tokens"
+            )
 
     except Exception as e:
         logger.error(f"Error cleaning up expired tokens: {str(e)}")
 
 
-def init_reminder_scheduler():
-    """Initialize the reminder scheduler with enhanced functionality"""
-    # Check reminders every minute
-    scheduler.add_job(
-        func=check_reminders,
+def extend_occurrence_horizon():
+    """
+    Keep stored occurrences and next occurrence times of recurring events ahead of the current date
+    """
+    try:
+        from .occurrence_store import OccurrenceStore
+        from .series_span import SeriesSpan
+
+        OccurrenceStore.extend_horizon()
+        SeriesSpan.refresh_next_occurrences()
+
+    except Exception as e:
+        logger.error(f"Error extending stored occurrences: {str(e)}")
+
+
+def prune_event_changes():
+    """
+    Delete event change feed rows older than the retention period
+    """
+    try:
+        from .change_feed import prune_changes
+
+        pruned = prune_changes()
+        if pruned:
+            logger.info(f"Pruned {pruned} event change feed rows")
+
+    except Exception as e:
+        logger.error(f"Error pruning event changes: {str(e)}")
+
+
+def run_job(app, job):
+    """
+    Run a scheduled job in an app context of the long-lived scheduler app
+
+    The app, its engine and connection pool are created once when the
+    scheduler starts. A tick only pushes an app context, whose teardown
+    returns the job's session and connection to the pool.
+    """
+    with app.app_context():
+        job()
+
+
+def init_reminder_scheduler(app, target=None):
+    """
+    Register the reminder and maintenance jobs
+
+    Parameters:
+    - app: The app the jobs run in, created once per process
+    - target: Scheduler to register them on, the app's background scheduler by default
+    """
+    target = target or scheduler
+
+    if app.config['REMINDER_ENGINE_ENABLED']:
+        # The reminder engine fires reminders on time, the scan only reconciles
+        target.add_job(
+            func=run_job,
+            args=[app, reconcile_reminders],
+            trigger="interval",
+            seconds=app.config['REMINDER_RECONCILE_SECONDS'],
+            id="check_reminders",
+            replace_existing=True
+        )
+    else:
+        # Check reminders every minute
+        target.add_job(
+            func=run_job,
+            args=[app, check_reminders],
+            trigger="interval",
+            minutes=1,
+            id="check_reminders",
+            replace_existing=True
+        )
+
+    # Clean up expired tokens every hour
+    target.add_job(
+        func=run_job,
+        args=[app, cleanup_old_tokens],
         trigger="interval",
-        minutes=1,
-        id="check_reminders",
+        hours=1,
+        id="cleanup_tokens",
         replace_existing=True
     )
 
-    # Clean up expired tokens every hour
-    scheduler.add_job(
-        func=cleanup_old_tokens,
+    # Move the stored occurrence range forward every hour
+    target.add_job(
+        func=run_job,
+        args=[app, extend_occurrence_horizon],
         trigger="interval",
         hours=1,
-        id="cleanup_tokens",
+        id="extend_occurrence_horizon",
+        replace_existing=True
+    )
+
+    # Prune the event change feed once a day
+    target.add_job(
+        func=run_job,
+        args=[app, prune_event_changes],
+        trigger="interval",
+        hours=24,
+        id="prune_event_changes",
         replace_existing=True
     )
 
-    logger.info("Enhanced reminder scheduler initialized")
\ No newline at end of file
+    logger.info("Enhanced reminder scheduler initialized")
+
+
+def run_reminder_worker(app):
+    """
+    Run the reminder and maintenance jobs in the foreground until stopped
+
+    This is the reminder worker process. Run exactly one of it next to the
+    web workers, which leave SCHEDULER_ENABLED off so every job runs once.
+    SIGTERM and Ctrl+C stop it after the running jobs finish.
+
+    Parameters:
+    - app: The app the jobs run in, built once at worker start
+    """
+    if scheduler.running:
+        # SCHEDULER_ENABLED is set for this process, the jobs must not run twice
+        logger.warning("Stopping the in-process scheduler, the reminder worker runs the jobs")
+        scheduler.shutdown()
+
+    worker = BlockingScheduler()
+    init_reminder_scheduler(app, worker)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.running and worker.shutdown())
+    if app.config['REMINDER_ENGINE_ENABLED']:
+        reminder_engine.start(app)
+
+    logger.info("Reminder worker started")
+    try:
+        worker.start()
+    except (KeyboardInterrupt, SystemExit):
+        worker.shutdown()
+    reminder_engine.stop()
+    notification_dispatcher.shutdown()
+    logger.info("Reminder worker stopped")
+
+
+@click.command('reminder-worker')
+@with_appcontext
+def reminder_worker_command():
+    """Run the reminder and maintenance jobs (one process per deployment)."""
+    run_reminder_worker(current_app._get_current_object())
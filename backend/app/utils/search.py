@@ -0,0 +1,94 @@
+import re
+from sqlalchemy import literal_column, select, table, column
+
+from .. import db
+from ..models import Event
+
+# FTS5 external-content table created alongside events on SQLite
+events_fts = table('events_fts', column('rowid'))
+
+
+def search_terms(term):
+    """Split a user search string into plain word tokens"""
+    return re.findall(r'\w+', term or '', re.UNICODE)
+
+
+class EventSearch:
+    """
+    Ranked full-text search over event titles and descriptions
+
+    Uses the events.search_vector tsvector column on PostgreSQL and the
+    events_fts FTS5 table on SQLite. Every term is prefix-matched and all
+    terms must match. Other databases fall back to substring matching.
+    """
+
+    @staticmethod
+    def _dialect():
+        return db.session.get_bind().dialect.name
+
+    @staticmethod
+    def _match_clause(terms):
+        """Build the match clause and the rank expression (lower sorts first)"""
+        dialect = EventSearch._dialect()
+
+        if dialect == 'postgresql':
+            tsquery = db.func.to_tsquery('simple', ' & '.join(f"{term}:*" for term in terms))
+            search_vector = literal_column('events.search_vector')
+            match = search_vector.op('@@')(tsquery)
+            rank = -db.func.ts_rank_cd(search_vector, tsquery)
+            return match, rank, False
+
+        if dialect == 'sqlite':
+            fts_query = ' '.join(f'"{term}"*' for term in terms)
+            match = literal_column('events_fts').op('MATCH')(fts_query)
+            # bm25() returns lower values for better matches, titles weigh more
+            rank = literal_column('bm25(events_fts, 10.0, 1.0)')
+            return match, rank, True
+
+        like_filters = [
+            db.or_(Event.title.ilike(f"%{term}%"), Event.description.ilike(f"%{term}%"))
+            for term in terms
+        ]
+        return db.and_(*like_filters), literal_column('0'), False
+
+    @staticmethod
+    def filter_query(query, term):
+        """
+        Restrict an Event query to rows matching the search term
+
+        Parameters:
+        - query: Event query to filter
+        - term: Raw search string from the client
+
+        Returns:
+        - Filtered query (unchanged if the term has no searchable words)
+        """
+        terms = search_terms(term)
+        if not terms:
+            return query
+
+        match, _, uses_fts_table = EventSearch._match_clause(terms)
+        if uses_fts_table:
+            matching_ids = select(events_fts.c.rowid).where(match)
+            return query.filter(Event.id.in_(matching_ids))
+        return query.filter(match)
+
+    @staticmethod
+    def ranked_query(query, term):
+        """
+        Filter an Event query by the search term and order it by relevance
+
+        Returns:
+        - Query yielding (Event, rank) rows, best match first, or None if the
+          term has no searchable words
+        """
+        terms = search_terms(term)
+        if not terms:
+            return None
+
+        match, rank, uses_fts_table = EventSearch._match_clause(terms)
+        if uses_fts_table:
+            query = query.join(events_fts, events_fts.c.rowid == Event.id)
+
+        rank = rank.label('rank')
+        return query.filter(match).add_columns(rank).order_by(rank, Event.id)
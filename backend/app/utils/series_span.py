@@ -0,0 +1,253 @@
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import chain
+from types import SimpleNamespace
+from sqlalchemy import and_, event as sa_event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from .. import db
+from ..models import Event, RecurrenceRule
+from .logger import logger
+from .recurrence import RecurrenceGenerator
+
+# Attributes a series' span depends on
+EVENT_SPAN_ATTRIBUTES = ('start_datetime', 'end_datetime', 'is_recurring', 'is_cancelled')
+RULE_SPAN_ATTRIBUTES = (
+    'frequency', 'interval', 'days_of_week', 'day_of_month', 'week_of_month', 'day_of_week',
+    'end_date', 'occurrence_count', 'rrule'
+)
+
+
+class SeriesSpan:
+    """
+    Denormalized time span of events and recurring series
+
+    Every event row carries series_start (start of its first occurrence),
+    series_end (end of its last occurrence, NULL for a series without an
+    end) and next_occurrence_at (start of the first occurrence at or after
+    the time it was computed, NULL when there is none). A one-off event
+    spans its own times. Listings select the rows overlapping a window with
+    one indexed range query on these columns instead of loading every
+    recurring master that started before the window.
+
+    The columns are recomputed in a before_flush listener whenever an
+    event's times or recurrence, or its RecurrenceRule, change, so every
+    write path keeps them current. next_occurrence_at goes stale as time
+    passes; refresh_next_occurrences moves it forward in the background.
+    """
+
+    @staticmethod
+    def compute(event, recurrence_rule=None, now=None):
+        """
+        Compute the span of an event or series
+
+        Parameters:
+        - event: The event, its times may still be timezone-aware before a flush
+        - recurrence_rule: The series' rule, None for a one-off event
+        - now: Reference time for next_occurrence_at, naive UTC
+
+        Returns:
+        - (series_start, series_end, next_occurrence_at), naive UTC
+        """
+        now = now or datetime.utcnow()
+        start = _stored(event.start_datetime)
+        end = _stored(event.end_datetime)
+
+        if not event.is_recurring or recurrence_rule is None:
+            upcoming = start if start >= now and not event.is_cancelled else None
+            return start, end or start, upcoming
+
+        # Expand from a detached copy: the rule may have unflushed changes its
+        # cache key does not reflect yet, and the event may hold aware times
+        series = SimpleNamespace(start_datetime=start, end_datetime=end)
+        rule = SimpleNamespace(rrule=RecurrenceGenerator.to_rrule_string(recurrence_rule))
+        duration = end - start if end is not None else timedelta(0)
+
+        try:
+            full = RecurrenceGenerator.build_rrule(series, rule)
+            if full is None:
+                return start, None, None
+
+            first = next(iter(full), None)
+            if first is None:
+                # The rule has no occurrences, nothing of the series is listed
+                return start, start, None
+
+            last = SeriesSpan._last_start(series, rule, full)
+            if last is not None and last < now:
+                upcoming = None
+            else:
+                seeked = RecurrenceGenerator.build_rrule(series, rule, now)
+                upcoming = seeked.after(now, inc=True) if seeked is not None else None
+
+            return first, last + duration if last is not None else None, upcoming
+
+        except (ValueError, TypeError) as e:
+            # Unbounded span, listings fall back to the master as for any rule they cannot expand
+            logger.warning(f"Cannot compute span of recurring event {event.id}: {str(e)}")
+            return start, None, None
+
+    @staticmethod
+    def _last_start(series, rule, full):
+        """Start of the last occurrence of a series, None when it has no end"""
+        params = RecurrenceGenerator.rrule_params(series, rule)
+        if 'count' in params:
+            last = deque(full, maxlen=1)
+            return last[0] if last else None
+        if 'until' not in params:
+            return None
+
+        # One whole period before UNTIL holds the last occurrence of any rule that has one
+        until = params['until']
+        seek_from = until - timedelta(days=366 * params['interval'])
+        seeked = RecurrenceGenerator.build_rrule(series, rule, seek_from)
+        last = seeked.before(until, inc=True) if seeked is not None else None
+        return last or full.before(until, inc=True)
+
+    @staticmethod
+    def apply(event, recurrence_rule=None, now=None):
+        """Store the span of an event on its row, only assigning changed values"""
+        span = SeriesSpan.compute(event, recurrence_rule, now)
+        for name, value in zip(('series_start', 'series_end', 'next_occurrence_at'), span):
+            if getattr(event, name) != value:
+                setattr(event, name, value)
+
+    @staticmethod
+    def overlaps_clause(window_start, window_end):
+        """
+        SQL condition for rows whose span overlaps [window_start, window_end)
+
+        Spans without an end overlap every window after their start. Events
+        without an end_datetime end where they start and are listed when
+        that instant falls into the window.
+        """
+        return and_(
+            Event.series_start < window_end,
+            or_(
+                Event.series_end.is_(None),
+                Event.series_end > window_start,
+                and_(Event.end_datetime.is_(None), Event.series_end == window_start)
+            )
+        )
+
+    @staticmethod
+    def refresh_next_occurrences(now=None, batch_size=200):
+        """
+        Move next_occurrence_at of recurring series forward
+
+        Series whose next occurrence has passed are recomputed, as are series
+        never computed (no next occurrence and no end, as left by the
+        migration). The update keeps updated_at, the series did not change.
+
+        Returns:
+        - Number of series updated
+        """
+        now = now or datetime.utcnow()
+        updated = 0
+        last_id = 0
+
+        while True:
+            events = Event.query.filter(
+                Event.id > last_id,
+                Event.is_recurring == True,
+                Event.parent_event_id.is_(None),
+                or_(Event.next_occurrence_at < now,
+                    and_(Event.next_occurrence_at.is_(None), Event.series_end.is_(None)))
+            ).order_by(Event.id).limit(batch_size).all()
+
+            if not events:
+                break
+
+            rules = {
+                rule.event_id: rule
+                for rule in RecurrenceRule.query.filter(RecurrenceRule.event_id.in_([e.id for e in events]))
+            }
+            for event in events:
+                series_start, series_end, upcoming = SeriesSpan.compute(event, rules.get(event.id), now)
+                db.session.execute(
+                    update(Event)
+                    .where(Event.id == event.id)
+                    .values(
+                        series_start=series_start,
+                        series_end=series_end,
+                        next_occurrence_at=upcoming,
+                        updated_at=Event.updated_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                updated += 1
+
+            last_id = events[-1].id
+            db.session.commit()
+
+        if updated:
+            logger.info(f"Refreshed next occurrence of {updated} recurring series")
+        return updated
+
+
+def _stored(dt):
+    # The database keeps the wall time of aware values, the span must match the stored times
+    return dt.replace(tzinfo=None) if dt is not None and dt.tzinfo is not None else dt
+
+
+def _has_changes(instance, names):
+    state = inspect(instance)
+    return state.pending or any(state.attrs[name].history.has_changes() for name in names)
+
+
+def _maintain_series_spans(session, flush_context, instances):
+    """Recompute the span of events whose times, recurrence or rule change in this flush"""
+    changed_rules = []
+    events = {}
+
+    for instance in chain(session.new, session.dirty):
+        if isinstance(instance, RecurrenceRule):
+            if _has_changes(instance, RULE_SPAN_ATTRIBUTES):
+                changed_rules.append(instance)
+        elif isinstance(instance, Event) and _has_changes(instance, EVENT_SPAN_ATTRIBUTES):
+            events[id(instance)] = instance
+
+    deleted_rules = [instance for instance in session.deleted if isinstance(instance, RecurrenceRule)]
+    if not changed_rules and not deleted_rules and not events:
+        return
+
+    with session.no_autoflush:
+        rules = {}  # id(event) -> its rule, None when the rule is deleted
+
+        def rule_event(rule):
+            # A rule attached through the relationship has no event_id before the flush
+            if rule.event_id is None:
+                return rule.__dict__.get('event')
+            return session.get(Event, rule.event_id)
+
+        for rule in deleted_rules:
+            event = rule_event(rule)
+            if event is not None:
+                rules[id(event)] = None
+                events[id(event)] = event
+        for rule in changed_rules:
+            event = rule_event(rule)
+            if event is not None:
+                rules[id(event)] = rule
+                events[id(event)] = event
+
+        events = {key: event for key, event in events.items() if event not in session.deleted}
+
+        # Rules of the remaining recurring events, in one query
+        missing = {
+            event.id: key for key, event in events.items()
+            if event.is_recurring and event.id is not None and key not in rules
+        }
+        if missing:
+            for rule in session.scalars(select(RecurrenceRule).where(RecurrenceRule.event_id.in_(missing))):
+                if rule not in session.deleted:
+                    rules[missing[rule.event_id]] = rule
+
+        for key, event in events.items():
+            SeriesSpan.apply(event, rules.get(key))
+
+
+def init_series_spans():
+    """Register the listener keeping series spans current, once per process"""
+    if not sa_event.contains(Session, 'before_flush', _maintain_series_spans):
+        sa_event.listen(Session, 'before_flush', _maintain_series_spans)
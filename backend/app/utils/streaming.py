@@ -0,0 +1,64 @@
+import json
+from itertools import islice
+from flask import request, current_app, stream_with_context
+
+from .logger import logger
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson():
+    """True when the client asked for a streamed listing, by stream=true or Accept"""
+    if request.args.get('stream', 'false').lower() == 'true':
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def batched(iterable, size):
+    """Yield lists of up to size items from an iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def ndjson_response(items, headers=None, chunk_size=64 * 1024):
+    """
+    Stream dicts as newline-delimited JSON, one item per line
+
+    Items are pulled from the iterable while the response is written, inside
+    the request context, so only one buffered chunk is held in memory. Lines
+    are sent in chunks of about chunk_size bytes. The status is already sent
+    when an item fails, so the stream ends with an error line instead.
+
+    Parameters:
+    - items: Iterable of JSON-serializable dicts, usually a generator
+    - headers: Extra response headers
+
+    Returns:
+    - Streaming response
+    """
+    def generate():
+        buffer = []
+        size = 0
+        try:
+            for item in items:
+                line = json.dumps(item, separators=(',', ':')) + '\n'
+                buffer.append(line)
+                size += len(line)
+                if size >= chunk_size:
+                    yield ''.join(buffer)
+                    buffer = []
+                    size = 0
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            buffer.append(json.dumps({"success": False, "message": "An error occurred while streaming the response"}) + '\n')
+        if buffer:
+            yield ''.join(buffer)
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype=NDJSON_MIMETYPE, headers=headers
+    )
@@ -0,0 +1,71 @@
+"""
+Benchmark of the NumPy expansion path against dateutil
+
+Expands DAILY and WEEKLY series over windows of growing length with both
+paths of RecurrenceGenerator.iter_occurrences and prints the time per
+expansion and the occurrences per second.
+
+Usage (from backend/):
+    python -m benchmarks.bench_recurrence
+"""
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.utils.recurrence import HAS_NUMPY, RecurrenceGenerator
+
+RULES = {
+    'daily': dict(frequency='DAILY', interval=1, days_of_week=None),
+    'weekly mon,wed,fri': dict(frequency='WEEKLY', interval=1, days_of_week='MON,WED,FRI'),
+    'biweekly tue,thu': dict(frequency='WEEKLY', interval=2, days_of_week='TUE,THU'),
+}
+WINDOW_DAYS = [30, 365, 1825, 7300]
+
+
+def make_series(rule):
+    start = datetime(2020, 1, 6, 9, 0)
+    event = SimpleNamespace(id=1, start_datetime=start, end_datetime=start + timedelta(hours=1))
+    recurrence_rule = SimpleNamespace(
+        day_of_month=None, week_of_month=None, day_of_week=None, end_date=None, occurrence_count=None, **rule
+    )
+    return event, recurrence_rule
+
+
+def expand(event, rule, window_start, window_end, vectorize):
+    RecurrenceGenerator.vectorize = vectorize
+    try:
+        return sum(1 for _ in RecurrenceGenerator.iter_occurrences(event, rule, window_start, window_end))
+    finally:
+        RecurrenceGenerator.vectorize = HAS_NUMPY
+
+
+def best(func, repeat=5):
+    number = 1
+    while min(timeit.repeat(func, number=number, repeat=1)) < 0.05:
+        number *= 2
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    if not HAS_NUMPY:
+        print("NumPy is not installed, only dateutil is available")
+        return
+
+    print(f"{'series':<22}{'window':>8}{'occurrences':>13}{'dateutil ms':>13}{'numpy ms':>10}"
+          f"{'numpy occ/s':>14}{'speedup':>9}")
+    for name, rule in RULES.items():
+        event, recurrence_rule = make_series(rule)
+        for days in WINDOW_DAYS:
+            window_start = datetime(2021, 1, 1)
+            window_end = window_start + timedelta(days=days)
+            count = expand(event, recurrence_rule, window_start, window_end, True)
+            assert count == expand(event, recurrence_rule, window_start, window_end, False)
+
+            dateutil_time = best(lambda: expand(event, recurrence_rule, window_start, window_end, False))
+            numpy_time = best(lambda: expand(event, recurrence_rule, window_start, window_end, True))
+            print(f"{name:<22}{days:>7}d{count:>13}{dateutil_time * 1e3:>13.3f}{numpy_time * 1e3:>10.3f}"
+                  f"{count / numpy_time:>14,.0f}{dateutil_time / numpy_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark of the per-tick overhead of scheduled jobs
+
+Compares building the app for every tick, as the jobs did before, with
+running them in an app context of one app built at scheduler start. Both
+run check_reminders against an empty reminders table, so the difference
+is the overhead alone.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scheduler [ticks]
+"""
+import sys
+import time
+
+from app import create_app, db
+from app.utils.reminder_scheduler import check_reminders, run_job
+
+CONFIG = 'testing'
+
+
+def legacy_tick(job):
+    app = create_app(CONFIG)
+    with app.app_context():
+        job()
+
+
+def per_tick(func, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func()
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    start = time.perf_counter()
+    app = create_app(CONFIG)
+    startup = time.perf_counter() - start
+
+    with app.app_context():
+        db.create_all()
+    try:
+        # Warm both paths up before timing
+        legacy_tick(check_reminders)
+        run_job(app, check_reminders)
+
+        rebuild = per_tick(lambda: legacy_tick(check_reminders), ticks)
+        shared = per_tick(lambda: run_job(app, check_reminders), ticks)
+    finally:
+        with app.app_context():
+            db.drop_all()
+
+    print(f"app startup (once per worker):  {startup * 1e3:9.2f} ms")
+    print(f"tick, create_app per tick:      {rebuild * 1e3:9.2f} ms")
+    print(f"tick, long-lived app:           {shared * 1e3:9.2f} ms")
+    print(f"overhead removed per tick:      {(rebuild - shared) * 1e3:9.2f} ms ({rebuild / shared:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
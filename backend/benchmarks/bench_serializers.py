@@ -0,0 +1,121 @@
+"""
+Microbenchmark for app/utils/serializers.py
+
+Compares the serializers with the hand-built dicts the routes used before,
+for plain events and for the occurrences of one recurring series.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serializers [rows]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.utils.serializers import serialize_event, serialize_occurrences, serialize_categories
+
+
+class FakeCategory(SimpleNamespace):
+    def to_dict(self):
+        return {
+            'id': self.id, 'name': self.name, 'color': self.color, 'description': self.description,
+            'created_at': self.created_at, 'updated_at': self.updated_at
+        }
+
+
+def make_event(i):
+    now = datetime(2025, 7, 1, 9, 0) + timedelta(hours=i)
+    categories = [
+        FakeCategory(id=c, name=f'Category {c}', color='blue', description=None, created_at=now, updated_at=now)
+        for c in range(2)
+    ]
+    return SimpleNamespace(
+        id=i, title=f'Event {i}', description='Weekly sync', start_datetime=now,
+        end_datetime=now + timedelta(hours=1), is_all_day=False, color='blue', is_recurring=False,
+        recurrence_id=None, created_at=now, updated_at=now, categories=categories, recurrence_rule=None
+    )
+
+
+def legacy_event(event):
+    return {
+        "id": event.id,
+        "title": event.title,
+        "description": event.description,
+        "start_datetime": event.start_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
+        "end_datetime": event.end_datetime.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z') if event.end_datetime else None,
+        "is_all_day": event.is_all_day,
+        "color": event.color,
+        "is_recurring": event.is_recurring,
+        "recurrence_id": event.recurrence_id,
+        "created_at": event.created_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
+        "updated_at": event.updated_at.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
+        "categories": [cat.to_dict() for cat in event.categories]
+    }
+
+
+def occurrence_starts(event, count):
+    return [event.start_datetime + timedelta(days=i) for i in range(count)]
+
+
+def legacy_occurrences(event, starts):
+    duration = event.end_datetime - event.start_datetime
+    result = []
+    for start in starts:
+        # Category dicts were built for every occurrence, then every datetime formatted
+        occurrence = {
+            'id': f"{event.id}_{start.strftime('%Y%m%d_%H%M%S')}", 'title': event.title,
+            'description': event.description, 'start_datetime': start, 'end_datetime': start + duration,
+            'is_all_day': event.is_all_day, 'color': event.color, 'is_recurring': True,
+            'recurrence_id': event.recurrence_id, 'parent_event_id': event.id,
+            'created_at': event.created_at, 'updated_at': event.updated_at,
+            'categories': [cat.to_dict() for cat in event.categories]
+        }
+        data = occurrence.copy()
+        for field in ('start_datetime', 'end_datetime', 'created_at', 'updated_at'):
+            if isinstance(data[field], datetime):
+                data[field] = data[field].replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
+        result.append(data)
+    return result
+
+
+def new_occurrences(event, starts):
+    duration = event.end_datetime - event.start_datetime
+    categories = serialize_categories(event.categories)
+    occurrences = [
+        {
+            'id': f"{event.id}_{start.strftime('%Y%m%d_%H%M%S')}", 'title': event.title,
+            'description': event.description, 'start_datetime': start, 'end_datetime': start + duration,
+            'is_all_day': event.is_all_day, 'color': event.color, 'is_recurring': True,
+            'recurrence_id': event.recurrence_id, 'parent_event_id': event.id,
+            'created_at': event.created_at, 'updated_at': event.updated_at, 'categories': categories
+        }
+        for start in starts
+    ]
+    return serialize_occurrences(occurrences)
+
+
+def rate(func, rows, repeat=5):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    return rows / best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    events = [make_event(i) for i in range(rows)]
+    series = events[0]
+    starts = occurrence_starts(series, rows)
+
+    results = [
+        ('events', rate(lambda: [legacy_event(e) for e in events], rows),
+         rate(lambda: [serialize_event(e) for e in events], rows)),
+        ('occurrences', rate(lambda: legacy_occurrences(series, starts), rows),
+         rate(lambda: new_occurrences(series, starts), rows)),
+    ]
+
+    print(f"{'rows':<12}{'legacy rows/s':>16}{'serializer rows/s':>20}{'speedup':>10}")
+    for name, legacy, new in results:
+        print(f"{name:<12}{legacy:>16,.0f}{new:>20,.0f}{new / legacy:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
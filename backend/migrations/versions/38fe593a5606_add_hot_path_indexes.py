@@ -0,0 +1,50 @@
+"""Add indexes for hot query predicates
+
+Revision ID: 38fe593a5606
+Revises: phase2_enhanced_security_reminders
+Create Date: 2025-07-12 10:24:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '38fe593a5606'
+down_revision = 'phase2_enhanced_security_reminders'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Event listing by user ordered by start (also serves keyset pagination)
+    op.create_index('ix_events_user_start', 'events', ['user_id', 'start_datetime', 'id'])
+    op.create_index('ix_events_recurrence_id', 'events', ['recurrence_id'])
+
+    # Scheduler scan: only pending reminders are indexed
+    op.create_index(
+        'ix_reminders_pending_time', 'reminders', ['reminder_time'],
+        sqlite_where=sa.text('notification_sent = 0'),
+        postgresql_where=sa.text('notification_sent = false')
+    )
+    op.create_index('ix_reminders_event_id', 'reminders', ['event_id'])
+
+    op.create_index('ix_recurrence_rules_event_id', 'recurrence_rules', ['event_id'])
+    op.create_index('ix_event_categories_category_id', 'event_categories', ['category_id'])
+
+    # categories.user_id is already served by the unique_user_category (user_id, name) index
+
+    # Expired token cleanup
+    op.create_index('ix_email_verification_tokens_expires_at', 'email_verification_tokens', ['expires_at'])
+    op.create_index('ix_password_reset_tokens_expires_at', 'password_reset_tokens', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_password_reset_tokens_expires_at', table_name='password_reset_tokens')
+    op.drop_index('ix_email_verification_tokens_expires_at', table_name='email_verification_tokens')
+    op.drop_index('ix_event_categories_category_id', table_name='event_categories')
+    op.drop_index('ix_recurrence_rules_event_id', table_name='recurrence_rules')
+    op.drop_index('ix_reminders_event_id', table_name='reminders')
+    op.drop_index('ix_reminders_pending_time', table_name='reminders')
+    op.drop_index('ix_events_recurrence_id', table_name='events')
+    op.drop_index('ix_events_user_start', table_name='events')
@@ -0,0 +1,37 @@
+"""Add event change feed
+
+Revision ID: 5d0f3b6a8c21
+Revises: c4e8a1f07b52
+Create Date: 2025-07-19 11:05:36.902174
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0f3b6a8c21'
+down_revision = 'c4e8a1f07b52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'event_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('change_type', sa.String(length=10), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_event_changes_user_id_id', 'event_changes', ['user_id', 'id'])
+    op.create_index('ix_event_changes_changed_at', 'event_changes', ['changed_at'])
+
+
+def downgrade():
+    op.drop_index('ix_event_changes_changed_at', table_name='event_changes')
+    op.drop_index('ix_event_changes_user_id_id', table_name='event_changes')
+    op.drop_table('event_changes')
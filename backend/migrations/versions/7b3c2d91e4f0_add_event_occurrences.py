@@ -0,0 +1,49 @@
+"""Add materialized event occurrences
+
+Revision ID: 7b3c2d91e4f0
+Revises: efdeec55507e
+Create Date: 2025-07-16 09:41:27.502113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3c2d91e4f0'
+down_revision = 'efdeec55507e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'event_occurrences',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('start_datetime', sa.DateTime(), nullable=False),
+        sa.Column('end_datetime', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_event_occurrences_event_start', 'event_occurrences', ['event_id', 'start_datetime'])
+    op.create_index('ix_event_occurrences_user_start', 'event_occurrences', ['user_id', 'start_datetime'])
+
+    # Existing series are materialized by the extend_occurrence_horizon job
+    with op.batch_alter_table('recurrence_rules', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('materialized_from', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('materialized_until', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_recurrence_rules_materialized_until', ['materialized_until'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('recurrence_rules', schema=None) as batch_op:
+        batch_op.drop_index('ix_recurrence_rules_materialized_until')
+        batch_op.drop_column('materialized_until')
+        batch_op.drop_column('materialized_from')
+
+    op.drop_index('ix_event_occurrences_user_start', table_name='event_occurrences')
+    op.drop_index('ix_event_occurrences_event_start', table_name='event_occurrences')
+    op.drop_table('event_occurrences')
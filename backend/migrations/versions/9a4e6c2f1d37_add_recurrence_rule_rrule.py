@@ -0,0 +1,27 @@
+"""Add canonical RRULE string to recurrence rules
+
+Revision ID: 9a4e6c2f1d37
+Revises: 5d0f3b6a8c21
+Create Date: 2025-07-24 10:12:48.315209
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4e6c2f1d37'
+down_revision = '5d0f3b6a8c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rules are expanded from their columns until they are next written
+    with op.batch_alter_table('recurrence_rules', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rrule', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('recurrence_rules', schema=None) as batch_op:
+        batch_op.drop_column('rrule')
@@ -0,0 +1,29 @@
+"""Add claim columns to reminders
+
+Revision ID: a7c2e9f40b18
+Revises: f3a8d5e17c94
+Create Date: 2025-07-30 11:02:37.914265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c2e9f40b18'
+down_revision = 'f3a8d5e17c94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMN, a batch copy of reminders would have to recreate the partial pending index
+    op.add_column('reminders', sa.Column('claim_token', sa.String(length=32), nullable=True))
+    op.add_column('reminders', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_reminders_claim_token'), 'reminders', ['claim_token'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_reminders_claim_token'), table_name='reminders')
+    op.drop_column('reminders', 'claimed_at')
+    op.drop_column('reminders', 'claim_token')
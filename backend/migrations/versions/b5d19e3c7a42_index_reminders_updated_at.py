@@ -0,0 +1,24 @@
+"""Index reminders by updated_at for the reminder engine
+
+Revision ID: b5d19e3c7a42
+Revises: a7c2e9f40b18
+Create Date: 2025-08-01 14:26:53.108734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d19e3c7a42'
+down_revision = 'a7c2e9f40b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_reminders_updated_at'), 'reminders', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_reminders_updated_at'), table_name='reminders')
@@ -0,0 +1,26 @@
+"""Add per-user calendar version for listing ETags
+
+Revision ID: c4e8a1f07b52
+Revises: 7b3c2d91e4f0
+Create Date: 2025-07-18 14:12:53.118405
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1f07b52'
+down_revision = '7b3c2d91e4f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('calendar_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('calendar_version')
@@ -0,0 +1,31 @@
+"""Add recurring occurrence exceptions
+
+Revision ID: e1b7c4d92a60
+Revises: 9a4e6c2f1d37
+Create Date: 2025-07-26 15:40:21.508113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1b7c4d92a60'
+down_revision = '9a4e6c2f1d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMN, a batch copy of events would drop the full-text search triggers
+    op.add_column('events', sa.Column('original_start_datetime', sa.DateTime(), nullable=True))
+    op.add_column('events', sa.Column('is_cancelled', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.create_index(
+        'ix_events_parent_original_start', 'events', ['parent_event_id', 'original_start_datetime'], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_events_parent_original_start', table_name='events')
+    op.drop_column('events', 'is_cancelled')
+    op.drop_column('events', 'original_start_datetime')
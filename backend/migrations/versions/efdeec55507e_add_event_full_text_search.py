@@ -0,0 +1,67 @@
+"""Add full-text search over event title and description
+
+Revision ID: efdeec55507e
+Revises: 38fe593a5606
+Create Date: 2025-07-14 18:02:11.640927
+
+"""
+from alembic import op
+from alembic import context
+
+
+# revision identifiers, used by Alembic.
+revision = 'efdeec55507e'
+down_revision = '38fe593a5606'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = context.get_impl().dialect.name
+
+    if dialect == 'postgresql':
+        # Generated column, PostgreSQL keeps it in sync on every write
+        op.execute(
+            "ALTER TABLE events ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED"
+        )
+        op.execute("CREATE INDEX ix_events_search_vector ON events USING gin (search_vector)")
+
+    elif dialect == 'sqlite':
+        # External-content FTS5 table synced by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE events_fts USING fts5("
+            "title, description, content='events', content_rowid='id', tokenize='unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER events_fts_insert AFTER INSERT ON events BEGIN "
+            "INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER events_fts_delete AFTER DELETE ON events BEGIN "
+            "INSERT INTO events_fts(events_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER events_fts_update AFTER UPDATE OF title, description ON events BEGIN "
+            "INSERT INTO events_fts(events_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+        )
+        # Index existing events
+        op.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = context.get_impl().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_events_search_vector")
+        op.execute("ALTER TABLE events DROP COLUMN IF EXISTS search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS events_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS events_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS events_fts_insert")
+        op.execute("DROP TABLE IF EXISTS events_fts")
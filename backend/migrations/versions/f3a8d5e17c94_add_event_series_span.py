@@ -0,0 +1,42 @@
+"""Add series span columns to events
+
+Revision ID: f3a8d5e17c94
+Revises: e1b7c4d92a60
+Create Date: 2025-07-28 09:31:05.672440
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8d5e17c94'
+down_revision = 'e1b7c4d92a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMN, a batch copy of events would drop the full-text search triggers
+    op.add_column('events', sa.Column('series_start', sa.DateTime(), nullable=True))
+    op.add_column('events', sa.Column('series_end', sa.DateTime(), nullable=True))
+    op.add_column('events', sa.Column('next_occurrence_at', sa.DateTime(), nullable=True))
+
+    # One-off events span their own times. Recurring series are left without
+    # an end, which keeps them in every listing after their start, until the
+    # next occurrence refresh job or a write computes their span.
+    op.execute(
+        "UPDATE events SET series_start = start_datetime, "
+        "series_end = CASE WHEN is_recurring THEN NULL ELSE COALESCE(end_datetime, start_datetime) END"
+    )
+
+    op.create_index('ix_events_user_series', 'events', ['user_id', 'series_end', 'series_start'])
+    op.create_index('ix_events_next_occurrence_at', 'events', ['next_occurrence_at'])
+
+
+def downgrade():
+    op.drop_index('ix_events_next_occurrence_at', table_name='events')
+    op.drop_index('ix_events_user_series', table_name='events')
+    op.drop_column('events', 'next_occurrence_at')
+    op.drop_column('events', 'series_end')
+    op.drop_column('events', 'series_start')
@@ -0,0 +1,7 @@
+#!/bin/bash
+
+# Reminder worker: runs reminders and maintenance jobs, start exactly one
+export FLASK_ENV=production
+export FLASK_APP="run.py:create_app('production')"
+
+exec flask reminder-worker
@@ -0,0 +1,115 @@
+import base64
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User
+
+
+class ChangeFeedTestCase(unittest.TestCase):
+    """Test case for the event change feed"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def create_event(self, title, **extra):
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': title, 'start_datetime': '2030-01-10T10:00:00Z', **extra
+        })
+        return json.loads(res.data.decode())['data']['id']
+
+    def changes(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        res = self.client.get('/api/events/changes', headers=self.headers, query_string=params)
+        return res, json.loads(res.data.decode())
+
+    def test_delta_sync(self):
+        """Test that only changes since the token are returned, with tombstones"""
+        kept = self.create_event('Kept')
+        token = self.changes()[1]['data']['sync_token']
+
+        edited = self.create_event('Draft')
+        removed = self.create_event('Cancelled')
+        self.client.put(f'/api/events/{edited}', headers=self.headers, json={'title': 'Final'})
+        self.client.delete(f'/api/events/{removed}', headers=self.headers)
+
+        res, result = self.changes(token)
+        self.assertEqual(res.status_code, 200)
+        data = result['data']
+        self.assertEqual([(e['id'], e['title']) for e in data['events']], [(edited, 'Final')])
+        self.assertEqual(data['deleted'], [removed])
+        self.assertFalse(data['has_more'])
+        self.assertNotIn(kept, [e['id'] for e in data['events']])
+
+        # Nothing new since the returned token
+        data = self.changes(data['sync_token'])[1]['data']
+        self.assertEqual((data['events'], data['deleted']), ([], []))
+
+    def test_bulk_routes_and_paging(self):
+        """Test that bulk writes are recorded and pages resume from the token"""
+        ids = [self.create_event(f'Event {i}') for i in range(3)]
+        token = self.changes()[1]['data']['sync_token']
+
+        self.client.post('/api/events/bulk/copy', headers=self.headers, json={'event_ids': ids})
+        self.client.put('/api/events/bulk/move', headers=self.headers, json={
+            'event_ids': ids, 'time_offset_minutes': 30
+        })
+        self.client.delete('/api/events/bulk-delete', headers=self.headers, json={'event_ids': ids[:2]})
+
+        seen, deleted = set(), []
+        while True:
+            data = self.changes(token, limit=4)[1]['data']
+            seen.update(e['id'] for e in data['events'])
+            deleted.extend(data['deleted'])
+            token = data['sync_token']
+            if not data['has_more']:
+                break
+
+        self.assertEqual(sorted(deleted), ids[:2])
+        self.assertIn(ids[2], seen)
+        self.assertEqual(len(seen - set(ids)), 3)
+
+    def test_category_update_marks_events(self):
+        """Test that renaming a category records its events as updated"""
+        res = self.client.post('/api/categories', headers=self.headers, json={'name': 'Work'})
+        category_id = json.loads(res.data.decode())['data']['category']['id']
+        event_id = self.create_event('Review', category_ids=[category_id])
+        token = self.changes()[1]['data']['sync_token']
+
+        self.client.put(f'/api/categories/{category_id}', headers=self.headers, json={'name': 'Office'})
+
+        events = self.changes(token)[1]['data']['events']
+        self.assertEqual([e['id'] for e in events], [event_id])
+        self.assertEqual(events[0]['categories'][0]['name'], 'Office')
+
+    def test_invalid_and_expired_tokens(self):
+        """Test that bad tokens are rejected and expired ones require a resync"""
+        self.assertEqual(self.changes('not-a-token')[0].status_code, 400)
+
+        expired = base64.urlsafe_b64encode(json.dumps({'s': 0, 't': 0}).encode()).decode().rstrip('=')
+        self.assertEqual(self.changes(expired)[0].status_code, 410)
+
+if __name__ == '__main__':
+    unittest.main()
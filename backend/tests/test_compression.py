@@ -0,0 +1,103 @@
+import gzip
+import json
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+from app import create_app, db
+from app.models import User, Event
+from app.utils.compression import compressed_bodies, negotiate_encoding
+
+
+class CompressionTestCase(unittest.TestCase):
+    """Test case for the response compression hook"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.app.config['COMPRESSION_ENABLED'] = True
+        self.app.config['COMPRESSION_ALGORITHMS'] = ['gzip']
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+        compressed_bodies.clear()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.flush()
+        start = datetime(2030, 1, 1, 9)
+        for idx in range(30):
+            db.session.add(Event(
+                user_id=user.id, title=f'Event {idx}', description='Repeated description ' * 5,
+                start_datetime=start + timedelta(days=idx), end_datetime=start + timedelta(days=idx, hours=1)
+            ))
+        db.session.commit()
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+        self.window = {'start': '2030-01-01T00:00:00Z', 'end': '2030-03-01T00:00:00Z'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        compressed_bodies.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, path, headers=None, **params):
+        return self.client.get(path, query_string=params, headers={**self.headers, **(headers or {})})
+
+    def test_gzip_listing_and_cache(self):
+        """Test that listings are gzipped, cached by ETag and still answer If-None-Match"""
+        plain = self.get('/api/events', **self.window)
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+        res = self.get('/api/events', headers={'Accept-Encoding': 'gzip'}, **self.window)
+        self.assertEqual(res.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', res.headers['Vary'])
+        self.assertLess(len(res.data), len(plain.data))
+        self.assertEqual(json.loads(gzip.decompress(res.data)), json.loads(plain.data))
+        self.assertTrue(res.headers['ETag'].startswith('W/'))
+
+        again = self.get('/api/events', headers={'Accept-Encoding': 'gzip'}, **self.window)
+        self.assertEqual(again.data, res.data)
+        self.assertEqual(compressed_bodies.stats()['hits'], 1)
+
+        cached = self.get('/api/events', headers={
+            'Accept-Encoding': 'gzip', 'If-None-Match': res.headers['ETag']
+        }, **self.window)
+        self.assertEqual(cached.status_code, 304)
+
+    def test_small_and_disabled_responses_are_not_compressed(self):
+        """Test the minimum size and the opt-in switch"""
+        res = self.get('/api/events/occurrence-cache', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', res.headers)
+
+        self.app.config['COMPRESSION_ENABLED'] = False
+        res = self.get('/api/events', headers={'Accept-Encoding': 'gzip'}, **self.window)
+        self.assertNotIn('Content-Encoding', res.headers)
+
+    def test_streamed_listing(self):
+        """Test that NDJSON streams are compressed chunk by chunk"""
+        plain = self.get('/api/events', stream='true', **self.window)
+        res = self.get('/api/events', headers={'Accept-Encoding': 'gzip'}, stream='true', **self.window)
+        self.assertEqual(res.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(res.data), plain.data)
+
+    def test_negotiation(self):
+        """Test that client quality values decide and q=0 refuses a coding"""
+        def accept(value):
+            return parse_accept_header(value, Accept)
+
+        self.assertEqual(negotiate_encoding(accept('gzip, deflate'), ['zstd', 'br', 'gzip']), 'gzip')
+        self.assertIsNone(negotiate_encoding(accept('gzip;q=0, identity'), ['gzip']))
+        self.assertIsNone(negotiate_encoding(accept(''), ['gzip']))
+
+
+if __name__ == '__main__':
+    unittest.main()
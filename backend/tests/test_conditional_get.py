@@ -0,0 +1,105 @@
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event as sa_event
+from app import create_app, db
+from app.models import User
+
+
+class ConditionalGetTestCase(unittest.TestCase):
+    """Test case for ETag / If-None-Match on the listing endpoints"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+        self.window = {'start': '2030-07-01T00:00:00Z', 'end': '2030-08-01T00:00:00Z'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, url, etag=None, **params):
+        headers = dict(self.headers)
+        if etag:
+            headers['If-None-Match'] = f'"{etag}"'
+        return self.client.get(url, headers=headers, query_string=params)
+
+    def create_event(self):
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Review', 'start_datetime': '2030-07-10T10:00:00Z'
+        })
+        return json.loads(res.data.decode())['data']['id']
+
+    def test_events_not_modified_without_query(self):
+        """Test that a current ETag gets 304 without reading the events table"""
+        self.create_event()
+        res = self.get('/api/events', **self.window)
+        etag = res.get_etag()[0]
+        self.assertEqual(res.status_code, 200)
+        self.assertIsNotNone(etag)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        db.session.remove()
+        sa_event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            res = self.get('/api/events', etag=etag, **self.window)
+        finally:
+            sa_event.remove(db.engine, 'before_cursor_execute', record)
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.get_etag()[0], etag)
+        self.assertEqual([s for s in statements if 'events' in s], [])
+
+        # Other query args produce another tag
+        self.assertEqual(self.get('/api/events', etag=etag, start='2030-06-01T00:00:00Z').status_code, 200)
+
+    def test_writes_change_the_tag(self):
+        """Test that event, reminder and category writes bump the calendar version"""
+        event_id = self.create_event()
+        etag = self.get('/api/events', **self.window).get_etag()[0]
+
+        self.client.post(f'/api/reminders/event/{event_id}/reminders', headers=self.headers, json={
+            'minutes_before': 15, 'notification_type': 'push'
+        })
+        res = self.get('/api/events', etag=etag, **self.window)
+        self.assertEqual(res.status_code, 200)
+        etag = res.get_etag()[0]
+
+        self.client.put(f'/api/events/{event_id}', headers=self.headers, json={'title': 'Retro'})
+        res = self.get('/api/events', etag=etag, **self.window)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(json.loads(res.data.decode())['data']['events'][0]['title'], 'Retro')
+
+    def test_categories_not_modified(self):
+        """Test conditional GET on the category listing"""
+        etag = self.get('/api/categories').get_etag()[0]
+        self.assertEqual(self.get('/api/categories', etag=etag).status_code, 304)
+
+        self.client.post('/api/categories', headers=self.headers, json={'name': 'Work'})
+        res = self.get('/api/categories', etag=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(json.loads(res.data.decode())['data']['categories']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
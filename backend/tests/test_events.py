@@ -0,0 +1,277 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event as sa_event
+from app import create_app, db
+from app.models import User, Event, Category, RecurrenceRule
+
+
+class EventListingTestCase(unittest.TestCase):
+    """Test case for the event listing endpoint"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(self.user)
+        db.session.commit()
+        self.user_id = self.user.id
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=self.user)}'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def add_event(self, title, start, end=None, rule=None):
+        event = Event(
+            user_id=self.user_id,
+            title=title,
+            start_datetime=start,
+            end_datetime=end,
+            is_recurring=rule is not None
+        )
+        db.session.add(event)
+        db.session.flush()
+        if rule:
+            db.session.add(RecurrenceRule(event_id=event.id, **rule))
+        db.session.commit()
+        return event
+
+    def get_events(self, **params):
+        res = self.client.get('/api/events', query_string=params, headers=self.headers)
+        return res, json.loads(res.data.decode())
+
+    def test_window_overlap(self):
+        """Test that one-off events are returned when they overlap the window"""
+        self.add_event('Before', datetime(2025, 1, 1, 9), datetime(2025, 1, 1, 10))
+        self.add_event('Spanning', datetime(2025, 1, 31, 22), datetime(2025, 2, 1, 2))
+        self.add_event('Inside', datetime(2025, 2, 10, 9))
+        self.add_event('After', datetime(2025, 3, 1, 9), datetime(2025, 3, 1, 10))
+
+        res, result = self.get_events(start='2025-02-01T00:00:00Z', end='2025-03-01T00:00:00Z')
+
+        self.assertEqual(res.status_code, 200)
+        titles = sorted(e['title'] for e in result['data']['events'])
+        self.assertEqual(titles, ['Inside', 'Spanning'])
+        self.assertEqual(result['data']['window']['start'], '2025-02-01T00:00:00Z')
+
+    def test_recurrence_expanded_inside_window_only(self):
+        """Test that recurring events are expanded only inside the window"""
+        self.add_event(
+            'Daily', datetime(2020, 1, 1, 9), datetime(2020, 1, 1, 10),
+            rule={'frequency': 'DAILY', 'interval': 1}
+        )
+
+        res, result = self.get_events(start='2025-02-01T00:00:00Z', end='2025-02-08T00:00:00Z')
+
+        self.assertEqual(res.status_code, 200)
+        starts = [e['start_datetime'] for e in result['data']['events']]
+        self.assertEqual(len(starts), 7)
+        self.assertEqual(min(starts), '2025-02-01T09:00:00Z')
+        self.assertEqual(max(starts), '2025-02-07T09:00:00Z')
+
+    def test_default_window_and_cap(self):
+        """Test the default window and the window span cap"""
+        self.add_event('Old', datetime.utcnow() - timedelta(days=400))
+        self.add_event('Soon', datetime.utcnow() + timedelta(days=1))
+
+        res, result = self.get_events()
+        titles = [e['title'] for e in result['data']['events']]
+        self.assertEqual(titles, ['Soon'])
+
+        res, result = self.get_events(start='2020-01-01T00:00:00Z', end='2030-01-01T00:00:00Z')
+        window = result['data']['window']
+        span = datetime.fromisoformat(window['end'][:-1]) - datetime.fromisoformat(window['start'][:-1])
+        self.assertEqual(span.days, self.app.config['EVENTS_MAX_WINDOW_DAYS'])
+
+    def count_queries(self, path, **params):
+        return len(self.capture_statements(path, **params))
+
+    def capture_statements(self, path, **params):
+        statements = []
+        # Start from an empty identity map so lazy loads would show up
+        db.session.remove()
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        sa_event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            res = self.client.get(path, query_string=params, headers=self.headers)
+        finally:
+            sa_event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(res.status_code, 200)
+        return statements
+
+    def add_categorized_events(self, count, category_id):
+        category = db.session.get(Category, category_id)
+        for idx in range(count):
+            event = self.add_event(
+                f'Event {idx}', datetime(2025, 2, 1 + idx % 20, 9), datetime(2025, 2, 1 + idx % 20, 10),
+                rule={'frequency': 'WEEKLY', 'interval': 1} if idx % 2 else None
+            )
+            event.categories = [category]
+        db.session.commit()
+
+    def test_listing_query_count_is_constant(self):
+        """Test that listings batch-load relationships instead of one query per row"""
+        category = Category(user_id=self.user_id, name='Work')
+        db.session.add(category)
+        db.session.commit()
+        category_id = category.id
+        window = {'start': '2025-02-01T00:00:00Z', 'end': '2025-03-01T00:00:00Z'}
+
+        self.add_categorized_events(4, category_id)
+        small_listing = self.count_queries('/api/events', **window)
+        small_category = self.count_queries(f'/api/categories/{category_id}/events')
+
+        self.add_categorized_events(40, category_id)
+        self.assertEqual(self.count_queries('/api/events', **window), small_listing)
+        self.assertEqual(self.count_queries(f'/api/categories/{category_id}/events'), small_category)
+
+    def test_cursor_pagination(self):
+        """Test that cursor pages walk every event exactly once without a count"""
+        for idx in range(7):
+            # Two events share each start time to exercise the id tie-breaker
+            self.add_event(f'Event {idx}', datetime(2025, 2, 1 + idx // 2, 9))
+
+        window = {'start': '2025-02-01T00:00:00Z', 'end': '2025-03-01T00:00:00Z'}
+        seen, cursor = [], ''
+        while cursor is not None:
+            res, result = self.get_events(cursor=cursor, per_page=3, **window)
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn('total', result['data']['pagination'])
+            seen.extend(e['id'] for e in result['data']['events'])
+            cursor = result['data']['pagination']['next_cursor']
+
+        res, result = self.get_events(**window)
+        self.assertEqual(seen, [e['id'] for e in result['data']['events']])
+
+        res, result = self.get_events(cursor='not-a-cursor', **window)
+        self.assertEqual(res.status_code, 400)
+
+    def test_occurrence_pagination(self):
+        """Test that occurrence cursors page the expanded listing in start order, per_page items at a time"""
+        for idx in range(4):
+            self.add_event(f'Event {idx}', datetime(2025, 2, 3 + idx * 5, 12), datetime(2025, 2, 3 + idx * 5, 13))
+        self.add_event('Daily', datetime(2020, 1, 1, 9), datetime(2020, 1, 1, 10),
+                       rule={'frequency': 'DAILY', 'interval': 1})
+        self.add_event('Weekly', datetime(2025, 1, 6, 12), datetime(2025, 1, 6, 13),
+                       rule={'frequency': 'WEEKLY', 'interval': 1, 'occurrence_count': 8})
+        window = {'start': '2025-02-01T00:00:00Z', 'end': '2025-03-01T00:00:00Z'}
+        _, listing = self.get_events(**window)
+        expected = sorted(listing['data']['events'], key=lambda e: (e['start_datetime'], str(e['id'])))
+
+        pages, cursor = [], ''
+        while cursor is not None:
+            res, result = self.get_events(occurrence_cursor=cursor, per_page=4, **window)
+            self.assertEqual(res.status_code, 200)
+            pages.append(result['data']['events'])
+            cursor = result['data']['pagination']['next_cursor']
+
+        self.assertTrue(all(len(page) == 4 for page in pages[:-1]))
+        seen = [e for page in pages for e in page]
+        self.assertEqual(len(seen), 28 + 4 + 4)
+        self.assertEqual([e['start_datetime'] for e in seen], sorted(e['start_datetime'] for e in seen))
+        self.assertEqual(sorted(seen, key=lambda e: (e['start_datetime'], str(e['id']))), expected)
+
+        res, _ = self.get_events(occurrence_cursor='not-a-cursor', **window)
+        self.assertEqual(res.status_code, 400)
+        res, _ = self.get_events(occurrence_cursor='', cursor='', **window)
+        self.assertEqual(res.status_code, 400)
+        res, result = self.get_events(occurrence_cursor='', per_page='ten', **window)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(result['message'], 'Invalid per_page')
+
+    def test_ndjson_stream_matches_listing(self):
+        """Test that a streamed listing returns the same items as the JSON listing"""
+        self.app.config['EVENTS_STREAM_BATCH_SIZE'] = 2
+        for idx in range(5):
+            self.add_event(f'Event {idx}', datetime(2025, 2, 1 + idx, 9), datetime(2025, 2, 1 + idx, 10))
+        self.add_event(
+            'Weekly', datetime(2025, 1, 6, 18), datetime(2025, 1, 6, 19),
+            rule={'frequency': 'WEEKLY', 'interval': 1}
+        )
+        window = {'start': '2025-02-01T00:00:00Z', 'end': '2025-03-01T00:00:00Z'}
+        _, listing = self.get_events(**window)
+
+        res = self.client.get('/api/events', query_string=window,
+                              headers={**self.headers, 'Accept': 'application/x-ndjson'})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, 'application/x-ndjson')
+        self.assertEqual(res.headers['X-Window-Start'], '2025-02-01T00:00:00Z')
+        streamed = [json.loads(line) for line in res.data.decode().splitlines()]
+        self.assertEqual(streamed, listing['data']['events'])
+
+        # Same args, different representation, different ETag
+        self.assertNotEqual(res.headers['ETag'], self.get_events(**window)[0].headers['ETag'])
+
+        res = self.client.get('/api/events', query_string={**window, 'stream': 'true', 'per_page': 2},
+                              headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+
+    def test_sparse_fieldset(self):
+        """Test that fields= trims the output and skips unselected columns and relationships"""
+        category = Category(user_id=self.user_id, name='Work')
+        db.session.add(category)
+        db.session.commit()
+        self.add_categorized_events(4, category.id)
+        params = {
+            'start': '2025-02-01T00:00:00Z', 'end': '2025-03-01T00:00:00Z',
+            'fields': 'title,start_datetime,end_datetime,color'
+        }
+
+        statements = self.capture_statements('/api/events', **params)
+        self.assertFalse(any('description' in s for s in statements))
+        self.assertFalse(any('event_categories' in s for s in statements))
+
+        res, result = self.get_events(**params)
+        events = result['data']['events']
+        self.assertTrue(events)
+        for item in events:
+            self.assertEqual(set(item), {'id', 'title', 'start_datetime', 'end_datetime', 'color'})
+
+        res, result = self.get_events(fields='title,colour')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('colour', result['message'])
+
+    def test_rule_writes_store_rrule(self):
+        """Test that creating and updating a series stores its canonical RRULE"""
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Standup', 'start_datetime': '2025-02-03T09:00:00Z', 'end_datetime': '2025-02-03T09:15:00Z',
+            'recurrence_rule': {'frequency': 'WEEKLY', 'days_of_week': ['WED', 'MON'], 'occurrence_count': 10}
+        })
+        self.assertEqual(res.status_code, 201)
+        event_id = json.loads(res.data.decode())['data']['id']
+        rule = RecurrenceRule.query.filter_by(event_id=event_id).one()
+        self.assertEqual(rule.rrule, 'FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,WE;COUNT=10')
+
+        res = self.client.put(f'/api/events/{event_id}', headers=self.headers, json={
+            'recurrence_rule': {'frequency': 'MONTHLY', 'interval': 2, 'day_of_month': 3}
+        })
+        self.assertEqual(res.status_code, 200)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(RecurrenceRule, rule.id).rrule, 'FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=3')
+
+    def test_invalid_window(self):
+        """Test that an inverted window is rejected"""
+        res, result = self.get_events(start='2025-02-01T00:00:00Z', end='2025-01-01T00:00:00Z')
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(result['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+from app.utils.notification_dispatcher import NotificationDispatcher
+
+
+class NotificationDispatcherTestCase(unittest.TestCase):
+    """Test case for sending notifications on per-channel pools"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.dispatcher = NotificationDispatcher()
+        self.lock = threading.Lock()
+        self.running = {'email': 0, 'push': 0, 'sms': 0}
+        self.peak = dict(self.running)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.dispatcher.shutdown()
+
+    def slow_send(self, channel, seconds, result=True):
+        with self.lock:
+            self.running[channel] += 1
+            self.peak[channel] = max(self.peak[channel], self.running[channel])
+        time.sleep(seconds)
+        with self.lock:
+            self.running[channel] -= 1
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def notification(self, reminder_id, channel, seconds=0.1, result=True):
+        return reminder_id, channel, self.slow_send, (channel, seconds, result)
+
+    def test_per_channel_concurrency(self):
+        """Test that each channel sends concurrently up to its own limit"""
+        self.dispatcher.configure({'email': 3, 'push': 5, 'sms': 1}, queue_size=50, timeout=5)
+        notifications = [self.notification(i, 'email') for i in range(6)]
+        notifications += [self.notification(10 + i, 'push') for i in range(5)]
+
+        start = time.monotonic()
+        sent, failed, timed_out = self.dispatcher.dispatch(notifications)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(sent), list(range(6)) + list(range(10, 15)))
+        self.assertEqual((failed, timed_out), ([], []))
+        self.assertEqual(self.peak['email'], 3)
+        self.assertEqual(self.peak['push'], 5)
+        # Two rounds of email, the push sends run beside them
+        self.assertLess(elapsed, 0.5)
+
+    def test_queue_bound(self):
+        """Test that no more sends than the queue size are queued or running"""
+        self.dispatcher.configure({'email': 10, 'push': 10, 'sms': 10}, queue_size=2, timeout=5)
+        notifications = [self.notification(i, 'email', 0.05) for i in range(6)]
+
+        sent, _, _ = self.dispatcher.dispatch(notifications)
+        self.assertEqual(sorted(sent), list(range(6)))
+        self.assertEqual(self.peak['email'], 2)
+
+    def test_failures_and_timeouts(self):
+        """Test that failed sends are reported and slow sends are given up on"""
+        self.dispatcher.configure({'email': 2, 'push': 2, 'sms': 2}, queue_size=10, timeout=0.3)
+        notifications = [
+            self.notification(1, 'email'),
+            self.notification(2, 'email', result=False),
+            self.notification(3, 'sms', result=RuntimeError('gateway down')),
+            self.notification(4, 'push', seconds=2),
+        ]
+
+        start = time.monotonic()
+        sent, failed, timed_out = self.dispatcher.dispatch(notifications)
+        self.assertLess(time.monotonic() - start, 1)
+
+        self.assertEqual(sent, [1])
+        self.assertEqual(sorted(failed), [2, 3])
+        self.assertEqual(timed_out, [4])
+
+
+if __name__ == '__main__':
+    unittest.main()
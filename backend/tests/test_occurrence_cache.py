@@ -0,0 +1,181 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Category, Event, RecurrenceRule
+from app.utils.recurrence import OccurrenceCache, RecurrenceGenerator
+
+
+class OccurrenceCacheTestCase(unittest.TestCase):
+    """Test case for the LRU cache itself"""
+
+    def occurrences(self, count):
+        return [{'id': f'1_{i}', 'title': 'x' * 10} for i in range(count)]
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = OccurrenceCache(max_entries=2)
+        cache.put((1, 'a'), 1, self.occurrences(1))
+        cache.put((2, 'a'), 1, self.occurrences(1))
+        cache.get((1, 'a'))
+        cache.put((3, 'a'), 1, self.occurrences(1))
+
+        self.assertIsNotNone(cache.get((1, 'a')))
+        self.assertIsNone(cache.get((2, 'a')))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_eviction_by_size(self):
+        """Test that the byte limit is enforced and oversized lists are not cached"""
+        entry_size = OccurrenceCache._estimate_size(self.occurrences(10))
+        cache = OccurrenceCache(max_bytes=entry_size * 2)
+        for event_id in range(3):
+            cache.put((event_id, 'a'), 1, self.occurrences(10))
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertLessEqual(stats['bytes'], entry_size * 2)
+
+        cache.put((9, 'a'), 1, self.occurrences(100))
+        self.assertIsNone(cache.get((9, 'a')))
+
+    def test_invalidation(self):
+        """Test invalidation by series and by user"""
+        cache = OccurrenceCache()
+        cache.put((1, 'a'), 1, self.occurrences(1))
+        cache.put((1, 'b'), 1, self.occurrences(1))
+        cache.put((2, 'a'), 1, self.occurrences(1))
+        cache.put((3, 'a'), 2, self.occurrences(1))
+
+        cache.invalidate_events([1])
+        self.assertEqual(cache.stats()['entries'], 2)
+
+        cache.invalidate_user(1)
+        self.assertIsNone(cache.get((2, 'a')))
+        self.assertIsNotNone(cache.get((3, 'a')))
+        self.assertEqual(cache.stats()['bytes'], OccurrenceCache._estimate_size(self.occurrences(1)))
+
+
+class OccurrenceCacheListingTestCase(unittest.TestCase):
+    """Test case for the occurrence cache behind the event listing"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+        RecurrenceGenerator.cache.clear()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        RecurrenceGenerator.cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def stats(self):
+        res = self.client.get('/api/events/occurrence-cache', headers=self.headers)
+        return json.loads(res.data.decode())['data']
+
+    def list_events(self):
+        res = self.client.get('/api/events', headers=self.headers, query_string={
+            'start': '2025-03-01T00:00:00Z', 'end': '2025-04-01T00:00:00Z'
+        })
+        return json.loads(res.data.decode())['data']['events']
+
+    def test_polling_hits_until_series_changes(self):
+        """Test that repeated listings hit the cache and writes invalidate it"""
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Gym',
+            'start_datetime': '2025-01-06T18:00:00Z',
+            'end_datetime': '2025-01-06T19:00:00Z',
+            'recurrence_rule': {'frequency': 'WEEKLY', 'interval': 1}
+        })
+        event_id = json.loads(res.data.decode())['data']['id']
+
+        first = self.list_events()
+        second = self.list_events()
+        self.assertEqual(first, second)
+        before = self.stats()
+        self.assertEqual((before['hits'], before['misses']), (1, 1))
+
+        self.client.put(f'/api/events/{event_id}', headers=self.headers, json={'title': 'Swim'})
+        self.assertEqual(self.stats()['entries'], 0)
+
+        titles = {e['title'] for e in self.list_events()}
+        self.assertEqual(titles, {'Swim'})
+        after = self.stats()
+        self.assertEqual((after['hits'], after['misses']), (1, 2))
+
+    def test_default_window_polling_hits(self):
+        """Test that listings without a window share the default window's cache entry"""
+        self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Gym',
+            'start_datetime': '2025-01-06T18:00:00Z',
+            'recurrence_rule': {'frequency': 'WEEKLY', 'interval': 1}
+        })
+
+        first = self.client.get('/api/events', headers=self.headers)
+        second = self.client.get('/api/events', headers=self.headers)
+        self.assertEqual(
+            json.loads(first.data.decode())['data']['window'], json.loads(second.data.decode())['data']['window']
+        )
+        stats = self.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_category_update_invalidates_user(self):
+        """Test that renaming a category drops the user's cached occurrences"""
+        res = self.client.post('/api/categories', headers=self.headers, json={'name': 'Health'})
+        category_id = json.loads(res.data.decode())['data']['category']['id']
+        self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Gym',
+            'start_datetime': '2025-01-06T18:00:00Z',
+            'recurrence_rule': {'frequency': 'WEEKLY', 'interval': 1},
+            'category_ids': [category_id]
+        })
+        self.list_events()
+
+        self.client.put(f'/api/categories/{category_id}', headers=self.headers, json={'name': 'Fitness'})
+
+        names = {e['categories'][0]['name'] for e in self.list_events()}
+        self.assertEqual(names, {'Fitness'})
+
+
+    def test_category_renamed_by_another_process(self):
+        """Test that a category rename that did not invalidate this process's cache is listed"""
+        res = self.client.post('/api/categories', headers=self.headers, json={'name': 'Work'})
+        category_id = json.loads(res.data.decode())['data']['category']['id']
+        # Rows added directly, event creation is rate limited across the suite
+        category = db.session.get(Category, category_id)
+        event = Event(user_id=category.user_id, title='Standup', start_datetime=datetime(2025, 1, 6, 9),
+                      is_recurring=True, categories=[category])
+        event.recurrence_rule = RecurrenceRule(frequency='WEEKLY', interval=1)
+        db.session.add(event)
+        db.session.commit()
+        self.list_events()
+        self.assertEqual(self.stats()['entries'], 1)
+
+        # As the category route of another worker would, without touching this cache
+        category = db.session.get(Category, category_id)
+        category.name = 'Personal'
+        category.updated_at = category.updated_at + timedelta(seconds=1)
+        db.session.commit()
+
+        names = {e['categories'][0]['name'] for e in self.list_events()}
+        self.assertEqual(names, {'Personal'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event as sa_event
+from app import create_app, db
+from app.models import User, Event, RecurrenceRule
+
+
+class OccurrenceOverridesTestCase(unittest.TestCase):
+    """Test case for cancelled and changed occurrences of recurring events"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+
+        # Mondays 09:00-10:00 from 2025-02-03, ten times
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Standup', 'start_datetime': '2025-02-03T09:00:00Z', 'end_datetime': '2025-02-03T10:00:00Z',
+            'recurrence_rule': {'frequency': 'WEEKLY', 'days_of_week': ['MON'], 'occurrence_count': 10}
+        })
+        self.event_id = json.loads(res.data.decode())['data']['id']
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def listing(self, start='2025-02-01T00:00:00Z', end='2025-03-01T00:00:00Z'):
+        res = self.client.get('/api/events', query_string={'start': start, 'end': end}, headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        return [(e['start_datetime'], e['title']) for e in json.loads(res.data.decode())['data']['events']]
+
+    def occurrence(self, method, start, **body):
+        res = self.client.open(f'/api/events/{self.event_id}/occurrences/{start}', method=method,
+                               headers=self.headers, json=body or None)
+        return res, json.loads(res.data.decode())
+
+    def test_change_and_cancel(self):
+        """Test that listings merge changed, moved-in and cancelled occurrences"""
+        res, result = self.occurrence(
+            'PUT', '2025-02-10T09:00:00Z', title='Moved', start_datetime='2025-02-11T14:00:00Z'
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(result['data']['id'], f'{self.event_id}_20250210_090000')
+        self.assertEqual(result['data']['end_datetime'], '2025-02-11T15:00:00Z')
+        self.assertEqual(result['data']['parent_event_id'], self.event_id)
+
+        res, _ = self.occurrence('DELETE', '2025-02-17T09:00:00Z')
+        self.assertEqual(res.status_code, 200)
+
+        # The March 3rd occurrence moves into February
+        self.occurrence('PUT', '2025-03-03T09:00:00Z', start_datetime='2025-02-28T09:00:00Z')
+
+        self.assertEqual(sorted(self.listing()), [
+            ('2025-02-03T09:00:00Z', 'Standup'),
+            ('2025-02-11T14:00:00Z', 'Moved'),
+            ('2025-02-24T09:00:00Z', 'Standup'),
+            ('2025-02-28T09:00:00Z', 'Standup'),
+        ])
+        march = self.listing('2025-03-01T00:00:00Z', '2025-04-01T00:00:00Z')
+        self.assertNotIn(('2025-03-03T09:00:00Z', 'Standup'), march)
+
+        # Occurrence pages apply the same exceptions, moved occurrences at their new start
+        res = self.client.get('/api/events', headers=self.headers, query_string={
+            'start': '2025-02-01T00:00:00Z', 'end': '2025-03-01T00:00:00Z', 'occurrence_cursor': '', 'per_page': 10
+        })
+        paged = [(e['start_datetime'], e['title']) for e in json.loads(res.data.decode())['data']['events']]
+        self.assertEqual(paged, sorted(self.listing()))
+
+        # Updating a cancelled occurrence restores it
+        res, _ = self.occurrence('PUT', '2025-02-17T09:00:00Z', title='Back')
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(('2025-02-17T09:00:00Z', 'Back'), self.listing())
+
+        res, _ = self.occurrence('PUT', '2025-02-18T09:00:00Z', title='Nope')
+        self.assertEqual(res.status_code, 404)
+
+    def test_exceptions_are_loaded_in_one_query(self):
+        """Test that the number of listing queries does not grow with exceptions"""
+        def count_queries():
+            statements = []
+            db.session.remove()
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            sa_event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                self.listing('2025-02-01T00:00:00Z', '2025-05-01T00:00:00Z')
+            finally:
+                sa_event.remove(db.engine, 'before_cursor_execute', listener)
+            return len(statements)
+
+        self.occurrence('DELETE', '2025-02-10T09:00:00Z')
+        few = count_queries()
+        for day in ('2025-02-17', '2025-02-24', '2025-03-03', '2025-03-10'):
+            self.occurrence('PUT', f'{day}T09:00:00Z', title='Changed')
+        self.assertEqual(count_queries(), few)
+
+    def test_this_and_following(self):
+        """Test that a split ends the series and moves later exceptions to the new one"""
+        self.occurrence('PUT', '2025-03-03T09:00:00Z', title='Special')
+
+        res = self.client.post(f'/api/events/{self.event_id}/split', headers=self.headers, json={
+            'occurrence_start': '2025-02-24T09:00:00Z', 'title': 'Weekly sync'
+        })
+        self.assertEqual(res.status_code, 201)
+        following_id = json.loads(res.data.decode())['data']['following']['id']
+
+        self.assertEqual(db.session.get(RecurrenceRule, self.event_id).occurrence_count, 3)
+        self.assertEqual(RecurrenceRule.query.filter_by(event_id=following_id).one().occurrence_count, 7)
+        self.assertEqual(sorted(self.listing('2025-02-01T00:00:00Z', '2025-03-11T00:00:00Z')), [
+            ('2025-02-03T09:00:00Z', 'Standup'),
+            ('2025-02-10T09:00:00Z', 'Standup'),
+            ('2025-02-17T09:00:00Z', 'Standup'),
+            ('2025-02-24T09:00:00Z', 'Weekly sync'),
+            ('2025-03-03T09:00:00Z', 'Special'),
+            ('2025-03-10T09:00:00Z', 'Weekly sync'),
+        ])
+
+        # New times for the rest of the new series discard its exceptions
+        res = self.client.post(f'/api/events/{following_id}/split', headers=self.headers, json={
+            'occurrence_start': '2025-03-03T09:00:00Z', 'start_datetime': '2025-03-04T09:00:00Z'
+        })
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(Event.query.filter(Event.parent_event_id.isnot(None)).count(), 0)
+
+        res = self.client.post(f'/api/events/{self.event_id}/split', headers=self.headers, json={
+            'occurrence_start': '2025-02-03T09:00:00Z'
+        })
+        self.assertEqual(res.status_code, 400)
+
+    def test_series_writes_discard_exceptions(self):
+        """Test that moving or deleting a series removes its exceptions"""
+        self.occurrence('DELETE', '2025-02-10T09:00:00Z')
+        res = self.client.put(f'/api/events/{self.event_id}/move', headers=self.headers,
+                              json={'start_datetime': '2025-02-04T09:00:00Z'})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(Event.query.filter(Event.parent_event_id.isnot(None)).count(), 0)
+
+        self.occurrence('PUT', '2025-02-11T09:00:00Z', title='Changed')
+        res = self.client.delete(f'/api/events/{self.event_id}', headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(Event.query.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
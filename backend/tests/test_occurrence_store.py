@@ -0,0 +1,159 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event, EventOccurrence, RecurrenceRule
+from app.utils.occurrence_store import OccurrenceStore
+from app.utils.recurrence import RecurrenceGenerator
+
+
+def iso(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class OccurrenceStoreTestCase(unittest.TestCase):
+    """Test case for materialized occurrences of recurring events"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+        self.start = datetime.utcnow().replace(microsecond=0) - timedelta(days=10)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def create_daily_event(self):
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Standup',
+            'start_datetime': iso(self.start),
+            'end_datetime': iso(self.start + timedelta(minutes=15)),
+            'recurrence_rule': {'frequency': 'DAILY', 'interval': 1}
+        })
+        self.assertEqual(res.status_code, 201)
+        return json.loads(res.data.decode())['data']['id']
+
+    def stored_starts(self, event_id):
+        return [
+            row.start_datetime for row in
+            EventOccurrence.query.filter_by(event_id=event_id).order_by(EventOccurrence.start_datetime)
+        ]
+
+    def get_events(self, start, end):
+        res = self.client.get('/api/events', headers=self.headers, query_string={'start': iso(start), 'end': iso(end)})
+        return json.loads(res.data.decode())['data']['events']
+
+    def test_rows_follow_series_writes(self):
+        """Test that creating, updating and deleting a series rebuilds its rows"""
+        event_id = self.create_daily_event()
+
+        rule = RecurrenceRule.query.filter_by(event_id=event_id).first()
+        starts = self.stored_starts(event_id)
+        self.assertEqual(starts[0], self.start)
+        self.assertLess(starts[-1], rule.materialized_until)
+        self.assertGreater(starts[-1], rule.materialized_until - timedelta(days=1))
+
+        res = self.client.put(f'/api/events/{event_id}', headers=self.headers, json={
+            'recurrence_rule': {'frequency': 'WEEKLY', 'interval': 1}
+        })
+        self.assertEqual(res.status_code, 200)
+        starts = self.stored_starts(event_id)
+        self.assertEqual(starts[1] - starts[0], timedelta(weeks=1))
+
+        res = self.client.put(f'/api/events/{event_id}/move', headers=self.headers, json={
+            'start_datetime': iso(self.start + timedelta(hours=2))
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.stored_starts(event_id)[0], self.start + timedelta(hours=2))
+
+        res = self.client.delete(f'/api/events/{event_id}', headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(EventOccurrence.query.count(), 0)
+
+    def test_listing_matches_live_expansion(self):
+        """Test that stored and live occurrences agree, inside and outside the stored range"""
+        event_id = self.create_daily_event()
+        window_start = self.start + timedelta(days=3, hours=5)
+        window_end = self.start + timedelta(days=40)
+
+        stored = self.get_events(window_start, window_end)
+
+        event = db.session.get(Event, event_id)
+        self.assertIn(event_id, OccurrenceStore.load([event], window_start, window_end, 1000))
+        live = RecurrenceGenerator.generate_occurrences(event, event.recurrence_rule, window_start, window_end)
+        self.assertEqual([e['id'] for e in stored], [o['id'] for o in live])
+
+        # Outside the stored range the series is expanded live
+        old = self.get_events(self.start - timedelta(days=365), self.start + timedelta(days=2))
+        self.assertEqual(len(old), 2)
+
+    def test_occurrence_running_at_range_start(self):
+        """Test that an occurrence started before the stored range but still running is stored"""
+        history = timedelta(days=self.app.config['OCCURRENCE_HISTORY_DAYS'])
+        start = datetime.utcnow().replace(microsecond=0) - history - timedelta(days=1)
+        res = self.client.post('/api/events', headers=self.headers, json={
+            'title': 'Conference',
+            'start_datetime': iso(start),
+            'end_datetime': iso(start + timedelta(days=3)),
+            'recurrence_rule': {'frequency': 'WEEKLY', 'interval': 1}
+        })
+        event_id = json.loads(res.data.decode())['data']['id']
+
+        event = db.session.get(Event, event_id)
+        window_start = event.recurrence_rule.materialized_from + timedelta(hours=1)
+        window_end = window_start + timedelta(days=14)
+        stored = OccurrenceStore.load([event], window_start, window_end, 1000)[event_id]
+        live = RecurrenceGenerator.generate_occurrences(event, event.recurrence_rule, window_start, window_end)
+        self.assertEqual([o['id'] for o in stored], [o['id'] for o in live])
+        self.assertEqual(stored[0]['start_datetime'], start)
+
+    def test_extend_horizon(self):
+        """Test that the background job materializes new series and moves the range forward"""
+        event = Event(
+            user_id=self.user_id, title='Imported', start_datetime=self.start,
+            end_datetime=self.start + timedelta(hours=1), is_recurring=True
+        )
+        db.session.add(event)
+        db.session.flush()
+        db.session.add(RecurrenceRule(event_id=event.id, frequency='DAILY', interval=1))
+        db.session.commit()
+        event_id = event.id
+
+        self.assertEqual(OccurrenceStore.extend_horizon(), 1)
+        self.assertGreater(len(self.stored_starts(event_id)), 400)
+
+        # Nothing to do while the range is current
+        self.assertEqual(OccurrenceStore.extend_horizon(), 0)
+
+        later = datetime.utcnow() + timedelta(days=100)
+        self.assertEqual(OccurrenceStore.extend_horizon(now=later), 1)
+
+        # Old rows trimmed, new ones appended without gaps or duplicates
+        starts = self.stored_starts(event_id)
+        rule = RecurrenceRule.query.filter_by(event_id=event_id).first()
+        self.assertGreater(starts[0] + timedelta(hours=1), rule.materialized_from)
+        self.assertGreater(starts[0], self.start)
+        self.assertGreater(starts[-1], later + timedelta(days=399))
+        self.assertTrue(all(b - a == timedelta(days=1) for a, b in zip(starts, starts[1:])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, select, text
+from app import create_app, db
+from app.models import (
+    Event, Reminder, Category, RecurrenceRule, EventOccurrence, EventChange, event_categories,
+    EmailVerificationToken, PasswordResetToken
+)
+from app.utils.event_queries import filter_events_in_window
+
+# Set to a disposable PostgreSQL database URL to also check PostgreSQL plans
+POSTGRES_URL = os.getenv('TEST_POSTGRES_URL')
+
+
+def hot_queries():
+    """The statements issued on every listing request and scheduler tick"""
+    now = datetime(2025, 7, 1, 12, 0)
+    window_end = datetime(2025, 8, 1)
+
+    return {
+        'event_listing': filter_events_in_window(
+            select(Event).where(Event.user_id == 1), now, window_end
+        ).order_by(Event.start_datetime.desc(), Event.id.desc()),
+        'event_keyset_page': select(Event).where(
+            Event.user_id == 1, Event.start_datetime < now
+        ).order_by(Event.start_datetime.desc(), Event.id.desc()).limit(50),
+        'events_by_recurrence_id': select(Event).where(Event.recurrence_id == 'abc'),
+        'due_reminders': select(Reminder).where(
+            Reminder.reminder_time <= now, Reminder.notification_sent == False
+        ),
+        'reminders_by_event': select(Reminder).where(Reminder.event_id == 1),
+        'claimed_reminders': select(Reminder).where(Reminder.claim_token == 'abc'),
+        'reminders_written_since': select(Reminder.id, Reminder.reminder_time).where(Reminder.updated_at >= now),
+        'recurrence_rules_by_event': select(RecurrenceRule).where(RecurrenceRule.event_id.in_([1, 2, 3])),
+        'stored_occurrences': select(EventOccurrence).where(
+            EventOccurrence.event_id.in_([1, 2, 3]), EventOccurrence.start_datetime < window_end,
+            EventOccurrence.end_datetime > now
+        ).order_by(EventOccurrence.event_id, EventOccurrence.start_datetime),
+        'event_changes_since': select(EventChange).where(
+            EventChange.user_id == 1, EventChange.id > 100
+        ).order_by(EventChange.id).limit(500),
+        'expired_event_changes': select(EventChange).where(EventChange.changed_at < now),
+        'stale_occurrence_ranges': select(RecurrenceRule).where(RecurrenceRule.materialized_until < now),
+        'passed_next_occurrences': select(Event).where(Event.next_occurrence_at < now),
+        'events_by_category': select(event_categories.c.event_id).where(event_categories.c.category_id == 1),
+        'categories_by_user': select(Category).where(Category.user_id == 1),
+        'expired_email_tokens': select(EmailVerificationToken).where(EmailVerificationToken.expires_at < now),
+        'expired_reset_tokens': select(PasswordResetToken).where(PasswordResetToken.expires_at < now),
+    }
+
+
+def compile_literal(stmt, dialect):
+    return str(stmt.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+
+class SQLiteQueryPlanTestCase(unittest.TestCase):
+    """Fail if a hot query falls back to a full table scan on SQLite"""
+
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_hot_queries_use_indexes(self):
+        connection = db.session.connection()
+        for name, stmt in hot_queries().items():
+            with self.subTest(query=name):
+                sql = compile_literal(stmt, db.engine.dialect)
+                plan = [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql)]
+                # "SCAN <table>" without an index is a full table scan
+                full_scans = [step for step in plan if step.startswith('SCAN') and 'INDEX' not in step]
+                self.assertEqual(full_scans, [], f"{name} plan: {plan}")
+
+
+@unittest.skipUnless(POSTGRES_URL, "TEST_POSTGRES_URL is not set")
+class PostgreSQLQueryPlanTestCase(unittest.TestCase):
+    """Fail if a hot query falls back to a sequential scan on PostgreSQL"""
+
+    def setUp(self):
+        self.engine = create_engine(POSTGRES_URL)
+        db.metadata.create_all(self.engine)
+
+    def tearDown(self):
+        db.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def seq_scans(self, node):
+        found = [node['Relation Name']] if node['Node Type'] == 'Seq Scan' else []
+        for child in node.get('Plans', []):
+            found.extend(self.seq_scans(child))
+        return found
+
+    def test_hot_queries_use_indexes(self):
+        with self.engine.connect() as connection:
+            # Empty tables make a seq scan the cheapest plan, so only allow it
+            # when no index can serve the query at all
+            connection.execute(text('SET enable_seqscan = off'))
+            for name, stmt in hot_queries().items():
+                with self.subTest(query=name):
+                    sql = compile_literal(stmt, self.engine.dialect)
+                    plan = connection.execute(text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    self.assertEqual(self.seq_scans(plan[0]['Plan']), [], f"{name} plan: {plan}")
+
+
+if __name__ == '__main__':
+    unittest.main()
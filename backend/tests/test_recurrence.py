@@ -0,0 +1,298 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from itertools import count, islice, takewhile
+from types import SimpleNamespace
+from dateutil.rrule import rrulestr
+from app.utils.recurrence import HAS_NUMPY, RecurrenceGenerator
+
+
+class IterOccurrencesTestCase(unittest.TestCase):
+    """Test case for the lazy occurrence iterator"""
+
+    rule_ids = count(1)
+
+    def series(self, frequency='DAILY', **rule):
+        start = datetime(2025, 1, 6, 18, 0)
+        event = SimpleNamespace(
+            id=1, title='Gym', description=None, start_datetime=start, end_datetime=start + timedelta(hours=1),
+            is_all_day=False, color='blue', recurrence_id=None, created_at=start, updated_at=start, categories=[]
+        )
+        # Compiled rules are cached by rule id, every series gets its own
+        fields = dict(
+            id=next(self.rule_ids), frequency=frequency, interval=1, days_of_week=None, day_of_month=None, week_of_month=None,
+            day_of_week=None, end_date=None, occurrence_count=None, updated_at=start
+        )
+        fields.update(rule)
+        return event, SimpleNamespace(**fields)
+
+    def test_endless_series_is_expanded_on_demand(self):
+        """Test that callers can take the next few occurrences of a series without an end"""
+        event, rule = self.series()
+        records = RecurrenceGenerator.iter_occurrences(event, rule, datetime(2030, 1, 1))
+
+        upcoming = list(islice(records, 3))
+        self.assertEqual([r.start_datetime for r in upcoming],
+                         [datetime(2030, 1, d, 18) for d in (1, 2, 3)])
+        self.assertEqual(upcoming[0].end_datetime, datetime(2030, 1, 1, 19))
+        self.assertEqual(upcoming[0].event_id, 1)
+
+    def test_matches_generate_occurrences(self):
+        """Test that the iterator and the list API agree on a window"""
+        event, rule = self.series('WEEKLY', days_of_week='MON,THU')
+        window = (datetime(2025, 3, 1), datetime(2025, 5, 1))
+
+        records = list(RecurrenceGenerator.iter_occurrences(event, rule, *window))
+        occurrences = RecurrenceGenerator.generate_occurrences(event, rule, *window)
+        self.assertEqual([r.start_datetime for r in records], [o['start_datetime'] for o in occurrences])
+
+    def test_monthly_nth_weekday(self):
+        """Test monthly rules on the nth or last weekday of the month"""
+        event, rule = self.series('MONTHLY', week_of_month=2, day_of_week='MON', occurrence_count=3)
+        starts = [r.start_datetime for r in RecurrenceGenerator.iter_occurrences(event, rule, event.start_datetime)]
+        self.assertEqual(starts, [datetime(2025, 1, 13, 18), datetime(2025, 2, 10, 18), datetime(2025, 3, 10, 18)])
+
+        event, rule = self.series('MONTHLY', week_of_month=5, day_of_week='FRI', occurrence_count=1)
+        records = RecurrenceGenerator.iter_occurrences(event, rule, event.start_datetime)
+        self.assertEqual(next(records).start_datetime, datetime(2025, 1, 31, 18))
+
+
+class SkipAheadTestCase(unittest.TestCase):
+    """Test case for expanding far-future windows without iterating from the series start"""
+
+    def series(self, start, duration, **rule):
+        event = SimpleNamespace(
+            id=1, title='Standup', description=None, start_datetime=start,
+            end_datetime=start + duration if duration else None, is_all_day=False, color='blue',
+            recurrence_id=None, created_at=start, updated_at=start, categories=[]
+        )
+        fields = dict(
+            frequency='DAILY', interval=1, days_of_week=None, day_of_month=None, week_of_month=None,
+            day_of_week=None, end_date=None, occurrence_count=None
+        )
+        fields.update(rule)
+        return event, SimpleNamespace(**fields)
+
+    def reference(self, event, rule, window_start, window_end):
+        """Expand from the first occurrence and filter, as before skipping ahead"""
+        result = []
+        for start in RecurrenceGenerator.build_rrule(event, rule):
+            if start >= window_end:
+                break
+            end = start + (event.end_datetime - event.start_datetime) if event.end_datetime else None
+            if (end > window_start) if end is not None else (start >= window_start):
+                result.append((start, end))
+        return result
+
+    def test_matches_full_expansion(self):
+        """Test skip-ahead against full expansion for random rules and windows"""
+        rng = random.Random(42)
+        days = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+        for _ in range(400):
+            frequency = rng.choice(['DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'])
+            rule = {'frequency': frequency, 'interval': rng.choice([1, 1, 2, 3])}
+            if frequency == 'WEEKLY' and rng.random() < 0.7:
+                rule['days_of_week'] = ','.join(rng.sample(days, rng.randint(1, 4)))
+            if frequency == 'MONTHLY':
+                choice = rng.random()
+                if choice < 0.4:
+                    rule['day_of_month'] = rng.choice([1, 15, 28, 29, 30, 31])
+                elif choice < 0.7:
+                    rule['week_of_month'] = rng.randint(1, 5)
+                    rule['day_of_week'] = rng.choice(days)
+            if rng.random() < 0.4:
+                rule['occurrence_count'] = rng.randint(1, 300)
+            elif rng.random() < 0.3:
+                rule['end_date'] = datetime(2027, 6, 1)
+
+            start = datetime(2016, 1, 1, 7, 30) + timedelta(days=rng.randint(0, 3000), minutes=rng.randint(0, 900))
+            duration = rng.choice([None, timedelta(hours=1), timedelta(days=3)])
+            event, recurrence_rule = self.series(start, duration, **rule)
+            window_start = datetime(2016, 1, 1) + timedelta(days=rng.randint(0, 4000))
+            window_end = window_start + timedelta(days=rng.choice([1, 7, 31, 400]))
+
+            expected = self.reference(event, recurrence_rule, window_start, window_end)
+            actual = [
+                (r.start_datetime, r.end_datetime)
+                for r in RecurrenceGenerator.iter_occurrences(event, recurrence_rule, window_start, window_end)
+            ]
+            self.assertEqual(actual, expected, (rule, start, duration, window_start, window_end))
+
+    def test_count_with_sub_second_start(self):
+        """Test that a start with microseconds does not shift the count of a skipped series"""
+        event, rule = self.series(datetime(2021, 6, 23, 5, 20, 0, 123456), timedelta(hours=1),
+                                  interval=2, occurrence_count=36)
+        window = (datetime(2021, 8, 20), datetime(2022, 1, 1))
+        RecurrenceGenerator.vectorize = False
+        try:
+            actual = [
+                (r.start_datetime, r.end_datetime)
+                for r in RecurrenceGenerator.iter_occurrences(event, rule, *window)
+            ]
+        finally:
+            RecurrenceGenerator.vectorize = HAS_NUMPY
+        self.assertEqual(actual, self.reference(event, rule, *window))
+        self.assertEqual(actual[-1][0], datetime(2021, 9, 1, 5, 20))
+
+    def test_cost_scales_with_window(self):
+        """Test that an old daily series starts expanding near the window"""
+        event, rule = self.series(datetime(2015, 1, 1, 9), timedelta(hours=1))
+        dtstart = RecurrenceGenerator.build_rrule(event, rule, seek_from=datetime(2025, 6, 1))._dtstart
+        self.assertEqual(dtstart, datetime(2025, 5, 31, 9))
+
+    def test_count_is_not_truncated_by_safety_limit(self):
+        """Test that the safety limit caps the window, not the series"""
+        event, rule = self.series(datetime(2020, 1, 1, 9), timedelta(hours=1), occurrence_count=2000)
+        occurrences = RecurrenceGenerator.generate_occurrences(
+            event, rule, datetime(2024, 1, 1), datetime(2024, 1, 8), max_occurrences=100
+        )
+        self.assertEqual(len(occurrences), 7)
+
+        # The series ends with its 2000th occurrence
+        tail = list(RecurrenceGenerator.iter_occurrences(event, rule, datetime(2025, 6, 1)))
+        self.assertEqual(len(tail), 22)
+        self.assertEqual(tail[-1].start_datetime, datetime(2025, 6, 22, 9))
+
+
+@unittest.skipUnless(HAS_NUMPY, 'NumPy is not installed')
+class VectorizedExpansionTestCase(unittest.TestCase):
+    """Parity of the NumPy fast path with dateutil"""
+
+    series = SkipAheadTestCase.series
+    reference = SkipAheadTestCase.reference
+
+    def vectorized(self, event, rule, window_start, window_end):
+        starts, ends = RecurrenceGenerator.vectorized_occurrences(event, rule, window_start, window_end)
+        return list(zip(starts.tolist(), ends.tolist() if ends is not None else [None] * len(starts)))
+
+    def test_parity_with_dateutil(self):
+        """Test DAILY and WEEKLY rules against dateutil over random series and windows"""
+        rng = random.Random(7)
+        days = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+        for _ in range(1500):
+            frequency = rng.choice(['DAILY', 'WEEKLY'])
+            rule = {'frequency': frequency, 'interval': rng.choice([1, 1, 2, 3, 5])}
+            if frequency == 'WEEKLY' and rng.random() < 0.8:
+                rule['days_of_week'] = ','.join(rng.sample(days, rng.randint(1, 7)))
+            if rng.random() < 0.4:
+                rule['occurrence_count'] = rng.randint(1, 500)
+            elif rng.random() < 0.4:
+                rule['end_date'] = datetime(2020, 1, 1) + timedelta(days=rng.randint(0, 2500), hours=rng.randint(0, 23))
+
+            start = datetime(2019, 1, 1) + timedelta(
+                days=rng.randint(0, 2000), minutes=rng.randint(0, 1439), microseconds=rng.choice([0, 0, 250000])
+            )
+            duration = rng.choice([None, timedelta(0), timedelta(minutes=45), timedelta(days=2, hours=3)])
+            event, recurrence_rule = self.series(start, duration, **rule)
+            window_start = datetime(2018, 6, 1) + timedelta(days=rng.randint(0, 3000), hours=rng.randint(0, 23))
+            window_end = window_start + timedelta(days=rng.choice([1, 7, 30, 365, 1500]))
+
+            expected = self.reference(event, recurrence_rule, window_start, window_end)
+            self.assertEqual(
+                self.vectorized(event, recurrence_rule, window_start, window_end), expected,
+                (rule, start, duration, window_start, window_end)
+            )
+
+    def test_complex_rules_use_dateutil(self):
+        """Test that monthly and yearly rules are left to dateutil"""
+        event, rule = self.series(datetime(2025, 1, 6, 9), None, frequency='MONTHLY', week_of_month=2, day_of_week='MON')
+        self.assertIsNone(RecurrenceGenerator.vectorized_occurrences(event, rule, datetime(2025, 1, 1), datetime(2026, 1, 1)))
+
+    def test_iterator_paths_agree(self):
+        """Test that iter_occurrences gives the same records with and without NumPy"""
+        event, rule = self.series(datetime(2021, 3, 3, 8), timedelta(hours=2), frequency='WEEKLY',
+                                  days_of_week='MON,WED,FRI', occurrence_count=400)
+        window = (datetime(2022, 1, 1), datetime(2024, 1, 1))
+        vectorized = list(RecurrenceGenerator.iter_occurrences(event, rule, *window))
+        RecurrenceGenerator.vectorize = False
+        try:
+            expanded = list(RecurrenceGenerator.iter_occurrences(event, rule, *window))
+        finally:
+            RecurrenceGenerator.vectorize = HAS_NUMPY
+        self.assertEqual(vectorized, expanded)
+        self.assertTrue(vectorized)
+
+
+class CompiledRuleTestCase(unittest.TestCase):
+    """Test case for canonical RRULE strings and the compiled rule cache"""
+
+    def setUp(self):
+        RecurrenceGenerator.rule_cache.clear()
+
+    def tearDown(self):
+        RecurrenceGenerator.rule_cache.configure(4096)
+        RecurrenceGenerator.rule_cache.clear()
+
+    def series(self, rule_id=1, updated_at=datetime(2025, 1, 1), **rule):
+        event, recurrence_rule = SkipAheadTestCase.series(
+            self, datetime(2025, 1, 6, 18), timedelta(hours=1), **rule
+        )
+        recurrence_rule.id = rule_id
+        recurrence_rule.updated_at = updated_at
+        return event, recurrence_rule
+
+    def test_rrule_string(self):
+        """Test canonical strings and that dateutil's RFC 5545 parser expands them the same way"""
+        cases = [
+            ({'frequency': 'WEEKLY', 'days_of_week': 'WED,MON,WED', 'occurrence_count': 10},
+             'FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,WE;COUNT=10'),
+            ({'frequency': 'MONTHLY', 'interval': 2, 'week_of_month': 5, 'day_of_week': 'FRI'},
+             'FREQ=MONTHLY;INTERVAL=2;BYDAY=-1FR'),
+            ({'frequency': 'MONTHLY', 'day_of_month': 31, 'end_date': datetime(2026, 3, 1, 12, 30)},
+             'FREQ=MONTHLY;INTERVAL=1;BYMONTHDAY=31;UNTIL=20260301T123000Z'),
+            ({'frequency': 'DAILY', 'interval': 3, 'end_date': datetime(2025, 6, 1, tzinfo=timezone.utc)},
+             'FREQ=DAILY;INTERVAL=3;UNTIL=20250601T000000Z'),
+        ]
+        for rule, expected in cases:
+            event, recurrence_rule = self.series(rule_id=None, **rule)
+            text = RecurrenceGenerator.to_rrule_string(recurrence_rule)
+            self.assertEqual(text, expected)
+
+            recurrence_rule.rrule = text
+            window_end = datetime(2027, 1, 1)
+            actual = list(takewhile(lambda start: start < window_end,
+                                    RecurrenceGenerator.build_rrule(event, recurrence_rule)))
+            # dateutil wants the UTC UNTIL of RFC 5545 as naive for a naive DTSTART
+            parsed = rrulestr(text.replace('Z', ''), dtstart=event.start_datetime)
+            self.assertEqual(actual, list(takewhile(lambda start: start < window_end, parsed)), text)
+
+    def test_stored_string_is_used(self):
+        """Test that expansion follows the stored RRULE instead of re-deriving it"""
+        event, rule = self.series(frequency='DAILY', rrule='FREQ=WEEKLY;INTERVAL=1;BYDAY=TU;COUNT=2')
+        starts = [r.start_datetime for r in RecurrenceGenerator.iter_occurrences(event, rule, event.start_datetime)]
+        self.assertEqual(starts, [datetime(2025, 1, 7, 18), datetime(2025, 1, 14, 18)])
+
+    def test_cache_hits_and_versioning(self):
+        """Test that repeated expansions reuse the compiled rule until the rule changes"""
+        event, rule = self.series(frequency='MONTHLY', day_of_month=15)
+        window = (datetime(2026, 1, 1), datetime(2026, 3, 1))
+
+        first = list(RecurrenceGenerator.iter_occurrences(event, rule, *window))
+        misses = RecurrenceGenerator.rule_cache.stats()['misses']
+        self.assertEqual(list(RecurrenceGenerator.iter_occurrences(event, rule, *window)), first)
+        stats = RecurrenceGenerator.rule_cache.stats()
+        self.assertEqual(stats['misses'], misses)
+        self.assertGreater(stats['hits'], 0)
+        self.assertIs(RecurrenceGenerator.build_rrule(event, rule), RecurrenceGenerator.build_rrule(event, rule))
+
+        # A write bumps updated_at, the old entry is not used again
+        rule.day_of_month = 20
+        rule.updated_at = datetime(2025, 2, 1)
+        starts = [r.start_datetime for r in RecurrenceGenerator.iter_occurrences(event, rule, *window)]
+        self.assertEqual(starts, [datetime(2026, 1, 20, 18), datetime(2026, 2, 20, 18)])
+
+    def test_size_bound(self):
+        """Test that the least recently used rules are evicted"""
+        RecurrenceGenerator.rule_cache.configure(2)
+        for rule_id in range(3):
+            event, rule = self.series(rule_id=rule_id)
+            RecurrenceGenerator.build_rrule(event, rule)
+
+        stats = RecurrenceGenerator.rule_cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['hit_rate'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models import User, Event, Reminder
+from app.utils.reminder_engine import ReminderEngine
+
+
+class ReminderEngineTestCase(unittest.TestCase):
+    """Test case for firing reminders from the in-memory reminder engine"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.event = Event(user_id=user.id, title='Meeting', start_datetime=self.now + timedelta(hours=2))
+        db.session.add(self.event)
+        db.session.commit()
+        self.engine = ReminderEngine()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.engine.stop()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def add_reminder(self, seconds):
+        reminder = Reminder(event_id=self.event.id, reminder_time=self.now + timedelta(seconds=seconds),
+                            notification_type='push')
+        db.session.add(reminder)
+        db.session.commit()
+        return reminder
+
+    def is_sent(self, reminder_id):
+        db.session.expire_all()
+        return db.session.get(Reminder, reminder_id).notification_sent
+
+    def test_fires_at_reminder_time(self):
+        """Test that reminders in the horizon fire at their time and not before"""
+        soon = self.add_reminder(20)
+        later = self.add_reminder(40)
+        self.add_reminder(3600)
+
+        self.assertEqual(self.engine.reconcile(self.now), 2)
+        self.assertEqual(self.engine.next_due(), soon.reminder_time)
+
+        self.assertEqual(self.engine.fire_due(self.now + timedelta(seconds=19)), 0)
+        self.assertEqual(self.engine.fire_due(self.now + timedelta(seconds=20)), 1)
+        self.assertTrue(self.is_sent(soon.id))
+        self.assertFalse(self.is_sent(later.id))
+        self.assertEqual(self.engine.next_due(), later.reminder_time)
+
+    def test_follows_writes(self):
+        """Test that changed, deleted and created reminders are picked up incrementally"""
+        moved = self.add_reminder(20)
+        deleted = self.add_reminder(30)
+        self.engine.reconcile(self.now)
+
+        moved.reminder_time = self.now + timedelta(seconds=50)
+        db.session.delete(deleted)
+        created = self.add_reminder(10)
+
+        self.assertEqual(self.engine.apply_changes(self.now + timedelta(seconds=5)), 2)
+        self.assertEqual(self.engine.next_due(), created.reminder_time)
+
+        # The deleted reminder's entry finds nothing to claim
+        self.assertEqual(self.engine.fire_due(self.now + timedelta(seconds=30)), 1)
+        self.assertFalse(self.is_sent(moved.id))
+        self.assertEqual(self.engine.fire_due(self.now + timedelta(seconds=50)), 1)
+        self.assertEqual(len(self.engine), 0)
+
+    def test_thread_fires_without_polling_interval(self):
+        """Test that the engine thread sends a reminder within a second of its time"""
+        reminder = Reminder(event_id=self.event.id, reminder_time=datetime.utcnow() + timedelta(seconds=1),
+                            notification_type='push')
+        db.session.add(reminder)
+        db.session.commit()
+
+        self.engine.start(self.app)
+        deadline = time.monotonic() + 5
+        while not self.is_sent(reminder.id) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self.assertTrue(self.is_sent(reminder.id))
+        self.assertLess(datetime.utcnow() - reminder.reminder_time, timedelta(seconds=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects import postgresql
+from app import create_app, db
+from app.models import User, Event, Reminder
+from app.utils.reminder_queue import ReminderQueue
+from app.utils.reminder_scheduler import check_reminders
+
+
+class ReminderQueueTestCase(unittest.TestCase):
+    """Test case for claiming and sending due reminders in batches"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.app.config['REMINDER_BATCH_SIZE'] = 3
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+        self.now = datetime.utcnow()
+        self.event = Event(user_id=user.id, title='Meeting', start_datetime=self.now + timedelta(minutes=10))
+        db.session.add(self.event)
+        db.session.commit()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def add_reminders(self, count, notification_type='push', minutes=-5):
+        reminders = [
+            Reminder(event_id=self.event.id, reminder_time=self.now + timedelta(minutes=minutes, seconds=i),
+                     notification_type=notification_type)
+            for i in range(count)
+        ]
+        db.session.add_all(reminders)
+        db.session.commit()
+        return [reminder.id for reminder in reminders]
+
+    def test_claims_are_disjoint(self):
+        """Test that successive claims take different reminders until the claims expire"""
+        ids = self.add_reminders(5)
+        self.add_reminders(1, minutes=30)
+
+        first = ReminderQueue.claim(self.now, batch_size=3)
+        second = ReminderQueue.claim(self.now, batch_size=3)
+        self.assertEqual([reminder.id for reminder, _, _ in first], ids[:3])
+        self.assertEqual([reminder.id for reminder, _, _ in second], ids[3:])
+        self.assertEqual(first[0][1].id, self.event.id)
+        self.assertEqual(first[0][2].username, 'testuser')
+        self.assertEqual(ReminderQueue.claim(self.now), [])
+
+        # Claims of a worker that died are taken over after the lease
+        later = self.now + timedelta(seconds=self.app.config['REMINDER_CLAIM_LEASE_SECONDS'] + 1)
+        self.assertEqual(len(ReminderQueue.claim(later, batch_size=10)), 5)
+
+    def test_check_reminders_in_batches(self):
+        """Test that a tick sends every due reminder with a fixed number of queries per batch"""
+        sent = self.add_reminders(7)
+        failed = self.add_reminders(2, notification_type='email')
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        sa_event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            self.assertEqual(check_reminders(), 7)
+        finally:
+            sa_event.remove(db.engine, 'before_cursor_execute', listener)
+
+        # Claim, load and mark sent for each of three batches, an empty claim, then release the failures
+        self.assertLessEqual(len(statements), 3 * 3 + 2)
+        db.session.expire_all()
+        self.assertTrue(all(db.session.get(Reminder, i).notification_sent for i in sent))
+        for reminder_id in failed:
+            reminder = db.session.get(Reminder, reminder_id)
+            self.assertFalse(reminder.notification_sent)
+            self.assertIsNone(reminder.claim_token)
+        self.assertEqual(check_reminders(), 0)
+
+    def test_postgresql_skips_locked_rows(self):
+        """Test that PostgreSQL claims pick their rows with FOR UPDATE SKIP LOCKED"""
+        statement = ReminderQueue.claim_statement('token', self.now)
+        self.assertIn('FOR UPDATE SKIP LOCKED', str(statement.compile(dialect=postgresql.dialect())))
+        self.assertNotIn('FOR UPDATE', str(statement.compile(dialect=db.engine.dialect)))
+
+
+if __name__ == '__main__':
+    unittest.main()
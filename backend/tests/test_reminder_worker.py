@@ -0,0 +1,28 @@
+import unittest
+from apscheduler.schedulers.blocking import BlockingScheduler
+from app import create_app, scheduler
+from app.utils.reminder_scheduler import init_reminder_scheduler
+
+
+class ReminderWorkerTestCase(unittest.TestCase):
+    """Test case for running the scheduler jobs in the reminder worker"""
+
+    def test_web_app_does_not_start_scheduler(self):
+        """Test that building the app leaves the scheduler to the worker"""
+        app = create_app('testing')
+        self.assertFalse(app.config['SCHEDULER_ENABLED'])
+        self.assertFalse(scheduler.running)
+        self.assertIn('reminder-worker', app.cli.commands)
+
+    def test_worker_jobs(self):
+        """Test that the worker scheduler gets every job"""
+        worker = BlockingScheduler()
+        init_reminder_scheduler(create_app('testing'), worker)
+        self.assertEqual(
+            sorted(job.id for job in worker.get_jobs()),
+            ['check_reminders', 'cleanup_tokens', 'extend_occurrence_horizon', 'prune_event_changes']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
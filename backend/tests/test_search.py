@@ -0,0 +1,96 @@
+import json
+import unittest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event
+
+
+class EventSearchTestCase(unittest.TestCase):
+    """Test case for full-text event search"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def add_event(self, title, description=None):
+        event = Event(
+            user_id=self.user_id,
+            title=title,
+            description=description,
+            start_datetime=datetime(2025, 7, 1, 9)
+        )
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+    def search(self, q):
+        res = self.client.get('/api/events/search', query_string={'q': q}, headers=self.headers)
+        return res, json.loads(res.data.decode())
+
+    def test_ranked_prefix_search(self):
+        """Test that words are prefix-matched and title matches rank first"""
+        in_description = self.add_event('Lunch', 'Discuss the planning backlog')
+        in_title = self.add_event('Planning meeting', 'Quarterly goals')
+        self.add_event('Dentist')
+
+        res, result = self.search('plan')
+
+        self.assertEqual(res.status_code, 200)
+        ids = [e['id'] for e in result['data']['events']]
+        self.assertEqual(ids, [in_title, in_description])
+
+    def test_index_follows_writes(self):
+        """Test that updates and deletes are reflected in search results"""
+        event_id = self.add_event('Standup')
+
+        event = db.session.get(Event, event_id)
+        event.title = 'Retrospective'
+        db.session.commit()
+        self.assertEqual(self.search('standup')[1]['data']['events'], [])
+        self.assertEqual(len(self.search('retro')[1]['data']['events']), 1)
+
+        db.session.delete(event)
+        db.session.commit()
+        self.assertEqual(self.search('retro')[1]['data']['events'], [])
+
+    def test_listing_search_parameter(self):
+        """Test that the listing endpoint filters with the search index"""
+        self.add_event('Team sync')
+        self.add_event('Dentist')
+
+        res = self.client.get('/api/events', headers=self.headers, query_string={
+            'search': 'sync', 'start': '2025-07-01T00:00:00Z', 'end': '2025-07-02T00:00:00Z'
+        })
+        result = json.loads(res.data.decode())
+        self.assertEqual([e['title'] for e in result['data']['events']], ['Team sync'])
+
+    def test_empty_query(self):
+        """Test that a query without words is rejected"""
+        res, result = self.search('  ')
+        self.assertEqual(res.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.utils.recurrence import RecurrenceGenerator
+from app.utils.serializers import format_utc, serialize_occurrences
+
+
+class SerializersTestCase(unittest.TestCase):
+    """Test case for the shared response serializers"""
+
+    def test_format_utc_matches_previous_format(self):
+        """Test that naive UTC datetimes format as the routes did before"""
+        for dt in (datetime(2025, 3, 1, 9, 30), datetime(2025, 3, 1, 9, 30, 15, 250)):
+            expected = dt.replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
+            self.assertEqual(format_utc(dt), expected)
+        self.assertIsNone(format_utc(None))
+
+    def test_format_utc_converts_aware_datetimes(self):
+        """Test that aware datetimes are converted to UTC"""
+        dt = datetime(2025, 3, 1, 11, 30, tzinfo=timezone(timedelta(hours=2)))
+        self.assertEqual(format_utc(dt), '2025-03-01T09:30:00Z')
+
+    def test_occurrences_share_serialized_categories(self):
+        """Test that a series serializes its categories once"""
+        now = datetime(2025, 1, 6, 18, 0)
+        category = SimpleNamespace(id=1, name='Health', color='green', description=None,
+                                   created_at=now, updated_at=now)
+        event = SimpleNamespace(
+            id=1, title='Gym', description=None, start_datetime=now, end_datetime=now + timedelta(hours=1),
+            is_all_day=False, color='blue', recurrence_id=None, created_at=now, updated_at=now,
+            categories=[category]
+        )
+        rule = SimpleNamespace(
+            id=1, frequency='DAILY', interval=1, days_of_week=None, day_of_month=None, week_of_month=None,
+            day_of_week=None, end_date=None, occurrence_count=None, updated_at=now
+        )
+
+        occurrences = RecurrenceGenerator.generate_occurrences(
+            event, rule, datetime(2025, 1, 6), datetime(2025, 1, 9)
+        )
+        data = serialize_occurrences(occurrences)
+
+        self.assertEqual(len(data), 3)
+        self.assertIs(data[0]['categories'], data[2]['categories'])
+        self.assertEqual(data[0]['categories'][0]['created_at'], '2025-01-06T18:00:00Z')
+        self.assertEqual(data[1]['start_datetime'], '2025-01-07T18:00:00Z')
+        self.assertEqual(data[1]['end_datetime'], '2025-01-07T19:00:00Z')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event, RecurrenceRule
+from app.utils.event_queries import filter_events_in_window
+from app.utils.series_span import SeriesSpan
+
+
+class SeriesSpanTestCase(unittest.TestCase):
+    """Test case for the series span columns of events"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+
+        # Create application context
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        # Create tables
+        db.create_all()
+
+        user = User(username='testuser', email='test@example.com', password='Password123')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.headers = {'Authorization': f'Bearer {create_access_token(identity=user)}'}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def create_event(self, **body):
+        body.setdefault('title', 'Event')
+        res = self.client.post('/api/events', headers=self.headers, json=body)
+        self.assertEqual(res.status_code, 201)
+        return json.loads(res.data.decode())['data']['id']
+
+    def span(self, event_id):
+        event = db.session.get(Event, event_id)
+        db.session.refresh(event)
+        return event.series_start, event.series_end, event.next_occurrence_at
+
+    def in_window(self, start, end):
+        query = filter_events_in_window(Event.query.filter(Event.user_id == self.user_id), start, end)
+        return sorted(event.id for event in query)
+
+    def test_spans_follow_writes(self):
+        """Test that spans are computed on create and recomputed on event and rule writes"""
+        one_off = self.create_event(start_datetime='2025-03-04T10:00:00Z', end_datetime='2025-03-04T11:00:00Z')
+        self.assertEqual(self.span(one_off), (datetime(2025, 3, 4, 10), datetime(2025, 3, 4, 11), None))
+
+        # Mondays and Wednesdays from a Tuesday: the first occurrence is the day after
+        weekly = self.create_event(
+            start_datetime='2025-03-04T09:00:00Z', end_datetime='2025-03-04T09:30:00Z',
+            recurrence_rule={'frequency': 'WEEKLY', 'days_of_week': ['MON', 'WED'], 'occurrence_count': 4}
+        )
+        self.assertEqual(self.span(weekly)[:2], (datetime(2025, 3, 5, 9), datetime(2025, 3, 17, 9, 30)))
+
+        res = self.client.put(f'/api/events/{weekly}', headers=self.headers, json={
+            'recurrence_rule': {'frequency': 'DAILY', 'end_date': '2025-04-01T00:00:00Z'}
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.span(weekly)[:2], (datetime(2025, 3, 4, 9), datetime(2025, 3, 31, 9, 30)))
+
+        res = self.client.put(f'/api/events/{weekly}/move', headers=self.headers,
+                              json={'start_datetime': '2025-03-05T07:00:00Z'})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.span(weekly)[:2], (datetime(2025, 3, 5, 7), datetime(2025, 3, 31, 7, 30)))
+
+        # A split ends the series before the occurrence
+        res = self.client.post(f'/api/events/{weekly}/split', headers=self.headers,
+                               json={'occurrence_start': '2025-03-10T07:00:00Z'})
+        self.assertEqual(res.status_code, 201)
+        following = json.loads(res.data.decode())['data']['following']['id']
+        self.assertEqual(self.span(weekly)[:2], (datetime(2025, 3, 5, 7), datetime(2025, 3, 9, 7, 30)))
+        self.assertEqual(self.span(following)[:2], (datetime(2025, 3, 10, 7), datetime(2025, 3, 31, 7, 30)))
+
+        res = self.client.put(f'/api/events/{following}', headers=self.headers, json={'recurrence_rule': None})
+        self.assertEqual(self.span(following)[:2], (datetime(2025, 3, 10, 7), datetime(2025, 3, 10, 7, 30)))
+
+    def test_event_added_with_its_rule(self):
+        """Test that a series flushed together with its new rule gets the rule's span"""
+        event = Event(user_id=self.user_id, title='Imported', start_datetime=datetime(2025, 3, 3, 9),
+                      end_datetime=datetime(2025, 3, 3, 10), is_recurring=True)
+        event.recurrence_rule = RecurrenceRule(frequency='WEEKLY', interval=1, occurrence_count=3)
+        db.session.add(event)
+        db.session.commit()
+
+        self.assertEqual(self.span(event.id)[:2], (datetime(2025, 3, 3, 9), datetime(2025, 3, 17, 10)))
+
+    def test_window_selects_overlapping_series(self):
+        """Test that series started before a window are selected and ended series are not"""
+        endless = self.create_event(start_datetime='2024-01-01T09:00:00Z', end_datetime='2024-01-01T10:00:00Z',
+                                    recurrence_rule={'frequency': 'WEEKLY'})
+        ended = self.create_event(start_datetime='2024-01-01T09:00:00Z', end_datetime='2024-01-01T10:00:00Z',
+                                  recurrence_rule={'frequency': 'WEEKLY', 'occurrence_count': 10})
+        instant = self.create_event(start_datetime='2025-06-01T00:00:00Z')
+        self.assertIsNone(self.span(endless)[1])
+
+        self.assertEqual(self.in_window(datetime(2025, 6, 1), datetime(2025, 7, 1)), [endless, instant])
+        self.assertEqual(self.in_window(datetime(2024, 2, 1), datetime(2024, 3, 1)), [endless, ended])
+        self.assertEqual(self.in_window(datetime(2023, 1, 1), datetime(2024, 1, 1)), [])
+
+        res = self.client.get('/api/events', headers=self.headers,
+                              query_string={'start_date': '2025-06-02T00:00:00Z', 'end_date': '2025-06-10T00:00:00Z'})
+        starts = [event['start_datetime'] for event in json.loads(res.data.decode())['data']['events']]
+        self.assertEqual(starts, ['2025-06-02T09:00:00Z', '2025-06-09T09:00:00Z'])
+
+    def test_refresh_next_occurrences(self):
+        """Test that next occurrences are moved forward without touching updated_at"""
+        now = datetime.utcnow().replace(microsecond=0)
+        daily = self.create_event(start_datetime=(now - timedelta(days=30, hours=1)).isoformat() + 'Z',
+                                  recurrence_rule={'frequency': 'DAILY'})
+        upcoming = self.span(daily)[2]
+        self.assertEqual(upcoming, now - timedelta(hours=1) + timedelta(days=1))
+        updated_at = db.session.get(Event, daily).updated_at
+
+        self.assertEqual(SeriesSpan.refresh_next_occurrences(now + timedelta(days=1)), 1)
+        self.assertEqual(self.span(daily)[2], upcoming + timedelta(days=1))
+        self.assertEqual(db.session.get(Event, daily).updated_at, updated_at)
+        self.assertEqual(SeriesSpan.refresh_next_occurrences(now + timedelta(days=1)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,15 @@
 import apiClient from './client';
 import { toBackendDate } from '../utils/dateUtils';
 
-export const fetchEvents = async () => {
-  const response = await apiClient.get('/events');
+export interface EventRange {
+  start: string;
+  end: string;
+}
+
+export const fetchEvents = async (range?: EventRange) => {
+  const response = await apiClient.get('/events', {
+    params: range ? { start: range.start, end: range.end } : undefined
+  });
   return response.data;
 };
 
@@ -10,9 +10,9 @@ import { useAuth } from '../contexts/AuthContext';
 import EventDialog from '../components/EventDialog';
 import EventFilter, { EventFilters } from '../components/EventFilter';
 import NotificationAlert from '../components/notifications/Alert';
-import { fetchEvents, updateEventDates } from '../api/events';
+import { fetchEvents, updateEventDates, EventRange } from '../api/events';
 import { fetchReminders } from '../api/reminders';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useQuery, useMutation, useQueryClient, keepPreviousData } from '@tanstack/react-query';
 import { normalizeDate, toBackendDate } from '../utils/dateUtils';
 import { FullCalendarStyles } from '../theme/FullCalendarStyles';
 import ErrorBoundary from '../components/ErrorBoundary';
@@ -38,13 +38,15 @@ const Calendar = () => {
     colors: [],
     showAllDay: true
   });
+  const [visibleRange, setVisibleRange] = useState<EventRange | null>(null);
   const calendarRef = useRef<any>(null);
 
-  // Fetch events
+  // Fetch events for the visible range only
   const { data: apiResponse, isLoading, error } = useQuery({
-    queryKey: ['events'],
-    queryFn: fetchEvents,
-    enabled: isAuthenticated,
+    queryKey: ['events', visibleRange],
+    queryFn: () => fetchEvents(visibleRange ?? undefined),
+    enabled: isAuthenticated && visibleRange !== null,
+    placeholderData: keepPreviousData,
   });
 
   useEffect(() => {
@@ -308,6 +310,7 @@ const Calendar = () => {
             select={handleDateSelect}
             dateClick={handleDateClick}
             eventClick={handleEventClick}
+            datesSet={(arg) => setVisibleRange({ start: arg.start.toISOString(), end: arg.end.toISOString() })}
             height="auto"
             timeZone="local"
             displayEventTime={true}